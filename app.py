@@ -6,10 +6,30 @@ Version avec comparaisons et objectifs de profit
 import streamlit as st
 import pandas as pd
 import numpy as np
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import random
+import plotly.io as pio
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from engine import (
+    ARCHIVE_DIR, ARCHIVE_FORMATS, BENCHMARK_ASSETS, DEFAULT_BENCHMARKS, MILESTONES,
+    OPTIMIZATION_METRICS, ROLLING_METRICS, BacktestEngine, MatchStore, TaskGraph,
+    bootstrap_statistics, calculate_doubling_time, calculate_growth_projection,
+    calculate_investment_comparison, calculate_rolling_metrics, evaluate_staking_policies,
+    historical_partitions, ingest_historical_odds, list_archives, load_backtest,
+    load_historical_odds, run_params, run_seeds, run_strategy, save_backtest,
+    solve_growth_projection
+)
 
 # ==================== CONFIGURATION ====================
 
@@ -194,242 +214,177 @@ def inject_css():
     </style>
     """, unsafe_allow_html=True)
 
-# ==================== MOTEUR DE BACKTESTING ====================
+# ==================== GRAPHIQUES HAUTE DENSITÉ ====================
 
-class BacktestEngine:
-    """Moteur de simulation de performances historiques"""
-    
-    def __init__(self, initial_bankroll=1000, days=365):
-        self.initial_bankroll = initial_bankroll
-        self.days = days
-        self.results = None
+# Mode haute densité : rendu WebGL et séries réduites à un budget de points
+DEFAULT_CHART_OPTIONS = {'high_volume': False, 'max_points': 1500}
+
+def lttb_indices(y, n_out):
+    """
+    Indices retenus par Largest-Triangle-Three-Buckets (abscisses régulières)
+    Garde le premier et le dernier point, puis un point par seau : celui qui forme
+    le plus grand triangle avec le point retenu précédent et la moyenne du seau suivant
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
     
-    def generate_realistic_bets(self, date, avg_bets_per_day=3):
-        """Génère des paris réalistes pour une date donnée"""
-        num_bets = np.random.poisson(avg_bets_per_day)
-        
-        leagues = ["Ligue 1", "Premier League", "La Liga", "Bundesliga", "Serie A", "Ligue 2"]
-        teams_pool = [
-            ("PSG", "Marseille"), ("Lyon", "Monaco"), ("Lille", "Lens"),
-            ("Man City", "Liverpool"), ("Arsenal", "Chelsea"), ("Man United", "Tottenham"),
-            ("Real Madrid", "Barcelona"), ("Atlético", "Séville"),
-            ("Bayern", "Dortmund"), ("Leipzig", "Leverkusen"),
-            ("Inter", "Juventus"), ("Milan", "Napoli")
-        ]
-        
-        bets = []
-        for i in range(num_bets):
-            odds = np.random.uniform(1.5, 4.5)
-            true_prob = 1 / odds + np.random.normal(0, 0.05)
-            true_prob = np.clip(true_prob, 0.1, 0.9)
-            
-            model_accuracy = np.random.uniform(0.6, 0.85)
-            predicted_prob = true_prob * model_accuracy + (1 - true_prob) * (1 - model_accuracy)
-            
-            ev = (predicted_prob * odds - 1) * 100
-            
-            if ev > 5:
-                home, away = random.choice(teams_pool)
-                kelly = (predicted_prob * odds - 1) / (odds - 1)
-                stake_pct = max(0.5, min(5, kelly * 100 * 0.5))
-                won = np.random.random() < true_prob
-                
-                bet = {
-                    'date': date,
-                    'league': random.choice(leagues),
-                    'home': home,
-                    'away': away,
-                    'odds': round(odds, 2),
-                    'predicted_prob': round(predicted_prob * 100, 1),
-                    'true_prob': round(true_prob * 100, 1),
-                    'ev': round(ev, 1),
-                    'stake_pct': round(stake_pct, 2),
-                    'won': won
-                }
-                bets.append(bet)
-        
-        return bets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
     
-    def run_backtest(self):
-        """Exécute le backtest complet"""
-        start_date = datetime.now() - timedelta(days=self.days)
-        
-        all_bets = []
-        daily_bankroll = [self.initial_bankroll]
-        current_bankroll = self.initial_bankroll
-        
-        dates = []
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = (next_lo + next_hi - 1) / 2
+        next_y = y[next_lo:next_hi].mean()
         
-        for day in range(self.days):
-            date = start_date + timedelta(days=day)
-            dates.append(date)
-            
-            daily_bets = self.generate_realistic_bets(date)
-            
-            daily_pnl = 0
-            for bet in daily_bets:
-                stake_amount = (bet['stake_pct'] / 100) * current_bankroll
-                
-                if bet['won']:
-                    profit = stake_amount * (bet['odds'] - 1)
-                    daily_pnl += profit
-                    bet['profit'] = round(profit, 2)
-                else:
-                    daily_pnl -= stake_amount
-                    bet['profit'] = round(-stake_amount, 2)
-                
-                bet['bankroll_before'] = round(current_bankroll, 2)
-                all_bets.append(bet)
-            
-            current_bankroll += daily_pnl
-            daily_bankroll.append(current_bankroll)
-        
-        self.results = {
-            'bets': pd.DataFrame(all_bets),
-            'daily_bankroll': daily_bankroll,
-            'dates': dates,
-            'final_bankroll': current_bankroll,
-            'total_profit': current_bankroll - self.initial_bankroll,
-            'roi': ((current_bankroll - self.initial_bankroll) / self.initial_bankroll) * 100
-        }
-        
-        return self.results
+        x = np.arange(lo, hi)
+        area = np.abs((a - next_x) * (y[lo:hi] - y[a]) - (a - x) * (next_y - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
     
-    def get_statistics(self):
-        """Calcule les statistiques de performance"""
-        if self.results is None:
-            return None
-        
-        df = self.results['bets']
-        
-        total_bets = len(df)
-        won_bets = df['won'].sum()
-        lost_bets = total_bets - won_bets
-        win_rate = (won_bets / total_bets * 100) if total_bets > 0 else 0
-        
-        avg_odds_won = df[df['won']]['odds'].mean()
-        avg_odds_lost = df[~df['won']]['odds'].mean()
-        
-        total_staked = df['stake_pct'].sum()
-        total_profit = self.results['total_profit']
-        
-        bankroll_series = pd.Series(self.results['daily_bankroll'])
-        rolling_max = bankroll_series.expanding().max()
-        drawdown = (bankroll_series - rolling_max) / rolling_max * 100
-        max_drawdown = drawdown.min()
-        
-        gross_profit = df[df['profit'] > 0]['profit'].sum()
-        gross_loss = abs(df[df['profit'] < 0]['profit'].sum())
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-        
-        daily_returns = pd.Series(self.results['daily_bankroll']).pct_change().dropna()
-        sharpe = (daily_returns.mean() / daily_returns.std()) * np.sqrt(365) if daily_returns.std() > 0 else 0
-        
-        df['streak'] = df['won'].ne(df['won'].shift()).cumsum()
-        win_streaks = df[df['won']].groupby('streak').size()
-        lose_streaks = df[~df['won']].groupby('streak').size()
-        
-        longest_win_streak = win_streaks.max() if len(win_streaks) > 0 else 0
-        longest_lose_streak = lose_streaks.max() if len(lose_streaks) > 0 else 0
-        
-        return {
-            'total_bets': total_bets,
-            'won_bets': won_bets,
-            'lost_bets': lost_bets,
-            'win_rate': round(win_rate, 1),
-            'avg_odds_won': round(avg_odds_won, 2) if not pd.isna(avg_odds_won) else 0,
-            'avg_odds_lost': round(avg_odds_lost, 2) if not pd.isna(avg_odds_lost) else 0,
-            'total_staked': round(total_staked, 1),
-            'total_profit': round(total_profit, 2),
-            'roi': round(self.results['roi'], 1),
-            'max_drawdown': round(max_drawdown, 1),
-            'profit_factor': round(profit_factor, 2),
-            'sharpe_ratio': round(sharpe, 2),
-            'longest_win_streak': longest_win_streak,
-            'longest_lose_streak': longest_lose_streak,
-            'avg_ev': round(df['ev'].mean(), 1),
-            'best_day': round(df.groupby('date')['profit'].sum().max(), 2),
-            'worst_day': round(df.groupby('date')['profit'].sum().min(), 2)
-        }
+    return selected
 
-# ==================== COMPARAISON AVEC PLACEMENTS CLASSIQUES ====================
+def downsample_indices(y, max_points):
+    """
+    Points d'une série à envoyer au navigateur : LTTB + extrêmes imposés
+    (maximum, minimum, sommet et creux du plus grand drawdown)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.flatnonzero(np.isfinite(y))
+    if len(finite) <= max_points:
+        return finite
+    
+    values = y[finite]
+    peaks = np.maximum.accumulate(values)
+    trough = int(np.argmin(values - peaks))
+    peak = int(np.argmax(values[:trough + 1]))
+    
+    keep = np.union1d(
+        lttb_indices(values, max_points),
+        [int(values.argmax()), int(values.argmin()), peak, trough]
+    )
+    return finite[keep]
 
-def calculate_investment_comparison(initial_amount, days):
+def line_trace(x, y, chart_options=None, indices=None, **kwargs):
     """
-    Calcule l'évolution de placements classiques sur la même période
+    Trace de courbe : go.Scatter, ou en mode haute densité go.Scattergl sur les
+    points retenus (indices imposés pour garder des bandes alignées)
     """
-    # Taux annuels moyens
-    LIVRET_A_RATE = 0.03  # 3% par an (taux 2024)
-    ACTIONS_RATE = 0.07   # 7% par an (moyenne historique CAC40)
-    CRYPTO_RATE = 0.15    # 15% par an (très volatil, moyenne haussière)
-    
-    # Conversion en taux journalier
-    daily_livret = (1 + LIVRET_A_RATE) ** (1/365) - 1
-    daily_actions = (1 + ACTIONS_RATE) ** (1/365) - 1
-    daily_crypto = (1 + CRYPTO_RATE) ** (1/365) - 1
-    
-    livret_values = [initial_amount]
-    actions_values = [initial_amount]
-    crypto_values = [initial_amount]
-    
-    for day in range(days):
-        # Livret A (croissance linéaire)
-        livret_values.append(livret_values[-1] * (1 + daily_livret))
-        
-        # Actions (croissance avec volatilité)
-        volatility = np.random.normal(0, 0.01)  # 1% de volatilité journalière
-        actions_values.append(actions_values[-1] * (1 + daily_actions + volatility))
-        
-        # Crypto (croissance avec forte volatilité)
-        volatility_crypto = np.random.normal(0, 0.03)  # 3% de volatilité
-        crypto_values.append(crypto_values[-1] * (1 + daily_crypto + volatility_crypto))
+    options = {**DEFAULT_CHART_OPTIONS, **(chart_options or {})}
+    if not options['high_volume']:
+        return go.Scatter(x=x, y=y, **kwargs)
     
-    return {
-        'livret_a': livret_values,
-        'actions': actions_values,
-        'crypto': crypto_values,
-        'livret_final': livret_values[-1],
-        'actions_final': actions_values[-1],
-        'crypto_final': crypto_values[-1],
-        'livret_roi': ((livret_values[-1] - initial_amount) / initial_amount) * 100,
-        'actions_roi': ((actions_values[-1] - initial_amount) / initial_amount) * 100,
-        'crypto_roi': ((crypto_values[-1] - initial_amount) / initial_amount) * 100
-    }
+    y = np.asarray(y, dtype=np.float64)
+    if indices is None:
+        indices = downsample_indices(y, options['max_points'])
+    
+    return go.Scattergl(x=np.asarray(x)[indices], y=y[indices], **kwargs)
 
-def create_comparison_chart(dates, bot_values, livret_values, actions_values, initial_amount):
-    """Crée un graphique de comparaison des investissements"""
+# ==================== ANALYSE GLISSANTE ====================
+
+def create_rolling_chart(dates, rolling_by_window, metric, chart_options=None):
+    """Crée le graphique d'un indicateur glissant, une courbe par fenêtre"""
     
     fig = go.Figure()
     
-    # Bot de paris
-    fig.add_trace(go.Scatter(
-        x=dates,
-        y=bot_values[1:],
+    colors = ['#667eea', '#10b981', '#f59e0b']
+    
+    for (window, metrics), color in zip(rolling_by_window.items(), colors):
+        fig.add_trace(line_trace(
+            dates,
+            metrics[metric],
+            chart_options,
+            mode='lines',
+            name=f'{window} jours',
+            line=dict(color=color, width=2)
+        ))
+    
+    fig.update_layout(
+        title=f"📉 {ROLLING_METRICS[metric]}",
+        xaxis_title="Date",
+        yaxis_title=ROLLING_METRICS[metric],
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=400
+    )
+    
+    return fig
+
+def create_bankroll_chart(dates, daily_bankroll, initial_amount, chart_options=None):
+    """Crée le graphique d'évolution de la bankroll"""
+    
+    fig = go.Figure()
+    
+    fig.add_trace(line_trace(
+        dates,
+        daily_bankroll[1:],
+        chart_options,
         mode='lines',
-        name='🤖 Bot Paris Foot',
-        line=dict(color='#667eea', width=4),
+        name='Bankroll',
+        line=dict(color='#667eea', width=3),
         fill='tozeroy',
-        fillcolor='rgba(102, 126, 234, 0.1)'
+        fillcolor='rgba(102, 126, 234, 0.2)'
     ))
     
-    # Livret A
     fig.add_trace(go.Scatter(
-        x=dates,
-        y=livret_values[1:],
+        x=[dates[0], dates[-1]],
+        y=[initial_amount, initial_amount],
         mode='lines',
-        name='🏦 Livret A (3%/an)',
-        line=dict(color='#10b981', width=3, dash='dash')
+        name='Bankroll Initiale',
+        line=dict(color='#9ca3af', width=2, dash='dash')
     ))
     
-    # Actions
-    fig.add_trace(go.Scatter(
-        x=dates,
-        y=actions_values[1:],
+    fig.update_layout(
+        title="📈 Évolution de la Bankroll",
+        xaxis_title="Date",
+        yaxis_title="Bankroll (€)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=500
+    )
+    
+    return fig
+
+# ==================== COMPARAISON AVEC PLACEMENTS CLASSIQUES ====================
+
+def create_comparison_chart(dates, bot_values, benchmarks, initial_amount, chart_options=None):
+    """
+    Crée un graphique de comparaison des investissements
+    benchmarks : liste de (actif de BENCHMARK_ASSETS, valeurs journalières)
+    """
+    
+    fig = go.Figure()
+    
+    # Bot de paris
+    fig.add_trace(line_trace(
+        dates,
+        bot_values[1:],
+        chart_options,
         mode='lines',
-        name='📈 Actions CAC40 (7%/an)',
-        line=dict(color='#f59e0b', width=3, dash='dot')
+        name='🤖 Bot Paris Foot',
+        line=dict(color='#667eea', width=4),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.1)'
     ))
     
+    # Placements de référence
+    for asset, values in benchmarks:
+        fig.add_trace(line_trace(
+            dates,
+            values[1:],
+            chart_options,
+            mode='lines',
+            name=asset['label'],
+            line=dict(color=asset['color'], width=3, dash=asset['dash'])
+        ))
+    
     # Ligne de référence
     fig.add_trace(go.Scatter(
         x=[dates[0], dates[-1]],
@@ -466,54 +421,171 @@ def create_comparison_chart(dates, bot_values, livret_values, actions_values, in
     
     return fig
 
-# ==================== CALCUL D'OBJECTIFS ====================
-
-def calculate_doubling_time(roi_annual):
+def create_fan_chart(dates, bands, initial_amount, target_amount, benchmarks=(), chart_options=None):
     """
-    Calcule le temps pour doubler la bankroll
-    Utilise la règle de 72 et le ROI annuel
+    Crée le graphique en éventail des trajectoires Monte Carlo (bandes 5/25/50/75/95%)
+    benchmarks : liste de (actif de BENCHMARK_ASSETS, bandes de l'actif)
     """
-    if roi_annual <= 0:
-        return None
     
-    # Règle de 72
-    years = 72 / roi_annual
-    days = years * 365
-    months = years * 12
+    fig = go.Figure()
     
-    return {
-        'days': int(days),
-        'months': round(months, 1),
-        'years': round(years, 1)
-    }
+    # En mode haute densité, toutes les bandes partagent les points retenus
+    # (médiane + extrêmes des bandes externes) pour que les remplissages restent alignés
+    options = {**DEFAULT_CHART_OPTIONS, **(chart_options or {})}
+    indices = None
+    if options['high_volume']:
+        indices = np.union1d(
+            downsample_indices(bands[50][1:], options['max_points']),
+            [int(np.argmax(bands[95][1:])), int(np.argmin(bands[5][1:]))]
+        )
+    
+    # Bandes : 5-95% puis 25-75%, remplies entre borne basse et borne haute
+    for low, high, color, name in [
+        (5, 95, 'rgba(102, 126, 234, 0.15)', 'Intervalle 5-95%'),
+        (25, 75, 'rgba(102, 126, 234, 0.35)', 'Intervalle 25-75%')
+    ]:
+        fig.add_trace(line_trace(
+            dates,
+            bands[low][1:],
+            chart_options,
+            indices,
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(line_trace(
+            dates,
+            bands[high][1:],
+            chart_options,
+            indices,
+            mode='lines',
+            name=name,
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=color
+        ))
+    
+    # Médiane
+    fig.add_trace(line_trace(
+        dates,
+        bands[50][1:],
+        chart_options,
+        indices,
+        mode='lines',
+        name='Médiane',
+        line=dict(color='#667eea', width=3)
+    ))
+    
+    # Placements de référence : médiane et intervalle 5-95%
+    for asset, asset_bands in benchmarks:
+        fig.add_trace(line_trace(
+            dates,
+            asset_bands[5][1:],
+            chart_options,
+            indices,
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(line_trace(
+            dates,
+            asset_bands[95][1:],
+            chart_options,
+            indices,
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=asset['fillcolor'],
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(line_trace(
+            dates,
+            asset_bands[50][1:],
+            chart_options,
+            indices,
+            mode='lines',
+            name=f"{asset['name']} (médiane)",
+            line=dict(color=asset['color'], width=2, dash=asset['dash'])
+        ))
+    
+    # Capital initial et objectif
+    fig.add_trace(go.Scatter(
+        x=[dates[0], dates[-1]],
+        y=[initial_amount, initial_amount],
+        mode='lines',
+        name='Capital Initial',
+        line=dict(color='#9ca3af', width=2, dash='dash')
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=[dates[0], dates[-1]],
+        y=[target_amount, target_amount],
+        mode='lines',
+        name='Objectif',
+        line=dict(color='#10b981', width=2, dash='dash')
+    ))
+    
+    fig.update_layout(
+        title={
+            'text': "🎲 Éventail des Trajectoires Monte Carlo",
+            'font': {'size': 24, 'color': 'white'}
+        },
+        xaxis_title="Date",
+        yaxis_title="Bankroll (€)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=600
+    )
+    
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgba(255,255,255,0.1)')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='rgba(255,255,255,0.1)')
+    
+    return fig
 
-def calculate_growth_projection(initial_amount, roi_annual, target_multiplier=2):
-    """
-    Projette la croissance future et calcule quand l'objectif sera atteint
-    """
-    if roi_annual <= 0:
-        return None
+# ==================== CALCUL D'OBJECTIFS ====================
+
+def create_projection_chart(projection_dates, projection_values, target_amount, chart_options=None):
+    """Crée le graphique de projection de croissance vers l'objectif"""
     
-    daily_rate = (1 + roi_annual/100) ** (1/365) - 1
+    fig = go.Figure()
     
-    current = initial_amount
-    days = 0
-    projection = [initial_amount]
+    fig.add_trace(line_trace(
+        projection_dates,
+        projection_values,
+        chart_options,
+        mode='lines',
+        name='Projection',
+        line=dict(color='#667eea', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)'
+    ))
     
-    # Calculer jusqu'à atteindre l'objectif (max 5 ans)
-    target = initial_amount * target_multiplier
-    max_days = 365 * 5
+    # Ligne objectif
+    fig.add_trace(go.Scatter(
+        x=[projection_dates[0], projection_dates[-1]],
+        y=[target_amount, target_amount],
+        mode='lines',
+        name='Objectif',
+        line=dict(color='#10b981', width=3, dash='dash')
+    ))
     
-    while current < target and days < max_days:
-        current *= (1 + daily_rate)
-        projection.append(current)
-        days += 1
+    fig.update_layout(
+        title="🚀 Projection de Croissance vers l'Objectif",
+        xaxis_title="Date",
+        yaxis_title="Bankroll (€)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=500
+    )
     
-    return {
-        'days_to_target': days if current >= target else None,
-        'projection': projection,
-        'achieved': current >= target
-    }
+    return fig
 
 def create_goal_progress_chart(current, target, days_elapsed, days_estimated):
     """Crée un graphique de progression vers l'objectif"""
@@ -558,543 +630,1707 @@ def create_goal_progress_chart(current, target, days_elapsed, days_estimated):
     
     return fig
 
-# ==================== INTERFACE PRINCIPALE ====================
+# ==================== POLITIQUES DE MISE ====================
 
-def main():
-    inject_css()
+def create_staking_chart(dates, staking, initial_amount, chart_options=None):
+    """Crée le graphique des bankrolls de chaque politique de mise (mêmes paris)"""
     
-    # Header
-    st.markdown("""
-    <div class="header-pro">
-        <h1>⚽ PronoSmart - Backtesting Avancé</h1>
-        <p>Simulation, Comparaisons & Objectifs de Profit</p>
-    </div>
-    """, unsafe_allow_html=True)
+    fig = go.Figure()
     
-    # Sidebar
-    with st.sidebar:
-        st.image("https://img.icons8.com/fluency/96/000000/financial-analytics.png", width=80)
-        st.title("Configuration")
-        
-        st.markdown("### 💰 Paramètres")
-        
-        initial_bankroll = st.number_input(
-            "Bankroll Initiale (€)",
-            min_value=100.0,
-            max_value=100000.0,
-            value=1000.0,
-            step=100.0
-        )
-        
-        days = st.slider(
-            "Période (jours)",
-            min_value=30,
-            max_value=730,
-            value=365,
-            step=30
-        )
-        
-        st.markdown("---")
-        st.markdown("### 🎯 Objectif")
-        
-        target_multiplier = st.selectbox(
-            "Multiplier la bankroll par :",
-            [2, 3, 5, 10],
-            index=0,
-            format_func=lambda x: f"×{x} ({initial_bankroll * x:.0f}€)"
-        )
-        
-        st.markdown("---")
-        
-        if st.button("🚀 LANCER LE BACKTEST", key="run_backtest"):
-            st.session_state['run_backtest'] = True
-            st.session_state['backtest_params'] = {
-                'bankroll': initial_bankroll,
-                'days': days,
-                'target_multiplier': target_multiplier
-            }
-        
-        st.markdown("---")
-        st.caption("💡 Simulation avec données réalistes")
+    colors = ['#667eea', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4', '#ec4899', '#84cc16']
     
-    # Contenu principal
-    if 'run_backtest' not in st.session_state:
-        # Page d'accueil
-        st.info("""
-        ### 👋 Module de Backtesting Professionnel
-        
-        **Nouvelles fonctionnalités :**
-        
-        💰 **Comparaison avec placements classiques**
-        - Livret A (3%/an)
-        - Actions CAC40 (7%/an)
-        - Voyez la différence avec le bot !
-        
-        🎯 **Objectifs de profit**
-        - Calculez le temps pour doubler votre bankroll
-        - Projections de croissance
-        - Timeline précise
-        
-        👈 Configurez vos paramètres et lancez le backtest !
-        """)
-        
-        # Métriques d'exemple
-        col1, col2, col3, col4 = st.columns(4)
-        
-        examples = [
-            ("🤖", "+42.5%", "ROI Bot"),
-            ("🏦", "+3.0%", "Livret A"),
-            ("📈", "+7.0%", "Actions"),
-            ("🎯", "1.7 ans", "Pour doubler")
-        ]
-        
-        for col, (icon, value, label) in zip([col1, col2, col3, col4], examples):
-            with col:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div style="font-size: 2rem;">{icon}</div>
-                    <div class="metric-value">{value}</div>
-                    <div class="metric-label">{label}</div>
-                </div>
-                """, unsafe_allow_html=True)
+    for j, label in enumerate(staking['labels']):
+        fig.add_trace(line_trace(
+            dates,
+            staking['daily_bankroll'][1:, j],
+            chart_options,
+            mode='lines',
+            name=label,
+            line=dict(color=colors[j % len(colors)], width=3 if j == 0 else 2)
+        ))
     
-    else:
-        # Exécution du backtest
-        params = st.session_state['backtest_params']
-        
-        with st.spinner('🔄 Simulation en cours...'):
-            # Backtest du bot
-            engine = BacktestEngine(
-                initial_bankroll=params['bankroll'],
-                days=params['days']
-            )
-            results = engine.run_backtest()
-            stats = engine.get_statistics()
-            
-            # Comparaison avec placements classiques
-            comparison = calculate_investment_comparison(
-                params['bankroll'],
-                params['days']
-            )
-            
-            # Calcul des objectifs
-            roi_annual = (stats['roi'] / params['days']) * 365
-            doubling_time = calculate_doubling_time(roi_annual)
-            projection = calculate_growth_projection(
-                params['bankroll'],
-                roi_annual,
-                params['target_multiplier']
-            )
+    fig.add_trace(go.Scatter(
+        x=[dates[0], dates[-1]],
+        y=[initial_amount, initial_amount],
+        mode='lines',
+        name='Capital initial',
+        line=dict(color='#9ca3af', width=1, dash='dot')
+    ))
+    
+    # Échelle logarithmique : les politiques agressives s'écartent de plusieurs ordres de grandeur
+    fig.update_layout(
+        title="⚖️ Bankroll par Politique de Mise",
+        xaxis_title="Date",
+        yaxis_title="Bankroll (€, échelle log)",
+        yaxis_type='log',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=500
+    )
+    
+    return fig
+
+# ==================== OPTIMISATION DE LA STRATÉGIE ====================
+
+def create_optimization_heatmap(optimization, metric, bound_index=0):
+    """
+    Crée la carte de chaleur d'une métrique : seuil d'EV × multiplicateur de Kelly
+    Cellules élaguées laissées vides ; couleurs bornées aux percentiles 5-95
+    (le ROI composé s'étend sur plusieurs ordres de grandeur)
+    """
+    
+    values = optimization[metric][bound_index]
+    finite = values[np.isfinite(values)]
+    zmin, zmax = np.percentile(finite, [5, 95]) if len(finite) else (None, None)
+    
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=optimization['kelly_multipliers'],
+        y=optimization['ev_thresholds'],
+        zmin=zmin,
+        zmax=zmax,
+        colorscale='RdYlGn',
+        colorbar=dict(title=dict(text=OPTIMIZATION_METRICS[metric], side='right')),
+        hovertemplate="Kelly ×%{x:.2f}<br>EV > %{y:.1f}%<br>%{z:.2f}<extra></extra>"
+    ))
+    
+    # Meilleure cellule pour l'objectif
+    best = optimization['best']
+    if optimization['stake_bounds'][bound_index] == (best['min_stake_pct'], best['max_stake_pct']):
+        fig.add_trace(go.Scatter(
+            x=[best['kelly_multiplier']],
+            y=[best['ev_threshold']],
+            mode='markers',
+            name='Meilleure',
+            marker=dict(symbol='star', size=16, color='white', line=dict(color='black', width=1)),
+            hoverinfo='skip'
+        ))
+    
+    fig.update_layout(
+        title=OPTIMIZATION_METRICS[metric],
+        xaxis_title="Multiplicateur de Kelly",
+        yaxis_title="Seuil d'EV (%)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        showlegend=False,
+        height=420
+    )
+    
+    return fig
+
+# ==================== WALK-FORWARD ====================
+
+def create_walk_forward_chart(walk, initial_amount, chart_options=None):
+    """Crée le graphique hors échantillon : walk-forward vs stratégie fixe, mêmes journées"""
+    
+    fig = go.Figure()
+    
+    for values, name, color, width in [
+        (walk['daily_bankroll'], 'Walk-forward', '#667eea', 3),
+        (walk['baseline_bankroll'], 'Stratégie fixe', '#f59e0b', 2)
+    ]:
+        fig.add_trace(line_trace(
+            walk['dates'],
+            values[1:],
+            chart_options,
+            mode='lines',
+            name=name,
+            line=dict(color=color, width=width)
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=[walk['dates'][0], walk['dates'][-1]],
+        y=[initial_amount, initial_amount],
+        mode='lines',
+        name='Capital initial',
+        line=dict(color='#9ca3af', width=1, dash='dot')
+    ))
+    
+    fig.update_layout(
+        title=f"🚶 Hors Échantillon ({walk['train_days']} j d'apprentissage / {walk['test_days']} j joués)",
+        xaxis_title="Date",
+        yaxis_title="Bankroll (€)",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        hovermode='x unified',
+        height=500
+    )
+    
+    return fig
+
+# ==================== MESURE DES PERFORMANCES ====================
+
+# PRONOSMART_PROFILE=1 active le chronométrage des étapes (panneau + logs)
+# PRONOSMART_METRICS_FILE=chemin ajoute aussi chaque mesure en JSON Lines
+PROFILE = os.environ.get('PRONOSMART_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+METRICS_FILE = os.environ.get('PRONOSMART_METRICS_FILE')
+
+perf_logger = logging.getLogger('pronosmart.perf')
+if PROFILE and not perf_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+    perf_logger.addHandler(_handler)
+    perf_logger.setLevel(logging.INFO)
+    perf_logger.propagate = False
+
+class StageTimer:
+    """
+    Chronomètre des étapes d'un run de l'application
+    Chaque étape est enregistrée (panneau) et émise aussitôt en log structuré
+    """
+    
+    def __init__(self):
+        self.run_id = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        self.start = time.perf_counter()
+        self.stages = []
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        # Place réservée à l'entrée : une étape imbriquée s'affiche après son parent
+        index = len(self.stages)
+        self.stages.append((name, 0.0))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[index] = (name, time.perf_counter() - start)
+            self.emit(name, self.stages[index][1])
+    
+    def record(self, name, seconds):
+        """Étape mesurée ailleurs (tâche exécutée dans un thread du pool)"""
+        self.stages.append((name, seconds))
+        self.emit(name, seconds)
+    
+    def emit(self, name, seconds):
+        record = {'run': self.run_id, 'stage': name, 'ms': round(seconds * 1000, 3)}
+        line = json.dumps(record)
+        perf_logger.info(line)
+        if METRICS_FILE:
+            with open(METRICS_FILE, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
+    
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+def timed(name):
+    """Chronomètre une étape du run courant ; sans effet si le profilage est désactivé"""
+    if not PROFILE:
+        return contextlib.nullcontext()
+    return st.session_state.setdefault('stage_timer', StageTimer()).stage(name)
+
+def render_performance_panel(timer, container=None):
+    """
+    Panneau : durée de chaque étape du dernier run
+    container : barre latérale par défaut (run complet) ; un fragment ne peut écrire
+    que dans son propre corps
+    """
+    total = timer.elapsed()
+    timer.emit('total', total)
+    
+    with (container or st.sidebar).expander("⏱️ Performance", expanded=False):
+        st.caption(f"Run {timer.run_id} : {total * 1000:.0f} ms")
+        st.dataframe(
+            pd.DataFrame({
+                'Étape': [name for name, _ in timer.stages],
+                'ms': [round(seconds * 1000, 1) for _, seconds in timer.stages],
+                '% du run': [round(seconds / total * 100, 1) for _, seconds in timer.stages]
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+# Fragment chronométré en cours dans le thread du script (fragments imbriqués)
+_fragment_run = threading.local()
+
+def profiled_fragment(render):
+    """
+    st.fragment dont les reruns isolés ont leur propre chronomètre
+    Un rerun du seul fragment ne repasse pas par main() : sans nouveau StageTimer,
+    ses étapes s'ajouteraient au run complet précédent, sous son run id
+    Le fragment le plus externe du rerun démarre le chronomètre et affiche le panneau
+    """
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        fragment_rerun = ctx is not None and bool(ctx.fragment_ids_this_run)
+        if not PROFILE or not fragment_rerun or getattr(_fragment_run, 'active', False):
+            return render(*args, **kwargs)
         
-        st.success('✅ Simulation terminée !')
+        timer = st.session_state['stage_timer'] = StageTimer()
+        _fragment_run.active = True
+        try:
+            with timer.stage(f'fragment.{render.__name__}'):
+                result = render(*args, **kwargs)
+        finally:
+            _fragment_run.active = False
+        render_performance_panel(timer, st.container())
+        return result
+    
+    return st.fragment(wrapper)
+
+# ==================== AFFICHAGE PROGRESSIF ====================
+
+# Journées réglées par bloc du backtest progressif
+PROGRESS_CHUNK_DAYS = 30
+# Intervalle minimal entre deux rafraîchissements du graphique partiel (secondes)
+PROGRESS_REFRESH_S = 0.25
+# Chemins retenus pour les bandes provisoires du Monte Carlo
+PREVIEW_PATHS = 500
+
+class ProgressDisplay:
+    """
+    Barre de progression et graphique partiel alimentés par les blocs des calculs
+    progressifs (iter_backtest, iter_monte_carlo)
+    Les éléments ne sont créés qu'au premier bloc : rien ne s'affiche sur un cache chaud
+    Le graphique est redessiné au plus toutes les PROGRESS_REFRESH_S secondes (davantage
+    si le tracé est lent) et au dernier bloc
+    """
+    
+    def __init__(self, initial_amount, target_amount, chart_options=None):
+        self.initial_amount = initial_amount
+        self.target_amount = target_amount
+        self.chart_options = chart_options
+        self.bar = None
+        self.chart = None
+        self.next_draw = 0.0
+    
+    def refresh(self, progress, text, build_figure):
+        if self.bar is None:
+            self.bar = st.progress(0.0)
+            self.chart = st.empty()
         
-        # Onglets
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "💰 Comparaisons",
-            "🎯 Objectifs",
-            "📊 Vue d'ensemble",
-            "📋 Statistiques"
-        ])
+        self.bar.progress(progress, text=text)
+        now = time.perf_counter()
+        if progress >= 1 or now >= self.next_draw:
+            self.chart.plotly_chart(build_figure(), use_container_width=True)
+            # Le tracé ne doit pas dépasser un quart du temps de calcul
+            drawn = time.perf_counter()
+            self.next_draw = drawn + max(PROGRESS_REFRESH_S, 3 * (drawn - now))
+    
+    def backtest(self, part):
+        """Bloc du backtest : bankroll jusqu'au dernier jour réglé"""
+        stats = part['stats']
+        self.refresh(
+            part['progress'],
+            f"🔄 Backtest : {part['days_done']}/{part['days']} jours · "
+            f"{stats['total_bets']} paris · ROI {stats['roi']:+.1f}%",
+            lambda: create_bankroll_chart(
+                part['dates'], part['daily_bankroll'], self.initial_amount, self.chart_options
+            )
+        )
+    
+    def monte_carlo(self, part):
+        """Bloc du Monte Carlo : bandes provisoires sur un échantillon des chemins terminés"""
+        def build_figure():
+            paths = part['paths']
+            sample = paths[::max(1, len(paths) // PREVIEW_PATHS)]
+            levels = [5, 25, 50, 75, 95]
+            days = paths.shape[1] - 1
+            return create_fan_chart(
+                pd.date_range(datetime.now() - timedelta(days=days), periods=days, freq='D'),
+                dict(zip(levels, np.percentile(sample, levels, axis=0))),
+                self.initial_amount,
+                self.target_amount,
+                chart_options=self.chart_options
+            )
         
-        # ========== TAB 1: COMPARAISONS ==========
-        with tab1:
-            st.subheader("💰 Bot vs Placements Classiques")
-            
-            # Graphique de comparaison
-            fig_comparison = create_comparison_chart(
-                results['dates'],
-                results['daily_bankroll'],
-                comparison['livret_a'],
-                comparison['actions'],
-                params['bankroll']
+        self.refresh(
+            part['progress'],
+            f"🎲 Monte Carlo : {part['paths_done']:,}/{part['n_paths']:,} trajectoires".replace(',', ' '),
+            build_figure
+        )
+    
+    def clear(self):
+        if self.bar is not None:
+            self.bar.empty()
+            self.chart.empty()
+
+# ==================== CACHE DES RÉSULTATS ====================
+
+def estimate_nbytes(value):
+    """Estimation de l'empreinte mémoire d'un résultat (DataFrames, tableaux, dicts)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (np.ndarray, pd.Index)):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, 'nbytes'):
+        # Stores colonnaires (BetStore, MatchStore)
+        return int(value.nbytes)
+    return 64
+
+# Sentinelle des lectures de cache (None est une valeur valide)
+_MISSING = object()
+
+class LRUCache:
+    """Cache LRU borné en nombre d'entrées et en taille mémoire estimée"""
+    
+    def __init__(self, max_entries=8, max_bytes=None, sizeof=estimate_nbytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        # Les tâches du graphe de calcul y accèdent depuis plusieurs threads
+        self._lock = threading.RLock()
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+    
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            return self._put(key, value, size)
+    
+    def _put(self, key, value, size):
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        
+        # Éviction des entrées les moins récemment utilisées (la plus récente est gardée)
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+        
+        return value
+    
+    def get_or_compute(self, key, compute):
+        # Une seule lecture : une éviction par un autre thread ne peut pas glisser entre
+        # le test de présence et la lecture
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        # Calcul hors verrou (les tâches du graphe restent parallèles) ; si un autre thread
+        # a rempli la clé entre-temps, sa valeur est gardée
+        value = compute()
+        size = self.sizeof(value)
+        with self._lock:
+            existing = self.get(key, _MISSING)
+            if existing is not _MISSING:
+                return existing
+            return self._put(key, value, size)
+
+def get_result_cache():
+    """Cache des résultats de la session : un rerun Streamlit réutilise la simulation"""
+    if 'result_cache' not in st.session_state:
+        st.session_state['result_cache'] = LRUCache(max_entries=8, max_bytes=256 * 2**20)
+    return st.session_state['result_cache']
+
+def fingerprint(*parts):
+    """Empreinte blake2b de tableaux, scalaires et conteneurs (clé de cache)"""
+    digest = hashlib.blake2b(digest_size=16)
+    
+    def feed(part):
+        if isinstance(part, (np.ndarray, pd.Index, pd.Series)):
+            array = np.asarray(part)
+            if array.dtype == object:
+                digest.update(repr(array.tolist()).encode())
+            else:
+                digest.update(f'{array.dtype}{array.shape}'.encode())
+                digest.update(np.ascontiguousarray(array).tobytes())
+        elif isinstance(part, dict):
+            digest.update(b'{')
+            for key in sorted(part, key=repr):
+                feed(key)
+                feed(part[key])
+            digest.update(b'}')
+        elif isinstance(part, (list, tuple)):
+            digest.update(b'[')
+            for item in part:
+                feed(item)
+            digest.update(b']')
+        else:
+            digest.update(repr(part).encode())
+    
+    for part in parts:
+        feed(part)
+    
+    return digest.hexdigest()
+
+class SerializedFigure(go.Figure):
+    """
+    Figure dont la spécification JSON est déjà calculée
+    st.plotly_chart appelle to_dict() puis ré-encode le résultat en JSON à chaque rerun :
+    on évite la construction de la figure, sa validation et l'encodage des tableaux
+    (déjà en base64 dans la spec), pas ce dernier passage de plotly.io.to_json
+    """
+    
+    def __init__(self, figure):
+        super().__init__()
+        encoded = pio.to_json(figure, validate=False)
+        self._spec = json.loads(encoded)
+        self._nbytes = len(encoded)
+    
+    @property
+    def nbytes(self):
+        return self._nbytes
+    
+    def to_dict(self):
+        return self._spec
+
+def get_figure_cache():
+    """Cache des figures de la session, borné en nombre et en taille JSON"""
+    if 'figure_cache' not in st.session_state:
+        st.session_state['figure_cache'] = LRUCache(
+            max_entries=32,
+            max_bytes=64 * 2**20,
+            sizeof=lambda figure: figure.nbytes
+        )
+    return st.session_state['figure_cache']
+
+def cached_figure(builder, *args, **kwargs):
+    """
+    Figure construite par builder(*args, **kwargs), réutilisée tant que les données
+    et les options du graphique (même empreinte) ne changent pas
+    """
+    key = (builder.__name__, fingerprint(args, kwargs))
+    with timed(f'chart.{builder.__name__}'):
+        return get_figure_cache().get_or_compute(
+            key,
+            lambda: SerializedFigure(builder(*args, **kwargs))
+        )
+
+def backtest_cache_key(params):
+    """
+    Clé du cache de résultats pour le backtest d'un jeu de paramètres
+    Tous les arguments du moteur y figurent (stratégie comprise) : une entrée évincée
+    est recalculée à l'identique. Les placements de référence n'en font pas partie :
+    ils ne changent que la comparaison
+    """
+    return ('backtest', params['bankroll'], params['days'], params.get('history'),
+            tuple(run_strategy(params).values()), params['seed'])
+
+def comparison_cache_key(params):
+    """Clé du cache de résultats pour les placements classiques (sélection en direct)"""
+    return ('comparison', params['bankroll'], params['days'], params['benchmarks'], params['seed'])
+
+def get_match_store(leagues, seasons, cache=None):
+    """
+    MatchStore des partitions ligue/saison choisies, gardé dans le cache de résultats
+    cache : à passer hors du thread du script (st.session_state y est inaccessible)
+    """
+    return (cache or get_result_cache()).get_or_compute(
+        ('matches', leagues, seasons),
+        lambda: MatchStore(load_historical_odds(leagues=leagues, seasons=seasons))
+    )
+
+def backtest_matches(params, cache=None):
+    """
+    Matchs réels du backtest (arguments matches / match_filters de BacktestEngine) :
+    partitions ligue/saison choisies, filtrées par équipe dans l'index
+    """
+    if not params.get('history'):
+        return {'matches': None, 'match_filters': None}
+    
+    leagues, seasons, teams = params['history']
+    return {'matches': get_match_store(leagues, seasons, cache), 'match_filters': {'teams': teams}}
+
+def compute_comparison(params, seed_seq):
+    """Placements classiques sur la période du backtest"""
+    return calculate_investment_comparison(
+        params['bankroll'],
+        params['days'],
+        assets=params['benchmarks'],
+        rng=np.random.default_rng(seed_seq)
+    )
+
+def restore_backtest(path):
+    """
+    Recharge une archive dans le cache de résultats, sous la clé de ses paramètres
+    complets (stratégie comprise) : une fois évincée, elle est recalculée à l'identique
+    depuis sa graine. Les placements classiques suivent la sélection courante et sont
+    recalculés par le graphe de la page avec la graine d'origine
+    Retourne les paramètres du backtest archivé
+    """
+    results, stats, params = load_backtest(path)
+    params = run_params(params)
+    
+    get_result_cache().put(backtest_cache_key(params), {'results': results, 'stats': stats})
+    return params
+
+def monte_carlo_cache_key(params):
+    """Clé du cache de résultats pour les trajectoires Monte Carlo (sans les placements)"""
+    return ('monte_carlo', params['bankroll'], params['days'], params['monte_carlo'],
+            tuple(run_strategy(params).values()), params['seed'])
+
+def compute_projection(params, stats):
+    """Temps de doublement, projection vers l'objectif et paliers de croissance"""
+    roi_annual = (stats['roi'] / params['days']) * 365
+    return {
+        'roi_annual': roi_annual,
+        'doubling_time': calculate_doubling_time(roi_annual),
+        'projection': calculate_growth_projection(
+            params['bankroll'],
+            roi_annual,
+            params['target_multiplier']
+        ),
+        'milestones': solve_growth_projection(
+            params['bankroll'],
+            roi_annual,
+            [mult for mult, _ in MILESTONES]
+        )
+    }
+
+def optimization_cache_key(params, grid):
+    """Clé du cache de résultats pour une grille d'optimisation"""
+    return ('optimization', *backtest_cache_key(params), fingerprint(grid))
+
+def candidate_engine(params, cache=None):
+    """
+    Moteur des analyses sur l'univers des paris candidats (optimisation, walk-forward) :
+    graine dédiée (cf. run_seeds), même univers pour les deux
+    """
+    return BacktestEngine(
+        initial_bankroll=params['bankroll'],
+        days=params['days'],
+        seed=run_seeds(params['seed'])['candidates'],
+        **run_strategy(params),
+        **backtest_matches(params, cache)
+    )
+
+def compute_optimization(params, grid):
+    """Grille d'optimisation de la stratégie sur l'univers des paris candidats"""
+    cache = get_result_cache()
+    
+    def compute():
+        start = time.perf_counter()
+        optimization = candidate_engine(params, cache).optimize(**grid)
+        return {**optimization, 'seconds': time.perf_counter() - start}
+    
+    with timed('optimization'):
+        return cache.get_or_compute(optimization_cache_key(params, grid), compute)
+
+def compute_staking(params, results):
+    """
+    Politiques de mise comparées sur les paris du backtest, calculées à l'ouverture
+    de l'onglet Mises et gardées dans le cache de résultats
+    """
+    with timed('staking'):
+        return get_result_cache().get_or_compute(
+            ('staking', *backtest_cache_key(params)),
+            lambda: evaluate_staking_policies(results['bets'], params['bankroll'])
+        )
+
+def compute_bootstrap(params, results):
+    """
+    Intervalles de confiance bootstrap, calculés à l'ouverture de l'onglet Statistiques
+    et gardés dans le cache de résultats (graine dédiée : rééchantillonnages reproductibles)
+    """
+    with timed('bootstrap'):
+        return get_result_cache().get_or_compute(
+            ('bootstrap', *backtest_cache_key(params)),
+            lambda: bootstrap_statistics(
+                results['bets'], rng=np.random.default_rng(run_seeds(params['seed'])['bootstrap'])
             )
-            st.plotly_chart(fig_comparison, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # Tableau comparatif
-            st.markdown("### 📊 Résultats sur {} jours".format(params['days']))
-            
-            # Créer 3 colonnes pour les comparaisons
-            col1, col2, col3 = st.columns(3)
-            
-            placements = [
-                {
-                    'name': '🤖 Bot Paris Foot',
-                    'final': results['final_bankroll'],
-                    'profit': stats['total_profit'],
-                    'roi': stats['roi'],
-                    'col': col1,
-                    'color': '#667eea'
-                },
-                {
-                    'name': '🏦 Livret A',
-                    'final': comparison['livret_final'],
-                    'profit': comparison['livret_final'] - params['bankroll'],
-                    'roi': comparison['livret_roi'],
-                    'col': col2,
-                    'color': '#10b981'
-                },
-                {
-                    'name': '📈 Actions CAC40',
-                    'final': comparison['actions_final'],
-                    'profit': comparison['actions_final'] - params['bankroll'],
-                    'roi': comparison['actions_roi'],
-                    'col': col3,
-                    'color': '#f59e0b'
-                }
-            ]
-            
-            # Déterminer le gagnant
-            winner = max(placements, key=lambda x: x['roi'])
-            
-            for placement in placements:
-                with placement['col']:
-                    is_winner = placement['name'] == winner['name']
-                    
-                    st.markdown(f"""
-                    <div class="comparison-card">
-                        <h3>{placement['name']}
-                        {' <span class="winner-badge">🏆 GAGNANT</span>' if is_winner else ''}
-                        </h3>
-                        <div style="margin: 1.5rem 0;">
-                            <div style="color: #9ca3af; font-size: 0.9rem;">Capital Final</div>
-                            <div style="font-size: 2.5rem; font-weight: 800; color: {placement['color']};">
-                                {placement['final']:.2f}€
-                            </div>
-                        </div>
-                        <div style="margin: 1rem 0;">
-                            <div style="color: #9ca3af; font-size: 0.9rem;">Profit</div>
-                            <div style="font-size: 1.8rem; font-weight: 700; color: {'#10b981' if placement['profit'] > 0 else '#ef4444'};">
-                                {'+' if placement['profit'] > 0 else ''}{placement['profit']:.2f}€
-                            </div>
-                        </div>
-                        <div>
-                            <div style="color: #9ca3af; font-size: 0.9rem;">ROI</div>
-                            <div style="font-size: 1.5rem; font-weight: 700; color: {placement['color']};">
-                                {'+' if placement['roi'] > 0 else ''}{placement['roi']:.1f}%
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Analyse comparative
-            bot_vs_livret = stats['roi'] - comparison['livret_roi']
-            bot_vs_actions = stats['roi'] - comparison['actions_roi']
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
-                <div class="success-card">
-                    <h3>🎯 Performance Relative</h3>
-                    <ul>
-                        <li><strong>{'+' if bot_vs_livret > 0 else ''}{bot_vs_livret:.1f}%</strong> vs Livret A</li>
-                        <li><strong>{'+' if bot_vs_actions > 0 else ''}{bot_vs_actions:.1f}%</strong> vs Actions</li>
-                        <li>Soit <strong>{abs(stats['total_profit'] - (comparison['livret_final'] - params['bankroll'])):.2f}€</strong> de plus que le Livret A</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                # Projection sur 5 ans
-                roi_annual = (stats['roi'] / params['days']) * 365
-                
-                projection_5y_bot = params['bankroll'] * ((1 + roi_annual/100) ** 5)
-                projection_5y_livret = params['bankroll'] * ((1 + 0.03) ** 5)
-                projection_5y_actions = params['bankroll'] * ((1 + 0.07) ** 5)
-                
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h3>🔮 Projection sur 5 ans</h3>
-                    <ul>
-                        <li>Bot: <strong>{projection_5y_bot:.2f}€</strong></li>
-                        <li>Livret A: <strong>{projection_5y_livret:.2f}€</strong></li>
-                        <li>Actions: <strong>{projection_5y_actions:.2f}€</strong></li>
-                        <li>Différence: <strong>+{(projection_5y_bot - projection_5y_livret):.2f}€</strong></li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
+        )
+
+def compute_walk_forward(params, options):
+    """Walk-forward sur l'univers des paris candidats, gardé dans le cache de résultats"""
+    cache = get_result_cache()
+    with timed('walk_forward'):
+        return cache.get_or_compute(
+            ('walk_forward', *backtest_cache_key(params), fingerprint(options)),
+            lambda: candidate_engine(params, cache).walk_forward(**options)
+        )
+
+def build_page_graph(params, cache, on_progress=None):
+    """
+    Graphe de calcul de la page : backtest -> stats -> projection, avec les placements
+    classiques et le Monte Carlo en parallèle (politiques de mise et intervalles de
+    confiance sont calculés par leur onglet)
+    Les étapes déjà en cache se résolvent sans calcul
+    on_progress(kind, part) : état partiel des calculs progressifs ('backtest', 'monte_carlo'),
+    appelé depuis les threads du pool
+    """
+    on_progress = on_progress or (lambda kind, part: None)
+    seeds = run_seeds(params['seed'])
+    graph = TaskGraph()
+    
+    # Placements classiques : cache à part, un changement de sélection ne relance qu'eux
+    graph.add('comparison', lambda: cache.get_or_compute(
+        comparison_cache_key(params),
+        lambda: compute_comparison(params, seeds['comparison'])
+    ))
+    
+    backtest = cache.get(backtest_cache_key(params))
+    if backtest is not None:
+        graph.add('backtest', lambda: backtest['results'])
+        graph.add('stats', lambda results: backtest['stats'], 'backtest')
+    else:
+        engine = BacktestEngine(
+            initial_bankroll=params['bankroll'],
+            days=params['days'],
+            seed=seeds['backtest'],
+            **run_strategy(params),
+            **backtest_matches(params, cache)
+        )
         
-        # ========== TAB 2: OBJECTIFS ==========
-        with tab2:
-            st.subheader(f"🎯 Objectif : Multiplier par {params['target_multiplier']}")
+        def run_backtest():
+            for part in engine.iter_backtest(PROGRESS_CHUNK_DAYS):
+                on_progress('backtest', part)
+            return engine.results
+        
+        graph.add('backtest', run_backtest)
+        graph.add('stats', lambda results: engine.get_statistics(), 'backtest')
+    
+    graph.add('projection', lambda stats: compute_projection(params, stats), 'stats')
+    
+    if params['monte_carlo']:
+        runs = cache.get(monte_carlo_cache_key(params))
+        if runs is not None:
+            graph.add('monte_carlo.run', lambda: runs)
+        else:
+            monte_carlo_engine = BacktestEngine(
+                initial_bankroll=params['bankroll'],
+                days=params['days'],
+                seed=seeds['monte_carlo'],
+                **run_strategy(params)
+            )
             
-            target_amount = params['bankroll'] * params['target_multiplier']
-            current_amount = results['final_bankroll']
+            def run_monte_carlo():
+                for part in monte_carlo_engine.iter_monte_carlo(n_paths=params['monte_carlo']):
+                    on_progress('monte_carlo', part)
+                return monte_carlo_engine.monte_carlo
             
-            # Progression actuelle
-            progress = min(100, (current_amount / target_amount) * 100)
+            graph.add('monte_carlo.run', run_monte_carlo)
+        
+        graph.add('monte_carlo.comparison', lambda: cache.get_or_compute(
+            ('monte_carlo.comparison', params['bankroll'], params['days'], params['monte_carlo'],
+             params['benchmarks'], params['seed']),
+            lambda: calculate_investment_comparison(
+                params['bankroll'],
+                params['days'],
+                assets=params['benchmarks'],
+                rng=np.random.default_rng(seeds['monte_carlo_comparison']),
+                n_paths=params['monte_carlo']
+            )
+        ))
+        graph.add(
+            'monte_carlo',
+            lambda runs, comparison: {**runs, 'comparison': comparison},
+            'monte_carlo.run', 'monte_carlo.comparison'
+        )
+    
+    return graph
+
+def compute_page(params, progress=None):
+    """
+    Exécute le graphe de calcul de la page et met en cache backtest et Monte Carlo
+    La progression des tâches est relayée par une file et affichée dans le thread
+    du script (les éléments Streamlit ne se manipulent pas depuis le pool)
+    """
+    cache = get_result_cache()
+    updates = queue.SimpleQueue()
+    graph = build_page_graph(params, cache, lambda kind, part: updates.put((kind, part)))
+    
+    def drain():
+        while not updates.empty():
+            kind, part = updates.get()
+            if progress is not None:
+                getattr(progress, kind)(part)
+    
+    with timed('compute'):
+        outputs = graph.run(poll=drain)
+    drain()
+    
+    if PROFILE:
+        # Durée de chaque tâche : leur somme dépasse celle de l'étape compute
+        timer = st.session_state['stage_timer']
+        for name, _, seconds in graph.timings:
+            timer.record(f'compute.{name}', seconds)
+    
+    if backtest_cache_key(params) not in cache:
+        cache.put(backtest_cache_key(params), {'results': outputs['backtest'], 'stats': outputs['stats']})
+    if params['monte_carlo'] and monte_carlo_cache_key(params) not in cache:
+        cache.put(monte_carlo_cache_key(params), outputs['monte_carlo.run'])
+    
+    return outputs
+
+# ==================== INTERFACE PRINCIPALE ====================
+
+@profiled_fragment
+def render_comparisons_tab(page):
+    """Onglet 💰 Comparaisons : bot vs placements classiques"""
+    params, results, stats = page['params'], page['results'], page['stats']
+    comparison, chart_options = page['comparison'], page['chart_options']
+    roi_annual = page['roi_annual']
+    
+    st.subheader("💰 Bot vs Placements Classiques")
+    
+    benchmarks = [(BENCHMARK_ASSETS[key], comparison[key]) for key in params['benchmarks']]
+    
+    # Graphique de comparaison
+    fig_comparison = cached_figure(
+        create_comparison_chart,
+        results['dates'],
+        results['daily_bankroll'],
+        benchmarks,
+        params['bankroll'],
+        chart_options
+    )
+    st.plotly_chart(fig_comparison, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Tableau comparatif
+    st.markdown("### 📊 Résultats sur {} jours".format(params['days']))
+    
+    # Une colonne pour le bot + une par placement
+    columns = st.columns(1 + len(benchmarks))
+    
+    placements = [
+        {
+            'name': '🤖 Bot Paris Foot',
+            'final': results['final_bankroll'],
+            'profit': stats['total_profit'],
+            'roi': stats['roi'],
+            'col': columns[0],
+            'color': '#667eea'
+        }
+    ]
+    for (asset, _), col in zip(benchmarks, columns[1:]):
+        final = comparison[f"{asset['prefix']}_final"]
+        placements.append({
+            'name': asset['name'],
+            'final': final,
+            'profit': final - params['bankroll'],
+            'roi': comparison[f"{asset['prefix']}_roi"],
+            'col': col,
+            'color': asset['color']
+        })
+    
+    # Déterminer le gagnant
+    winner = max(placements, key=lambda x: x['roi'])
+    
+    for placement in placements:
+        with placement['col']:
+            is_winner = placement['name'] == winner['name']
             
             st.markdown(f"""
-            <div class="goal-card">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                    <div>
-                        <h3 style="margin: 0;">De {params['bankroll']:.0f}€ à {target_amount:.0f}€</h3>
-                        <p style="color: #9ca3af; margin: 0.5rem 0;">Capital actuel: <strong>{current_amount:.2f}€</strong></p>
+            <div class="comparison-card">
+                <h3>{placement['name']}
+                {' <span class="winner-badge">🏆 GAGNANT</span>' if is_winner else ''}
+                </h3>
+                <div style="margin: 1.5rem 0;">
+                    <div style="color: #9ca3af; font-size: 0.9rem;">Capital Final</div>
+                    <div style="font-size: 2.5rem; font-weight: 800; color: {placement['color']};">
+                        {placement['final']:.2f}€
                     </div>
-                    <div style="text-align: right;">
-                        <div style="font-size: 3rem; font-weight: 900; color: #6366f1;">
-                            {progress:.0f}%
-                        </div>
+                </div>
+                <div style="margin: 1rem 0;">
+                    <div style="color: #9ca3af; font-size: 0.9rem;">Profit</div>
+                    <div style="font-size: 1.8rem; font-weight: 700; color: {'#10b981' if placement['profit'] > 0 else '#ef4444'};">
+                        {'+' if placement['profit'] > 0 else ''}{placement['profit']:.2f}€
                     </div>
                 </div>
-                <div class="progress-container">
-                    <div class="progress-bar" style="width: {progress}%;">
-                        {progress:.1f}%
+                <div>
+                    <div style="color: #9ca3af; font-size: 0.9rem;">ROI</div>
+                    <div style="font-size: 1.5rem; font-weight: 700; color: {placement['color']};">
+                        {'+' if placement['roi'] > 0 else ''}{placement['roi']:.1f}%
                     </div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Calculs temporels
-            if doubling_time:
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">⏱️ Temps pour doubler</div>
-                        <div class="metric-value">{doubling_time['months']:.1f}</div>
-                        <div class="metric-label">Mois</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">📅 Soit en jours</div>
-                        <div class="metric-value">{doubling_time['days']}</div>
-                        <div class="metric-label">Jours</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <div class="metric-label">🗓️ Ou en années</div>
-                        <div class="metric-value">{doubling_time['years']:.1f}</div>
-                        <div class="metric-label">Années</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Timeline de progression
-            if projection and projection['achieved']:
-                target_date = datetime.now() + timedelta(days=projection['days_to_target'])
-                
-                st.markdown(f"""
-                <div class="success-card">
-                    <h3>✅ Objectif Atteignable !</h3>
-                    <p style="font-size: 1.2rem;">
-                        Au rythme actuel, vous atteindrez <strong>{target_amount:.0f}€</strong> 
-                        dans environ <strong>{projection['days_to_target']} jours</strong>
-                    </p>
-                    <p style="color: #9ca3af;">
-                        Date estimée : <strong>{target_date.strftime('%d %B %Y')}</strong>
-                    </p>
+    
+    st.markdown("---")
+    
+    # Analyse comparative
+    relative_items = "".join(
+        f"<li><strong>{stats['roi'] - placement['roi']:+.1f}%</strong> vs {asset['short']}</li>"
+        for (asset, _), placement in zip(benchmarks, placements[1:])
+    )
+    if benchmarks:
+        reference = placements[1]
+        relative_items += (
+            f"<li>Soit <strong>{stats['total_profit'] - reference['profit']:+.2f}€</strong> "
+            f"par rapport à : {benchmarks[0][0]['short']}</li>"
+        )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="success-card">
+            <h3>🎯 Performance Relative</h3>
+            <ul>
+                {relative_items}
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        # Projection sur 5 ans
+        projection_5y_bot = params['bankroll'] * ((1 + roi_annual/100) ** 5)
+        projection_items = f"<li>Bot: <strong>{projection_5y_bot:.2f}€</strong></li>"
+        for asset, _ in benchmarks:
+            projection_5y = params['bankroll'] * ((1 + asset['rate']) ** 5)
+            projection_items += f"<li>{asset['short']}: <strong>{projection_5y:.2f}€</strong></li>"
+        if benchmarks:
+            projection_5y_reference = params['bankroll'] * ((1 + benchmarks[0][0]['rate']) ** 5)
+            projection_items += (
+                f"<li>Différence: <strong>{projection_5y_bot - projection_5y_reference:+.2f}€</strong></li>"
+            )
+        
+        st.markdown(f"""
+        <div class="warning-card">
+            <h3>🔮 Projection sur 5 ans</h3>
+            <ul>
+                {projection_items}
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+@profiled_fragment
+def render_goals_tab(page):
+    """Onglet 🎯 Objectifs : projection et paliers de croissance"""
+    params, results = page['params'], page['results']
+    chart_options = page['chart_options']
+    
+    # Objectifs calculés par le graphe de la page, en parallèle des autres étapes
+    doubling_time = page['projection']['doubling_time']
+    projection = page['projection']['projection']
+    milestones = page['projection']['milestones']
+    
+    st.subheader(f"🎯 Objectif : Multiplier par {params['target_multiplier']}")
+    
+    target_amount = params['bankroll'] * params['target_multiplier']
+    current_amount = results['final_bankroll']
+    
+    # Progression actuelle
+    progress = min(100, (current_amount / target_amount) * 100)
+    
+    st.markdown(f"""
+    <div class="goal-card">
+        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+            <div>
+                <h3 style="margin: 0;">De {params['bankroll']:.0f}€ à {target_amount:.0f}€</h3>
+                <p style="color: #9ca3af; margin: 0.5rem 0;">Capital actuel: <strong>{current_amount:.2f}€</strong></p>
+            </div>
+            <div style="text-align: right;">
+                <div style="font-size: 3rem; font-weight: 900; color: #6366f1;">
+                    {progress:.0f}%
                 </div>
-                """, unsafe_allow_html=True)
-                
-                # Graphique de projection
-                projection_dates = [datetime.now() + timedelta(days=i) for i in range(len(projection['projection']))]
-                
-                fig_proj = go.Figure()
-                
-                fig_proj.add_trace(go.Scatter(
-                    x=projection_dates,
-                    y=projection['projection'],
-                    mode='lines',
-                    name='Projection',
-                    line=dict(color='#667eea', width=3),
-                    fill='tozeroy',
-                    fillcolor='rgba(102, 126, 234, 0.2)'
-                ))
-                
-                # Ligne objectif
-                fig_proj.add_trace(go.Scatter(
-                    x=[projection_dates[0], projection_dates[-1]],
-                    y=[target_amount, target_amount],
-                    mode='lines',
-                    name='Objectif',
-                    line=dict(color='#10b981', width=3, dash='dash')
-                ))
-                
-                fig_proj.update_layout(
-                    title="🚀 Projection de Croissance vers l'Objectif",
-                    xaxis_title="Date",
-                    yaxis_title="Bankroll (€)",
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white'),
-                    hovermode='x unified',
-                    height=500
-                )
-                
-                st.plotly_chart(fig_proj, use_container_width=True)
-            
-            else:
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h3>⚠️ Objectif Ambitieux</h3>
-                    <p style="font-size: 1.1rem;">
-                        Au rythme actuel, l'objectif de <strong>{target_amount:.0f}€</strong> 
-                        nécessite plus de 5 ans.
-                    </p>
-                    <p style="color: #9ca3af;">
-                        💡 Conseil : Réduisez l'objectif ou augmentez la performance du bot
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Simulation par paliers
-            st.markdown("### 📊 Paliers de Croissance")
-            
-            milestones = [
-                (1.5, "×1.5"),
-                (2, "×2"),
-                (3, "×3"),
-                (5, "×5"),
-                (10, "×10")
-            ]
+            </div>
+        </div>
+        <div class="progress-container">
+            <div class="progress-bar" style="width: {progress}%;">
+                {progress:.1f}%
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Calculs temporels
+    if doubling_time:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">⏱️ Temps pour doubler</div>
+                <div class="metric-value">{doubling_time['months']:.1f}</div>
+                <div class="metric-label">Mois</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">📅 Soit en jours</div>
+                <div class="metric-value">{doubling_time['days']}</div>
+                <div class="metric-label">Jours</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">🗓️ Ou en années</div>
+                <div class="metric-value">{doubling_time['years']:.1f}</div>
+                <div class="metric-label">Années</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Timeline de progression
+    if projection and projection['achieved']:
+        target_date = datetime.now() + timedelta(days=projection['days_to_target'])
+        
+        st.markdown(f"""
+        <div class="success-card">
+            <h3>✅ Objectif Atteignable !</h3>
+            <p style="font-size: 1.2rem;">
+                Au rythme actuel, vous atteindrez <strong>{target_amount:.0f}€</strong> 
+                dans environ <strong>{projection['days_to_target']} jours</strong>
+            </p>
+            <p style="color: #9ca3af;">
+                Date estimée : <strong>{target_date.strftime('%d %B %Y')}</strong>
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Graphique de projection
+        projection_dates = pd.date_range(
+            pd.Timestamp.today().normalize(),
+            periods=len(projection['projection']),
+            freq='D'
+        )
+        
+        fig_proj = cached_figure(
+            create_projection_chart,
+            projection_dates,
+            projection['projection'],
+            target_amount,
+            chart_options
+        )
+        
+        st.plotly_chart(fig_proj, use_container_width=True)
+    
+    else:
+        st.markdown(f"""
+        <div class="warning-card">
+            <h3>⚠️ Objectif Ambitieux</h3>
+            <p style="font-size: 1.1rem;">
+                Au rythme actuel, l'objectif de <strong>{target_amount:.0f}€</strong> 
+                nécessite plus de 5 ans.
+            </p>
+            <p style="color: #9ca3af;">
+                💡 Conseil : Réduisez l'objectif ou augmentez la performance du bot
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Simulation par paliers
+    st.markdown("### 📊 Paliers de Croissance")
+    
+    # Durées de tous les paliers en un seul appel du solveur
+    months_needed = milestones['months'] if milestones else np.full(len(MILESTONES), np.inf)
+    
+    milestone_data = []
+    for (mult, label), months in zip(MILESTONES, months_needed):
+        target = params['bankroll'] * mult
+        
+        milestone_data.append({
+            'Objectif': label,
+            'Montant': f"{target:.0f}€",
+            'Temps estimé': f"{months:.1f} mois" if months < 120 else "10+ ans",
+            'Réaliste': '✅' if months < 36 else '⚠️' if months < 60 else '❌'
+        })
+    
+    df_milestones = pd.DataFrame(milestone_data)
+    st.dataframe(df_milestones, use_container_width=True, hide_index=True)
+
+
+@profiled_fragment
+def render_overview_tab(page):
+    """Onglet 📊 Vue d'ensemble : métriques, bankroll et performance glissante"""
+    params, results, stats = page['params'], page['results'], page['stats']
+    chart_options = page['chart_options']
+    
+    # Métriques principales
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        profit_class = "stat-positive" if stats['total_profit'] > 0 else "stat-negative"
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">💰 Profit Total</div>
+            <div class="metric-value {profit_class}">
+                {'+' if stats['total_profit'] > 0 else ''}{stats['total_profit']:.2f}€
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        roi_class = "stat-positive" if stats['roi'] > 0 else "stat-negative"
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">📈 ROI</div>
+            <div class="metric-value {roi_class}">
+                {'+' if stats['roi'] > 0 else ''}{stats['roi']:.1f}%
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">🎯 Win Rate</div>
+            <div class="metric-value">
+                {stats['win_rate']:.1f}%
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">⚡ Profit Factor</div>
+            <div class="metric-value">
+                {stats['profit_factor']:.2f}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Graphique d'évolution de la bankroll
+    fig_bankroll = cached_figure(
+        create_bankroll_chart,
+        results['dates'],
+        results['daily_bankroll'],
+        params['bankroll'],
+        chart_options
+    )
+    
+    st.plotly_chart(fig_bankroll, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Indicateurs glissants
+    st.markdown("### 📉 Performance Glissante")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        rolling_metric = st.selectbox(
+            "Indicateur",
+            list(ROLLING_METRICS),
+            format_func=lambda key: ROLLING_METRICS[key]
+        )
+    
+    with col2:
+        rolling_windows = st.multiselect(
+            "Fenêtres (jours)",
+            [7, 30, 90],
+            default=[7, 30, 90]
+        )
+    
+    bets = results['bets']
+    rolling_by_window = {
+        window: calculate_rolling_metrics(
+            results['daily_bankroll'],
+            window,
+            day=bets['date'].array.codes,
+            won=bets['won'].to_numpy(),
+            profit=bets['profit'].to_numpy()
+        )
+        for window in sorted(rolling_windows)
+        if window <= params['days']
+    }
+    
+    if rolling_by_window:
+        fig_rolling = cached_figure(
+            create_rolling_chart,
+            results['dates'],
+            rolling_by_window,
+            rolling_metric,
+            chart_options
+        )
+        st.plotly_chart(fig_rolling, use_container_width=True)
+    else:
+        st.caption("💡 Choisissez une fenêtre plus courte que la période simulée")
+
+
+@profiled_fragment
+def render_statistics_tab(page):
+    """Onglet 📋 Statistiques détaillées"""
+    stats = page['stats']
+    bootstrap = compute_bootstrap(page['params'], page['results'])
+    
+    def interval(name, fmt):
+        """Intervalle de confiance bootstrap affiché sous la métrique"""
+        if bootstrap is None or np.isnan(bootstrap[name]['low']):
+            return
+        low, high = bootstrap[name]['low'], bootstrap[name]['high']
+        st.caption(f"IC {bootstrap['confidence']:.0%} : [{low:{fmt}} ; {high:{fmt}}]")
+    
+    st.subheader("📊 Statistiques Détaillées")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 📋 Général")
+        st.metric("Total Paris", stats['total_bets'])
+        st.metric("Paris Gagnés", f"{stats['won_bets']} ({stats['win_rate']:.1f}%)")
+        interval('win_rate', '.1f')
+        st.metric("Paris Perdus", stats['lost_bets'])
+    
+    with col2:
+        st.markdown("### 💰 Rentabilité")
+        st.metric("ROI", f"{stats['roi']:.1f}%")
+        interval('roi', '.1f')
+        st.metric("Profit Factor", stats['profit_factor'])
+        interval('profit_factor', '.2f')
+        st.metric("Sharpe Ratio", stats['sharpe_ratio'])
+        interval('sharpe_ratio', '.2f')
+    
+    with col3:
+        st.markdown("### 🎯 Performance")
+        st.metric("EV Moyen", f"{stats['avg_ev']:.1f}%")
+        st.metric("Max Drawdown", f"{stats['max_drawdown']:.1f}%")
+        st.metric("Plus Longue Série", f"✅ {stats['longest_win_streak']}")
+    
+    if bootstrap is not None:
+        n_resamples = f"{bootstrap['n_resamples']:,}".replace(',', ' ')
+        st.caption(
+            f"Intervalles de confiance bootstrap : {n_resamples} rééchantillonnages des paris "
+            "(avec remise), percentiles des statistiques rééchantillonnées"
+        )
+
+
+@profiled_fragment
+def render_monte_carlo_tab(page):
+    """Onglet 🎲 Monte Carlo : éventail des trajectoires"""
+    params, stats = page['params'], page['stats']
+    monte_carlo, chart_options = page['monte_carlo'], page['chart_options']
+    
+    st.subheader(f"🎲 {monte_carlo['n_paths']} Trajectoires Simulées")
+    
+    target_amount = params['bankroll'] * params['target_multiplier']
+    prob_target = (monte_carlo['final'] >= target_amount).mean() * 100
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    mc_metrics = [
+        (col1, "💰 Bankroll Médiane", f"{monte_carlo['final_percentiles'][50]:.0f}€"),
+        (col2, "📈 Probabilité de Profit", f"{monte_carlo['prob_profit']:.1f}%"),
+        (col3, f"🎯 Objectif ×{params['target_multiplier']} Atteint", f"{prob_target:.1f}%"),
+        (col4, f"💀 Ruine (−{(1 - monte_carlo['ruin_level']) * 100:.0f}%)", f"{monte_carlo['prob_ruin']:.1f}%")
+    ]
+    
+    for col, label, value in mc_metrics:
+        with col:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">{label}</div>
+                <div class="metric-value">{value}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    fig_fan = cached_figure(
+        create_fan_chart,
+        monte_carlo['dates'],
+        monte_carlo['bands'],
+        params['bankroll'],
+        target_amount,
+        benchmarks=[
+            (BENCHMARK_ASSETS[key], monte_carlo['comparison'][f'{key}_bands'])
+            for key in params['benchmarks']
+        ],
+        chart_options=chart_options
+    )
+    st.plotly_chart(fig_fan, use_container_width=True)
+    
+    # Distribution de la bankroll finale
+    st.markdown("### 📊 Bankroll Finale par Percentile")
+    
+    df_percentiles = pd.DataFrame([
+        {
+            'Percentile': f"{level}%",
+            'Bankroll': f"{value:.2f}€",
+            'ROI': f"{(value - params['bankroll']) / params['bankroll'] * 100:+.1f}%"
+        }
+        for level, value in monte_carlo['final_percentiles'].items()
+    ])
+    st.dataframe(df_percentiles, use_container_width=True, hide_index=True)
+    
+    st.caption(
+        f"💡 Le backtest unique affiche un ROI de {stats['roi']:+.1f}% ; "
+        f"le ROI médian sur {monte_carlo['n_paths']} trajectoires est de {monte_carlo['median_roi']:+.1f}%"
+    )
+
+
+@profiled_fragment
+def render_staking_tab(page):
+    """Onglet ⚖️ Mises : politiques de mise comparées sur les paris du backtest"""
+    params, results, chart_options = page['params'], page['results'], page['chart_options']
+    staking = compute_staking(params, results)
+    
+    st.subheader("⚖️ Politiques de Mise")
+    st.caption(
+        "💡 Toutes les politiques sont évaluées sur les mêmes paris que le backtest : "
+        "les écarts ne viennent que de la taille des mises"
+    )
+    
+    fig_staking = cached_figure(
+        create_staking_chart,
+        results['dates'],
+        staking,
+        params['bankroll'],
+        chart_options
+    )
+    st.plotly_chart(fig_staking, use_container_width=True)
+    
+    df_staking = pd.DataFrame([
+        {
+            'Politique': row['label'],
+            'Bankroll Finale': f"{row['final_bankroll']:.2f}€",
+            'ROI': f"{row['roi']:+.1f}%",
+            'Max Drawdown': f"{row['max_drawdown']:.1f}%",
+            'Sharpe': row['sharpe_ratio'],
+            'Mise Moyenne': f"{row['avg_stake_pct']:.2f}%",
+            'Exposition Max/Jour': f"{row['max_day_exposure']:.1f}%",
+            'Ruine': '💀' if row['ruined'] else ''
+        }
+        for row in sorted(staking['rows'], key=lambda row: row['final_bankroll'], reverse=True)
+    ])
+    st.dataframe(df_staking, use_container_width=True, hide_index=True)
+
+
+@profiled_fragment
+def render_optimization_tab(page):
+    """Onglet 🔧 Optimisation : grille seuil d'EV × Kelly × bornes de mise"""
+    params = page['params']
+    
+    st.subheader("🔧 Optimisation de la Stratégie")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        ev_range = st.slider("Seuil d'EV (%)", 0.0, 30.0, (0.0, 20.0), 0.5)
+        kelly_range = st.slider("Multiplicateur de Kelly", 0.01, 1.0, (0.05, 1.0), 0.01)
+    
+    with col2:
+        resolution = st.select_slider("Points par axe", [10, 20, 30, 40, 50], value=50)
+        objective = st.selectbox(
+            "Objectif",
+            list(OPTIMIZATION_METRICS),
+            index=1,
+            format_func=lambda key: OPTIMIZATION_METRICS[key]
+        )
+    
+    with col3:
+        min_stake = st.selectbox("Mise min (%)", [0.0, 0.5, 1.0], index=1)
+        max_stakes = st.multiselect("Mises max (%)", [2, 3, 5, 10, 25], default=[5])
+        prune = st.checkbox("Élaguer les zones dominées", value=True)
+    
+    max_stakes = [stake for stake in sorted(max_stakes) if stake > min_stake]
+    if not max_stakes:
+        st.warning("⚠️ Choisissez au moins une mise max supérieure à la mise min")
+        return
+    
+    grid = {
+        'ev_thresholds': np.linspace(*ev_range, resolution),
+        'kelly_multipliers': np.linspace(*kelly_range, resolution),
+        'stake_bounds': tuple((min_stake, float(stake)) for stake in max_stakes),
+        'objective': objective,
+        'prune': prune
+    }
+    
+    # Calcul au clic, puis réutilisé tant que la grille ne change pas
+    launched = st.button("🔧 Lancer l'optimisation")
+    if not launched and optimization_cache_key(params, grid) not in get_result_cache():
+        st.info("💡 L'univers des paris candidats est tiré une fois puis réutilisé par toutes les cellules")
+        return
+    
+    optimization = compute_optimization(params, grid)
+    
+    best = optimization['best']
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Seuil d'EV", f"> {best['ev_threshold']:.1f}%")
+    col2.metric("Kelly", f"×{best['kelly_multiplier']:.2f}")
+    col3.metric("ROI", f"{best['roi']:+.1f}%")
+    col4.metric("Sharpe", f"{best['sharpe_ratio']:.2f}")
+    col5.metric("Max Drawdown", f"{best['max_drawdown']:.1f}%")
+    
+    n_cells = optimization['evaluated'].size
+    st.caption(
+        f"💡 Meilleure cellule ({OPTIMIZATION_METRICS[objective]}) : mises {best['min_stake_pct']:g}-"
+        f"{best['max_stake_pct']:g}%, {best['total_bets']} paris · "
+        f"{optimization['evaluated'].sum()}/{n_cells} cellules évaluées en {optimization['seconds'] * 1000:.0f} ms"
+    )
+    
+    bound_index = 0
+    if len(optimization['stake_bounds']) > 1:
+        bound_index = st.radio(
+            "Bornes de mise",
+            range(len(optimization['stake_bounds'])),
+            format_func=lambda b: "{:g}-{:g}%".format(*optimization['stake_bounds'][b]),
+            horizontal=True
+        )
+    
+    for col, metric in zip(st.columns(3), OPTIMIZATION_METRICS):
+        with col:
+            fig_heatmap = cached_figure(create_optimization_heatmap, optimization, metric, bound_index)
+            st.plotly_chart(fig_heatmap, use_container_width=True)
+
+
+@profiled_fragment
+def render_walk_forward_tab(page):
+    """Onglet 🚶 Walk-forward : paramètres choisis sur le passé, joués sur la suite"""
+    params, chart_options = page['params'], page['chart_options']
+    
+    st.subheader("🚶 Walk-Forward")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        train_days = st.slider("Apprentissage (jours)", 30, 365, 180, 15)
+    with col2:
+        test_days = st.slider("Jeu (jours)", 7, 90, 30, 1)
+    with col3:
+        objective = st.selectbox(
+            "Critère de choix",
+            ['sharpe_ratio', 'roi'],
+            format_func=lambda key: OPTIMIZATION_METRICS[key]
+        )
+    
+    if params['days'] < train_days + test_days:
+        st.warning(f"⚠️ Période trop courte : {params['days']} jours pour {train_days} + {test_days}")
+        return
+    
+    walk = compute_walk_forward(
+        params, {'train_days': train_days, 'test_days': test_days, 'objective': objective}
+    )
+    stats, baseline = walk['stats'], walk['baseline_stats']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("ROI hors échantillon", f"{stats['roi']:+.1f}%",
+                f"{stats['roi'] - baseline['roi']:+.1f} pts vs fixe")
+    col2.metric("Sharpe", f"{stats['sharpe_ratio']:.2f}",
+                f"{stats['sharpe_ratio'] - baseline['sharpe_ratio']:+.2f} vs fixe")
+    col3.metric("Max Drawdown", f"{stats['max_drawdown']:.1f}%")
+    col4.metric("Fenêtres", len(walk['folds']), f"{stats['total_bets']} paris", delta_color='off')
+    
+    fig_walk = cached_figure(create_walk_forward_chart, walk, params['bankroll'], chart_options)
+    st.plotly_chart(fig_walk, use_container_width=True)
+    
+    st.markdown("### 🗓️ Paramètres par Fenêtre")
+    score_format = "{:+.1f}%" if objective == 'roi' else "{:.2f}"
+    df_folds = pd.DataFrame([
+        {
+            'Apprentissage': f"{pd.Timestamp(fold['train_start']):%d/%m/%Y}",
+            'Jeu': f"{pd.Timestamp(fold['test_start']):%d/%m/%Y} → {pd.Timestamp(fold['test_end']):%d/%m/%Y}",
+            "Seuil d'EV": f"> {fold['ev_threshold']:g}%",
+            'Kelly': f"×{fold['kelly_multiplier']:.1f}",
+            'Score Apprentissage': score_format.format(fold['train_score']),
+            'ROI Jeu': f"{fold['test_roi']:+.1f}%",
+            'Paris': fold['bets']
+        }
+        for fold in walk['folds']
+    ])
+    st.dataframe(df_folds, use_container_width=True, hide_index=True)
+
+
+# Onglets de résultats : (titre, fonction de rendu)
+RESULT_TABS = [
+    ("💰 Comparaisons", render_comparisons_tab),
+    ("🎯 Objectifs", render_goals_tab),
+    ("📊 Vue d'ensemble", render_overview_tab),
+    ("📋 Statistiques", render_statistics_tab),
+    ("⚖️ Mises", render_staking_tab),
+    ("🔧 Optimisation", render_optimization_tab),
+    ("🚶 Walk-forward", render_walk_forward_tab),
+    ("🎲 Monte Carlo", render_monte_carlo_tab)
+]
+
+@profiled_fragment
+def render_result_tabs(page):
+    """
+    Onglets de résultats, rendus à la demande
+    Seul l'onglet ouvert est calculé ; changer d'onglet ne relance que ce fragment
+    et chaque onglet est lui-même un fragment relancé seul lors de ses interactions
+    """
+    result_tabs = [(name, render) for name, render in RESULT_TABS
+                   if render is not render_monte_carlo_tab or page['monte_carlo']]
+    
+    tabs = st.tabs([name for name, _ in result_tabs], key='result_tab', on_change='rerun')
+    
+    for tab, (_, render) in zip(tabs, result_tabs):
+        if tab.open:
+            with tab, timed(f'tab.{render.__name__}'):
+                render(page)
+
+def main():
+    if PROFILE:
+        st.session_state['stage_timer'] = StageTimer()
+    
+    inject_css()
+    
+    # Header
+    st.markdown("""
+    <div class="header-pro">
+        <h1>⚽ PronoSmart - Backtesting Avancé</h1>
+        <p>Simulation, Comparaisons & Objectifs de Profit</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Sidebar
+    with st.sidebar:
+        st.image("https://img.icons8.com/fluency/96/000000/financial-analytics.png", width=80)
+        st.title("Configuration")
+        
+        st.markdown("### 💰 Paramètres")
+        
+        initial_bankroll = st.number_input(
+            "Bankroll Initiale (€)",
+            min_value=100.0,
+            max_value=100000.0,
+            value=1000.0,
+            step=100.0
+        )
+        
+        st.markdown("---")
+        st.markdown("### 📚 Source des paris")
+        
+        source = st.radio(
+            "Matchs",
+            ['simulation', 'history'],
+            format_func={'simulation': 'Simulés', 'history': 'Historiques (CSV)'}.get,
+            horizontal=True
+        )
+        
+        history = None
+        if source == 'history':
+            uploads = st.file_uploader(
+                "CSV football-data.co.uk",
+                type='csv',
+                accept_multiple_files=True
+            )
+            if st.button("📥 Importer les CSV", disabled=not uploads):
+                n_matches = ingest_historical_odds(uploads)
+                st.success(f"{n_matches} matchs ajoutés au cache")
             
-            milestone_data = []
-            for mult, label in milestones:
-                target = params['bankroll'] * mult
-                if doubling_time:
-                    # Estimation basée sur le ROI annuel
-                    roi_annual = (stats['roi'] / params['days']) * 365
-                    if roi_annual > 0:
-                        years_needed = np.log(mult) / np.log(1 + roi_annual/100)
-                        months_needed = years_needed * 12
-                    else:
-                        months_needed = float('inf')
-                else:
-                    months_needed = float('inf')
+            partitions = historical_partitions()
+            leagues = st.multiselect("Ligues", list(partitions), default=list(partitions))
+            seasons = st.multiselect(
+                "Saisons",
+                sorted({season for league in leagues for season in partitions[league]}),
+                format_func=lambda season: f"{season}-{season + 1}"
+            )
+            if leagues:
+                # Index chargé une fois par choix de partitions, puis filtré par dichotomie
+                store = get_match_store(tuple(leagues), tuple(seasons))
+                teams = st.multiselect("Équipes (toutes par défaut)", store.teams)
                 
-                milestone_data.append({
-                    'Objectif': label,
-                    'Montant': f"{target:.0f}€",
-                    'Temps estimé': f"{months_needed:.1f} mois" if months_needed < 120 else "10+ ans",
-                    'Réaliste': '✅' if months_needed < 36 else '⚠️' if months_needed < 60 else '❌'
-                })
-            
-            df_milestones = pd.DataFrame(milestone_data)
-            st.dataframe(df_milestones, use_container_width=True, hide_index=True)
+                match_dates = store.dates[store.positions(teams=teams)]
+                st.caption(f"{len(match_dates)} matchs sélectionnés")
+                if len(match_dates):
+                    history = (tuple(leagues), tuple(seasons), tuple(teams))
+                    history_days = int((match_dates[-1] - match_dates[0]) // np.timedelta64(1, 'D')) + 1
+            else:
+                st.warning("Importez des CSV pour backtester sur des matchs réels")
         
-        # ========== TAB 3: VUE D'ENSEMBLE ==========
-        with tab3:
-            # Métriques principales
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                profit_class = "stat-positive" if stats['total_profit'] > 0 else "stat-negative"
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">💰 Profit Total</div>
-                    <div class="metric-value {profit_class}">
-                        {'+' if stats['total_profit'] > 0 else ''}{stats['total_profit']:.2f}€
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                roi_class = "stat-positive" if stats['roi'] > 0 else "stat-negative"
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">📈 ROI</div>
-                    <div class="metric-value {roi_class}">
-                        {'+' if stats['roi'] > 0 else ''}{stats['roi']:.1f}%
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">🎯 Win Rate</div>
-                    <div class="metric-value">
-                        {stats['win_rate']:.1f}%
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        days = st.slider(
+            "Période (jours)",
+            min_value=30,
+            max_value=730,
+            value=365,
+            step=30,
+            disabled=source == 'history',
+            help="En mode historique, la période est celle des matchs choisis"
+        )
+        
+        st.markdown("---")
+        st.markdown("### 🎯 Objectif")
+        
+        target_multiplier = st.selectbox(
+            "Multiplier la bankroll par :",
+            [2, 3, 5, 10],
+            index=0,
+            format_func=lambda x: f"×{x} ({initial_bankroll * x:.0f}€)"
+        )
+        
+        benchmarks = st.multiselect(
+            "Placements de référence",
+            list(BENCHMARK_ASSETS),
+            default=list(DEFAULT_BENCHMARKS),
+            format_func=lambda key: BENCHMARK_ASSETS[key]['name']
+        )
+        
+        st.markdown("---")
+        st.markdown("### 🎲 Monte Carlo")
+        
+        # Les trajectoires simulent des paris synthétiques : sans rapport avec un backtest
+        # sur matchs réels, le Monte Carlo est réservé au mode simulé
+        monte_carlo = st.checkbox(
+            "Simuler plusieurs trajectoires",
+            value=False,
+            disabled=source == 'history',
+            help="Paris simulés uniquement (indisponible sur les matchs historiques)"
+        ) and source != 'history'
+        n_paths = st.select_slider(
+            "Nombre de trajectoires",
+            options=[1000, 2000, 5000, 10000],
+            value=1000,
+            disabled=not monte_carlo
+        )
+        
+        st.markdown("---")
+        st.markdown("### 🖥️ Affichage")
+        
+        high_volume = st.checkbox(
+            "Graphiques haute densité (WebGL)",
+            value=False,
+            help="Rendu WebGL et courbes réduites (LTTB) pour les longues périodes"
+        )
+        max_points = st.select_slider(
+            "Points par courbe",
+            options=[500, 1000, 1500, 2000, 4000],
+            value=DEFAULT_CHART_OPTIONS['max_points'],
+            disabled=not high_volume
+        )
+        chart_options = {'high_volume': high_volume, 'max_points': max_points}
+        
+        st.markdown("---")
+        
+        if st.button("🚀 LANCER LE BACKTEST", disabled=source == 'history' and history is None):
+            if history is not None:
+                # Période couverte par les matchs choisis
+                days = history_days
             
-            with col4:
+            # Nouvelle graine à chaque lancement : les reruns suivants réutilisent le cache
+            st.session_state['run_backtest'] = True
+            st.session_state['backtest_params'] = run_params({
+                'bankroll': initial_bankroll,
+                'days': days,
+                'monte_carlo': n_paths if monte_carlo else 0,
+                'history': history,
+                'seed': np.random.SeedSequence().entropy
+            })
+        
+        st.markdown("---")
+        st.markdown("### 💾 Archives")
+        
+        archive_format = st.radio(
+            "Format d'archive",
+            list(ARCHIVE_FORMATS),
+            format_func={'arrow': 'Arrow IPC', 'parquet': 'Parquet'}.get,
+            horizontal=True
+        )
+        archives = list_archives()
+        archive = st.selectbox("Archives disponibles", archives, disabled=not archives)
+        
+        if st.button("📂 Recharger l'archive", disabled=not archives):
+            # L'archive alimente le cache : l'affichage suit le chemin habituel
+            st.session_state['run_backtest'] = True
+            st.session_state['backtest_params'] = restore_backtest(os.path.join(ARCHIVE_DIR, archive))
+        
+        st.markdown("---")
+        st.caption("💡 Simulation avec données réalistes")
+    
+    # Contenu principal
+    if 'run_backtest' not in st.session_state:
+        # Page d'accueil
+        st.info("""
+        ### 👋 Module de Backtesting Professionnel
+        
+        **Nouvelles fonctionnalités :**
+        
+        💰 **Comparaison avec placements classiques**
+        - Livret A (3%/an)
+        - Actions CAC40 (7%/an)
+        - Voyez la différence avec le bot !
+        
+        🎯 **Objectifs de profit**
+        - Calculez le temps pour doubler votre bankroll
+        - Projections de croissance
+        - Timeline précise
+        
+        👈 Configurez vos paramètres et lancez le backtest !
+        """)
+        
+        # Métriques d'exemple
+        col1, col2, col3, col4 = st.columns(4)
+        
+        examples = [
+            ("🤖", "+42.5%", "ROI Bot"),
+            ("🏦", "+3.0%", "Livret A"),
+            ("📈", "+7.0%", "Actions"),
+            ("🎯", "1.7 ans", "Pour doubler")
+        ]
+        
+        for col, (icon, value, label) in zip([col1, col2, col3, col4], examples):
+            with col:
                 st.markdown(f"""
                 <div class="metric-card">
-                    <div class="metric-label">⚡ Profit Factor</div>
-                    <div class="metric-value">
-                        {stats['profit_factor']:.2f}
-                    </div>
+                    <div style="font-size: 2rem;">{icon}</div>
+                    <div class="metric-value">{value}</div>
+                    <div class="metric-label">{label}</div>
                 </div>
                 """, unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            # Graphique d'évolution de la bankroll
-            fig_bankroll = go.Figure()
-            
-            fig_bankroll.add_trace(go.Scatter(
-                x=results['dates'],
-                y=results['daily_bankroll'][1:],
-                mode='lines',
-                name='Bankroll',
-                line=dict(color='#667eea', width=3),
-                fill='tozeroy',
-                fillcolor='rgba(102, 126, 234, 0.2)'
-            ))
-            
-            fig_bankroll.add_trace(go.Scatter(
-                x=[results['dates'][0], results['dates'][-1]],
-                y=[params['bankroll'], params['bankroll']],
-                mode='lines',
-                name='Bankroll Initiale',
-                line=dict(color='#9ca3af', width=2, dash='dash')
-            ))
-            
-            fig_bankroll.update_layout(
-                title="📈 Évolution de la Bankroll",
-                xaxis_title="Date",
-                yaxis_title="Bankroll (€)",
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                hovermode='x unified',
-                height=500
-            )
-            
-            st.plotly_chart(fig_bankroll, use_container_width=True)
+    
+    else:
+        # Exécution du backtest (ou réutilisation du cache)
+        # L'objectif et les placements de référence suivent les sélecteurs sans relancer
+        # la simulation (seule la comparaison dépend des placements)
+        params = {
+            **st.session_state['backtest_params'],
+            'target_multiplier': target_multiplier,
+            'benchmarks': tuple(benchmarks)
+        }
         
-        # ========== TAB 4: STATISTIQUES ==========
-        with tab4:
-            st.subheader("📊 Statistiques Détaillées")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("### 📋 Général")
-                st.metric("Total Paris", stats['total_bets'])
-                st.metric("Paris Gagnés", f"{stats['won_bets']} ({stats['win_rate']:.1f}%)")
-                st.metric("Paris Perdus", stats['lost_bets'])
-            
-            with col2:
-                st.markdown("### 💰 Rentabilité")
-                st.metric("ROI", f"{stats['roi']:.1f}%")
-                st.metric("Profit Factor", stats['profit_factor'])
-                st.metric("Sharpe Ratio", stats['sharpe_ratio'])
-            
-            with col3:
-                st.markdown("### 🎯 Performance")
-                st.metric("EV Moyen", f"{stats['avg_ev']:.1f}%")
-                st.metric("Max Drawdown", f"{stats['max_drawdown']:.1f}%")
-                st.metric("Plus Longue Série", f"✅ {stats['longest_win_streak']}")
+        # Sur un cache froid : barre de progression et graphique partiel bloc par bloc
+        progress = ProgressDisplay(params['bankroll'], params['bankroll'] * target_multiplier,
+                                   chart_options)
+        outputs = compute_page(params, progress)
+        progress.clear()
+        
+        results = outputs['backtest']
+        stats = outputs['stats']
+        comparison = outputs['comparison']
+        monte_carlo = outputs.get('monte_carlo')
+        
+        st.success('✅ Simulation terminée !')
+        
+        with st.sidebar:
+            if st.button("💾 Archiver ce backtest"):
+                path = save_backtest(
+                    os.path.join(ARCHIVE_DIR, datetime.now().strftime('backtest_%Y%m%d_%H%M%S')),
+                    results,
+                    stats,
+                    {**st.session_state['backtest_params'], 'benchmarks': params['benchmarks']},
+                    archive_format
+                )
+                st.success(f"Archive enregistrée : {path}")
+        
+        page = {
+            'params': params,
+            'results': results,
+            'stats': stats,
+            'comparison': comparison,
+            'monte_carlo': monte_carlo,
+            'roi_annual': outputs['projection']['roi_annual'],
+            'projection': outputs['projection'],
+            'chart_options': chart_options
+        }
+        render_result_tabs(page)
+        
+        if PROFILE:
+            render_performance_panel(st.session_state['stage_timer'])
+
 
 if __name__ == "__main__":
     main()
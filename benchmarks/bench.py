@@ -0,0 +1,268 @@
+"""
+bench.py - Benchmarks des chemins chauds du moteur et des graphiques
+
+Chaque cas est exécuté avec une graine fixe : deux exécutions sur la même
+machine mesurent exactement le même travail.
+    
+    python benchmarks/bench.py run -o benchmarks/baseline.json
+    python benchmarks/bench.py run --quick --filter run_backtest
+    python benchmarks/bench.py compare benchmarks/baseline.json            # relance et compare
+    python benchmarks/bench.py compare old.json new.json --threshold 0.1
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+
+SEED = 0
+
+# Grilles balayées (--quick : premières valeurs seulement)
+HORIZONS = [30, 90, 365, 730, 1825, 3650]
+VOLUMES = [3, 30, 300]
+MONTE_CARLO_PATHS = [1000, 5000, 10000]
+QUICK = {'horizons': 3, 'volumes': 2, 'paths': 1}
+
+# En dessous de ces seuils, les écarts relèvent du bruit de mesure
+MIN_TIME_S = 0.001
+MIN_PEAK_MB = 1.0
+
+def _app():
+    """Module de l'interface (graphiques Plotly), importé seulement pour les cas de figures"""
+    import app
+    return app
+
+def _backtest(days, volume):
+    bt = engine.BacktestEngine(days=days, avg_bets_per_day=volume, seed=SEED)
+    bt.run_backtest()
+    return bt
+
+# ==================== CAS ====================
+# Chaque cas : (nom, paramètres, préparation) ; la préparation (non mesurée)
+# retourne la fonction mesurée
+
+def case_generate_realistic_bets(volume):
+    bt = engine.BacktestEngine(avg_bets_per_day=volume, seed=SEED)
+    return lambda: bt.generate_realistic_bets(datetime(2024, 1, 1))
+
+def case_run_backtest(days, volume):
+    return lambda: engine.BacktestEngine(days=days, avg_bets_per_day=volume, seed=SEED).run_backtest()
+
+def case_get_statistics(days, volume):
+    return _backtest(days, volume).get_statistics
+
+def case_bootstrap_statistics(days, n_resamples):
+    bt = _backtest(days, 3)
+    return lambda: bt.bootstrap_statistics(n_resamples, rng=SEED)
+
+def case_staking_policies(days, volume):
+    bt = _backtest(days, volume)
+    return bt.evaluate_staking
+
+def case_optimize_strategy(days, prune):
+    candidates = engine.BacktestEngine(days=days, seed=SEED).draw_candidates()
+    
+    # Grille 50 × 50 (seuil d'EV × multiplicateur de Kelly)
+    return lambda: engine.optimize_strategy(
+        candidates,
+        ev_thresholds=np.linspace(0, 20, 50),
+        kelly_multipliers=np.linspace(0.02, 1, 50),
+        prune=prune
+    )
+
+def case_walk_forward(days, volume):
+    candidates = engine.BacktestEngine(days=days, avg_bets_per_day=volume, seed=SEED).draw_candidates()
+    return lambda: engine.walk_forward(candidates)
+
+def case_run_monte_carlo(days, n_paths):
+    return lambda: engine.BacktestEngine(days=days, seed=SEED).run_monte_carlo(n_paths=n_paths)
+
+def case_investment_comparison(days, n_paths):
+    assets = tuple(engine.BENCHMARK_ASSETS)
+    return lambda: engine.calculate_investment_comparison(
+        1000, days, assets=assets, rng=np.random.default_rng(SEED), n_paths=n_paths
+    )
+
+def case_growth_projection(roi_annual):
+    return lambda: engine.calculate_growth_projection(1000, roi_annual, target_multiplier=10)
+
+def case_bankroll_chart(days, high_volume):
+    app = _app()
+    results = _backtest(days, 3).results
+    chart_options = {'high_volume': high_volume}
+    
+    # Construction et sérialisation JSON (ce que Streamlit envoie au navigateur)
+    return lambda: app.pio.to_json(app.create_bankroll_chart(
+        results['dates'], results['daily_bankroll'], 1000, chart_options
+    ))
+
+def case_fan_chart(days, n_paths):
+    app = _app()
+    monte_carlo = engine.BacktestEngine(days=days, seed=SEED).run_monte_carlo(n_paths=n_paths)
+    return lambda: app.pio.to_json(app.create_fan_chart(
+        monte_carlo['dates'], monte_carlo['bands'], 1000, 2000
+    ))
+
+def build_cases(quick=False):
+    """Liste des cas (identifiant, préparation)"""
+    horizons, volumes, paths = HORIZONS, VOLUMES, MONTE_CARLO_PATHS
+    if quick:
+        horizons = horizons[:QUICK['horizons']]
+        volumes = volumes[:QUICK['volumes']]
+        paths = paths[:QUICK['paths']]
+    
+    grids = [
+        (case_generate_realistic_bets, {'volume': volumes}),
+        (case_run_backtest, {'days': horizons, 'volume': volumes}),
+        (case_get_statistics, {'days': horizons, 'volume': volumes[:1]}),
+        (case_bootstrap_statistics, {'days': [365, 730], 'n_resamples': [1000, 10_000]}),
+        (case_staking_policies, {'days': horizons, 'volume': volumes}),
+        (case_optimize_strategy, {'days': horizons, 'prune': [False, True]}),
+        (case_walk_forward, {'days': horizons[2:], 'volume': volumes}),
+        (case_run_monte_carlo, {'days': [365, 730], 'n_paths': paths}),
+        (case_investment_comparison, {'days': horizons, 'n_paths': [1, *paths]}),
+        (case_growth_projection, {'roi_annual': [5, 50, 500]}),
+        (case_bankroll_chart, {'days': horizons, 'high_volume': [False, True]}),
+        (case_fan_chart, {'days': [365, 730], 'n_paths': paths})
+    ]
+    
+    cases = []
+    for case, grid in grids:
+        name = case.__name__[len('case_'):]
+        for combo in itertools.product(*grid.values()):
+            values = dict(zip(grid, combo))
+            label = ','.join(f'{key}={value}' for key, value in values.items())
+            cases.append((f'{name}[{label}]', lambda case=case, values=values: case(**values)))
+    return cases
+
+# ==================== MESURES ====================
+
+def measure(setup, repeat):
+    """Temps (médiane et minimum sur repeat exécutions) et pic mémoire d'un cas"""
+    func = setup()
+    func()  # échauffement (imports différés, caches)
+    
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    
+    # Pic mémoire mesuré à part : tracemalloc ralentit l'exécution
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'time_s': statistics.median(times),
+        'time_min_s': min(times),
+        'peak_mb': peak / 1e6,
+        'repeat': repeat
+    }
+
+def run_suite(quick=False, pattern=None, repeat=5):
+    results = {}
+    for case_id, setup in build_cases(quick):
+        if pattern and pattern not in case_id:
+            continue
+        results[case_id] = measure(setup, repeat)
+        result = results[case_id]
+        print(f"{case_id:<60} {result['time_s'] * 1000:>10.2f} ms {result['peak_mb']:>9.1f} Mo",
+              flush=True)
+    
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'seed': SEED,
+            'quick': quick
+        },
+        'results': results
+    }
+
+def compare(baseline, current, threshold):
+    """
+    Compare deux exécutions cas par cas (temps médian et pic mémoire)
+    Retourne la liste des régressions (ratio > 1 + threshold, au-dessus du bruit)
+    """
+    regressions = []
+    print(f"{'cas':<60} {'temps':>8} {'mémoire':>8}")
+    
+    for case_id, now in current['results'].items():
+        before = baseline['results'].get(case_id)
+        if before is None:
+            continue
+        
+        time_ratio = now['time_s'] / before['time_s'] if before['time_s'] else 1
+        memory_ratio = now['peak_mb'] / before['peak_mb'] if before['peak_mb'] else 1
+        flags = [
+            metric for metric, ratio, significant in (
+                ('temps', time_ratio, now['time_s'] >= MIN_TIME_S),
+                ('mémoire', memory_ratio, now['peak_mb'] >= MIN_PEAK_MB)
+            )
+            if significant and ratio > 1 + threshold
+        ]
+        if flags:
+            regressions.append((case_id, flags))
+        
+        marker = '  <- RÉGRESSION (' + ', '.join(flags) + ')' if flags else ''
+        print(f"{case_id:<60} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x{marker}")
+    
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur de backtesting")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run = commands.add_parser('run', help="Exécute la suite")
+    run.add_argument('-o', '--output', help="Fichier JSON de résultats (baseline)")
+    
+    comparison = commands.add_parser('compare', help="Compare à une baseline")
+    comparison.add_argument('baseline', help="Baseline JSON")
+    comparison.add_argument('current', nargs='?', help="Résultats JSON (sinon la suite est relancée)")
+    comparison.add_argument('--threshold', type=float, default=0.2,
+                            help="Hausse relative tolérée (0.2 = +20%%)")
+    
+    for command in (run, comparison):
+        command.add_argument('--quick', action='store_true', help="Grilles réduites")
+        command.add_argument('--filter', help="Ne garde que les cas contenant ce texte")
+        command.add_argument('--repeat', type=int, default=5, help="Exécutions mesurées par cas")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'run':
+        current = run_suite(args.quick, args.filter, args.repeat)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(current, file, indent=2)
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    if args.current:
+        with open(args.current, encoding='utf-8') as file:
+            current = json.load(file)
+    else:
+        current = run_suite(args.quick, args.filter, args.repeat)
+    
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{len(regressions)} régression(s) au-delà de +{args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+cli.py - Backtests et balayages PronoSmart en ligne de commande
+Sans Streamlit ni Plotly : utilisable depuis cron ou un worker
+
+Exemples :
+    python cli.py backtest --days 730 --seed 42 -o backtest.json
+    python cli.py backtest --history-dir history --leagues "Ligue 1" --teams PSG -o archives/psg
+    python cli.py sweep --grid ev_threshold=3,5,8 --grid kelly_multiplier=0.25,0.5 -o sweep.parquet
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from engine import (
+    ARCHIVE_FORMATS, SWEEP_DEFAULTS, BacktestEngine, MatchStore, load_historical_odds,
+    run_parameter_sweep, run_params, run_seeds, run_strategy, save_backtest
+)
+
+def _number(text):
+    """Entier si possible, sinon flottant"""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+def grid_axis(spec):
+    """'ev_threshold=3,5,8' -> ('ev_threshold', [3, 5, 8])"""
+    name, _, values = spec.partition('=')
+    if name not in SWEEP_DEFAULTS or not values:
+        raise argparse.ArgumentTypeError(
+            f"axe invalide : {spec} (paramètres : {', '.join(SWEEP_DEFAULTS)})"
+        )
+    return name, [_number(value) for value in values.split(',')]
+
+def write_json(path, payload):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(payload, file, indent=2, ensure_ascii=False, default=lambda value: value.item())
+
+def run_backtest_command(args):
+    """
+    Backtest unique -> résumé JSON, ou archive Arrow/Parquet (dossier)
+    Graine et paramètres suivent les conventions de l'application (run_seeds, run_params) :
+    une archive s'y recharge et la même graine y donne le même backtest
+    """
+    strategy = run_strategy(vars(args))
+    
+    matches, match_filters = None, None
+    if args.history_dir:
+        matches = MatchStore(load_historical_odds(args.history_dir, args.leagues, args.seasons))
+        match_filters = {'teams': args.teams, 'start': args.start, 'end': args.end}
+    
+    engine = BacktestEngine(
+        args.bankroll, args.days, seed=run_seeds(args.seed)['backtest'],
+        matches=matches, match_filters=match_filters, **strategy
+    )
+    
+    # Un résumé JSON n'a pas besoin du DataFrame des paris
+    to_json = args.output.endswith('.json')
+    results = engine.run_backtest(frame=not to_json)
+    stats = engine.get_statistics()
+    
+    params = run_params({
+        'bankroll': args.bankroll,
+        'days': engine.days,
+        'seed': args.seed,
+        **strategy,
+        'history': (args.leagues, args.seasons, args.teams) if args.history_dir else None
+    })
+    if to_json:
+        write_json(args.output, {
+            'params': params,
+            'final_bankroll': results['final_bankroll'],
+            'total_profit': results['total_profit'],
+            'roi': results['roi'],
+            'stats': stats
+        })
+    else:
+        save_backtest(args.output, results, stats, params, fmt=args.format)
+    
+    print(f"{stats['total_bets']} paris, ROI {stats['roi']:+.1f}% -> {args.output}")
+
+def run_sweep_command(args):
+    """Balayage de la grille -> une ligne par backtest, en JSON ou Parquet"""
+    rows = run_parameter_sweep(
+        dict(args.grid),
+        initial_bankroll=args.bankroll,
+        days=args.days,
+        seed=args.seed,
+        repeats=args.repeats,
+        max_workers=args.workers
+    )
+    
+    if args.output.endswith('.json'):
+        write_json(args.output, rows.to_dict('records'))
+    else:
+        rows.to_parquet(args.output, index=False)
+    
+    print(f"{len(rows)} backtests -> {args.output}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Backtests PronoSmart sans interface")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    backtest = commands.add_parser('backtest', help="Exécute un backtest")
+    sweep = commands.add_parser('sweep', help="Balaye une grille de paramètres")
+    
+    for command in (backtest, sweep):
+        command.add_argument('--bankroll', type=float, default=1000, help="Bankroll initiale (€)")
+        command.add_argument('--days', type=int, default=365, help="Période simulée (jours)")
+        command.add_argument('--seed', type=int, default=None,
+                             help="Graine (tirée au hasard et enregistrée si absente)")
+        command.add_argument('-o', '--output', required=True,
+                             help="Fichier .json, sinon archive (backtest) ou .parquet (balayage)")
+    
+    for name, default in SWEEP_DEFAULTS.items():
+        backtest.add_argument('--' + name.replace('_', '-'), type=_number, default=default)
+    backtest.add_argument('--format', choices=list(ARCHIVE_FORMATS), default='parquet',
+                          help="Format de l'archive quand la sortie n'est pas .json")
+    backtest.add_argument('--history-dir', help="Cache Parquet des matchs historiques")
+    backtest.add_argument('--leagues', nargs='*', help="Ligues (historique)")
+    backtest.add_argument('--seasons', nargs='*', type=int, help="Saisons, année de début (historique)")
+    backtest.add_argument('--teams', nargs='*', help="Équipes (historique)")
+    backtest.add_argument('--start', help="Date de début (historique)")
+    backtest.add_argument('--end', help="Date de fin incluse (historique)")
+    
+    sweep.add_argument('--grid', action='append', required=True, type=grid_axis,
+                       help="param=v1,v2,... (répétable)")
+    sweep.add_argument('--repeats', type=int, default=1, help="Backtests par combinaison")
+    sweep.add_argument('--workers', type=int, default=None, help="Processus (tous les cœurs par défaut)")
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.seed is None:
+        args.seed = np.random.SeedSequence().entropy
+    
+    if args.command == 'backtest':
+        run_backtest_command(args)
+    else:
+        run_sweep_command(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1980 @@
+"""
+engine.py - Moteur de backtesting PronoSmart, sans interface
+Backtest, statistiques, balayages, archives, historique des cotes,
+comparaisons, projections et graphe de calcul ; importable depuis un script, un notebook ou un worker
+pandas et pyarrow ne sont importés qu'à leur première utilisation
+"""
+
+import importlib
+import itertools
+import json
+import os
+import re
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import numpy as np
+
+class _LazyModule:
+    """Module importé au premier accès à l'un de ses attributs"""
+    
+    def __init__(self, name):
+        self._name = name
+    
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+# Imports coûteux différés : un backtest sans DataFrame n'a besoin que de NumPy
+pd = _LazyModule('pandas')
+pa = _LazyModule('pyarrow')
+pq = _LazyModule('pyarrow.parquet')
+
+# ==================== MOTEUR DE BACKTESTING ====================
+
+LEAGUES = ["Ligue 1", "Premier League", "La Liga", "Bundesliga", "Serie A", "Ligue 2"]
+TEAMS_POOL = [
+    ("PSG", "Marseille"), ("Lyon", "Monaco"), ("Lille", "Lens"),
+    ("Man City", "Liverpool"), ("Arsenal", "Chelsea"), ("Man United", "Tottenham"),
+    ("Real Madrid", "Barcelona"), ("Atlético", "Séville"),
+    ("Bayern", "Dortmund"), ("Leipzig", "Leverkusen"),
+    ("Inter", "Juventus"), ("Milan", "Napoli")
+]
+
+TEAMS = [team for pair in TEAMS_POOL for team in pair]
+
+# Décimales des colonnes de paris (arrondi du tirage, valeurs rendues aux appelants)
+BET_DECIMALS = {'odds': 2, 'predicted_prob': 1, 'true_prob': 1, 'ev': 1, 'stake_pct': 2}
+
+# Codes de division football-data.co.uk -> ligue
+DIVISIONS = {
+    'F1': "Ligue 1", 'F2': "Ligue 2", 'E0': "Premier League",
+    'SP1': "La Liga", 'D1': "Bundesliga", 'I1': "Serie A"
+}
+# Issues d'un match : victoire domicile, nul, victoire extérieur
+OUTCOMES = ('H', 'D', 'A')
+
+def _code_dtype(n_categories):
+    """Plus petit type entier que pandas garde tel quel comme codes de catégories"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+class BetStore:
+    """
+    Stockage colonnaire compact des paris
+    Tableaux typés préalloués, codes entiers pour date/ligue/équipes
+    """
+    
+    # Colonne de codes -> (colonne exposée, nom de l'attribut des catégories)
+    CATEGORICAL = {
+        'day': ('date', 'dates'),
+        'league': ('league', 'leagues'),
+        'home': ('home', 'teams'),
+        'away': ('away', 'teams')
+    }
+    FLOAT32 = ('odds', 'predicted_prob', 'true_prob', 'ev', 'stake_pct')
+    FLOAT64 = ('profit', 'bankroll_before')
+    
+    def __init__(self, capacity, dates, leagues=LEAGUES, teams=TEAMS):
+        # Journées de la période (datetime64) : pandas n'est requis que par to_frame
+        self.dates = np.asarray(dates, dtype='datetime64[us]')
+        self.leagues = list(leagues)
+        self.teams = list(teams)
+        self.size = 0
+        
+        self.columns = {
+            code: np.zeros(capacity, dtype=_code_dtype(len(getattr(self, attr))))
+            for code, (_, attr) in self.CATEGORICAL.items()
+        }
+        self.columns.update({name: np.zeros(capacity, dtype=np.float32) for name in self.FLOAT32})
+        self.columns['won'] = np.zeros(capacity, dtype=bool)
+        self.columns.update({name: np.zeros(capacity, dtype=np.float64) for name in self.FLOAT64})
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, name):
+        """Vue (sans copie) sur la partie remplie d'une colonne"""
+        return self.columns[name][:self.size]
+    
+    def __setitem__(self, name, values):
+        self.columns[name][:self.size] = values
+    
+    @property
+    def capacity(self):
+        return len(self.columns['day'])
+    
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+    
+    def append(self, **values):
+        """Ajoute un bloc de paris (une valeur par colonne, sous forme de tableaux)"""
+        n = len(values['day'])
+        if self.size + n > self.capacity:
+            self._grow(max(self.size + n, 2 * self.capacity))
+        
+        for name, value in values.items():
+            self.columns[name][self.size:self.size + n] = value
+        self.size += n
+    
+    def _grow(self, capacity):
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+    
+    def to_frame(self):
+        """DataFrame construit directement sur les tableaux du store, sans copie ligne à ligne"""
+        data = {}
+        for code, (name, attr) in self.CATEGORICAL.items():
+            dtype = pd.CategoricalDtype(getattr(self, attr))
+            data[name] = pd.Categorical.from_codes(self[code], dtype=dtype, validate=False)
+        for name in self.FLOAT32 + ('won',) + self.FLOAT64:
+            data[name] = self[name]
+        
+        return pd.DataFrame(data, copy=False)
+
+def compound_bankroll(initial_bankroll, day, bet_return, days):
+    """
+    Trajectoire de bankroll en forme fermée
+    Les mises sont une fraction de la bankroll du début de journée : la courbe
+    est le produit cumulé des facteurs de croissance journaliers
+    Retourne (daily_bankroll sur days + 1 points, bankroll_before de chaque pari)
+    """
+    # Scatter : somme des rendements de chaque journée
+    growth = 1 + np.bincount(day, weights=bet_return, minlength=days)
+    daily_bankroll = initial_bankroll * np.concatenate(([1.0], np.cumprod(growth)))
+    
+    # Gather : bankroll au début du jour de chaque pari
+    return daily_bankroll, daily_bankroll[day]
+
+class StatsAccumulator:
+    """
+    Statistiques de performance calculées en ligne, au fil des paris réglés
+    Chaque mise à jour intègre un bloc de journées complètes, vectorisé dans le bloc
+    """
+    
+    def __init__(self, initial_bankroll):
+        self.initial_bankroll = initial_bankroll
+        
+        # Comptages et sommes
+        self.total_bets = 0
+        self.won_bets = 0
+        self.sum_odds_won = 0.0
+        self.sum_odds_lost = 0.0
+        self.total_staked = 0.0
+        self.sum_ev = 0.0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        
+        # Rendements journaliers (Welford : moyenne et somme des carrés des écarts)
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2_return = 0.0
+        
+        # Bankroll, sommet et drawdown courants
+        self.bankroll = initial_bankroll
+        self.peak = initial_bankroll
+        self.max_drawdown = 0.0
+        
+        # Séries de paris gagnés / perdus
+        self.streak = 0
+        self.streak_won = None
+        self.longest_win_streak = 0
+        self.longest_lose_streak = 0
+        
+        # Meilleure et pire journée (parmi les journées avec paris)
+        self.best_day = None
+        self.worst_day = None
+    
+    def update(self, day, won, odds, ev, stake_pct, profit, daily_bankroll):
+        """
+        Intègre un bloc de journées réglées
+        day : jour de chaque pari relatif au début du bloc, paris triés par jour
+        daily_bankroll : bankroll en fin de chaque journée du bloc
+        """
+        daily_bankroll = np.asarray(daily_bankroll, dtype=np.float64)
+        
+        self._update_bets(won, odds, ev, stake_pct, profit)
+        self._update_streaks(won)
+        
+        # Meilleure / pire journée
+        if len(day) > 0:
+            day_profit = np.bincount(day, weights=profit, minlength=len(daily_bankroll))
+            day_profit = day_profit[np.bincount(day, minlength=len(daily_bankroll)) > 0]
+            best, worst = day_profit.max(), day_profit.min()
+            self.best_day = best if self.best_day is None else max(self.best_day, best)
+            self.worst_day = worst if self.worst_day is None else min(self.worst_day, worst)
+        
+        self._update_returns(daily_bankroll)
+        self._update_drawdown(daily_bankroll)
+        if len(daily_bankroll) > 0:
+            self.bankroll = daily_bankroll[-1]
+    
+    def _update_bets(self, won, odds, ev, stake_pct, profit):
+        odds = odds.astype(np.float64)
+        
+        self.total_bets += len(won)
+        self.won_bets += int(won.sum())
+        self.sum_odds_won += odds[won].sum()
+        self.sum_odds_lost += odds[~won].sum()
+        self.total_staked += stake_pct.astype(np.float64).sum()
+        self.sum_ev += ev.astype(np.float64).sum()
+        self.gross_profit += profit[profit > 0].sum()
+        self.gross_loss -= profit[profit < 0].sum()
+    
+    def _update_streaks(self, won):
+        if len(won) == 0:
+            return
+        
+        # Découpage du bloc en séries consécutives
+        starts = np.concatenate(([0], np.flatnonzero(won[1:] != won[:-1]) + 1))
+        lengths = np.diff(np.append(starts, len(won)))
+        values = won[starts]
+        
+        # La première série prolonge la série en cours du bloc précédent
+        if values[0] == self.streak_won:
+            lengths[0] += self.streak
+        
+        if values.any():
+            self.longest_win_streak = max(self.longest_win_streak, int(lengths[values].max()))
+        if not values.all():
+            self.longest_lose_streak = max(self.longest_lose_streak, int(lengths[~values].max()))
+        
+        self.streak = int(lengths[-1])
+        self.streak_won = bool(values[-1])
+    
+    def _update_returns(self, daily_bankroll):
+        if len(daily_bankroll) == 0:
+            return
+        
+        previous = np.concatenate(([self.bankroll], daily_bankroll[:-1]))
+        returns = daily_bankroll / previous - 1
+        
+        # Fusion de Welford par blocs (Chan et al.)
+        n_block = len(returns)
+        mean_block = returns.mean()
+        m2_block = ((returns - mean_block) ** 2).sum()
+        
+        n = self.n_returns + n_block
+        delta = mean_block - self.mean_return
+        self.mean_return += delta * n_block / n
+        self.m2_return += m2_block + delta ** 2 * self.n_returns * n_block / n
+        self.n_returns = n
+    
+    def _update_drawdown(self, daily_bankroll):
+        if len(daily_bankroll) == 0:
+            return
+        
+        peaks = np.maximum.accumulate(np.concatenate(([self.peak], daily_bankroll)))[1:]
+        drawdown = (daily_bankroll - peaks) / peaks * 100
+        
+        self.peak = peaks[-1]
+        self.max_drawdown = min(self.max_drawdown, drawdown.min())
+    
+    def result(self):
+        """Dictionnaire des statistiques (mêmes clés que get_statistics)"""
+        total_bets = self.total_bets
+        won_bets = self.won_bets
+        lost_bets = total_bets - won_bets
+        win_rate = (won_bets / total_bets * 100) if total_bets > 0 else 0
+        
+        total_profit = self.bankroll - self.initial_bankroll
+        roi = (total_profit / self.initial_bankroll) * 100
+        
+        profit_factor = self.gross_profit / self.gross_loss if self.gross_loss > 0 else 0
+        
+        std_return = np.sqrt(self.m2_return / (self.n_returns - 1)) if self.n_returns > 1 else 0
+        sharpe = (self.mean_return / std_return) * np.sqrt(365) if std_return > 0 else 0
+        
+        return {
+            'total_bets': total_bets,
+            'won_bets': won_bets,
+            'lost_bets': lost_bets,
+            'win_rate': round(win_rate, 1),
+            'avg_odds_won': round(self.sum_odds_won / won_bets, 2) if won_bets > 0 else 0,
+            'avg_odds_lost': round(self.sum_odds_lost / lost_bets, 2) if lost_bets > 0 else 0,
+            'total_staked': round(self.total_staked, 1),
+            'total_profit': round(total_profit, 2),
+            'roi': round(roi, 1),
+            'max_drawdown': round(self.max_drawdown, 1),
+            'profit_factor': round(profit_factor, 2),
+            'sharpe_ratio': round(sharpe, 2),
+            'longest_win_streak': self.longest_win_streak,
+            'longest_lose_streak': self.longest_lose_streak,
+            'avg_ev': round(self.sum_ev / total_bets, 1) if total_bets > 0 else 0,
+            'best_day': round(self.best_day, 2) if self.best_day is not None else 0,
+            'worst_day': round(self.worst_day, 2) if self.worst_day is not None else 0
+        }
+
+class BacktestEngine:
+    """Moteur de simulation de performances historiques"""
+    
+    def __init__(self, initial_bankroll=1000, days=365, avg_bets_per_day=3, ev_threshold=5,
+                 kelly_multiplier=0.5, min_stake_pct=0.5, max_stake_pct=5, seed=None,
+                 matches=None, match_filters=None):
+        self.initial_bankroll = initial_bankroll
+        self.days = days
+        
+        # Matchs historiques à la place des matchs simulés : DataFrame de
+        # load_historical_odds, ou MatchStore filtré par match_filters (cf. MatchStore.select)
+        self.matches = matches
+        self.match_filters = match_filters or {}
+        
+        # Paramètres de la stratégie
+        self.avg_bets_per_day = avg_bets_per_day
+        self.ev_threshold = ev_threshold
+        self.kelly_multiplier = kelly_multiplier
+        self.min_stake_pct = min_stake_pct
+        self.max_stake_pct = max_stake_pct
+        
+        # Générateur propre au moteur (seed : entier ou SeedSequence)
+        self.rng = np.random.default_rng(seed)
+        
+        self.results = None
+        self.stats = None
+        self.monte_carlo = None
+    
+    def generate_realistic_bets(self, date, avg_bets_per_day=None):
+        """Génère des paris réalistes pour une date donnée"""
+        bets = self.generate_period_bets(date, 1, avg_bets_per_day)
+        
+        # Colonnes float32 repassées en float64 et arrondies : 3.51 et non 3.509999990463257
+        columns = {
+            'league': [bets.leagues[code] for code in bets['league']],
+            'home': [bets.teams[code] for code in bets['home']],
+            'away': [bets.teams[code] for code in bets['away']],
+            **{
+                name: np.round(bets[name].astype(np.float64), decimals).tolist()
+                for name, decimals in BET_DECIMALS.items()
+            },
+            'won': bets['won'].tolist()
+        }
+        
+        return [{'date': date, **dict(zip(columns, values))} for values in zip(*columns.values())]
+    
+    def _draw_value_bets(self, cell):
+        """
+        Tire un match candidat par entrée de cell (jour, ou chemin × jour aplati)
+        et ne garde que les value bets (EV > ev_threshold), sous forme de tableaux
+        """
+        n = len(cell)
+        
+        odds = self.rng.uniform(1.5, 4.5, n)
+        true_prob = np.clip(1 / odds + self.rng.normal(0, 0.05, n), 0.1, 0.9)
+        
+        model_accuracy = self.rng.uniform(0.6, 0.85, n)
+        predicted_prob = true_prob * model_accuracy + (1 - true_prob) * (1 - model_accuracy)
+        
+        ev = (predicted_prob * odds - 1) * 100
+        
+        # Seuls les value bets sont joués
+        value = ev > self.ev_threshold
+        cell, odds, true_prob, predicted_prob, ev = (
+            cell[value], odds[value], true_prob[value], predicted_prob[value], ev[value]
+        )
+        
+        stake_pct = self._stake_pct(odds, predicted_prob)
+        won = self.rng.random(len(cell)) < true_prob
+        
+        return {
+            'cell': cell,
+            'odds': odds,
+            'true_prob': true_prob,
+            'predicted_prob': predicted_prob,
+            'ev': ev,
+            'stake_pct': stake_pct,
+            'won': won
+        }
+    
+    def _stake_pct(self, odds, predicted_prob):
+        """Mise en % de la bankroll : fraction de Kelly bornée"""
+        kelly = (predicted_prob * odds - 1) / (odds - 1)
+        return np.clip(kelly * 100 * self.kelly_multiplier, self.min_stake_pct, self.max_stake_pct)
+    
+    def generate_period_bets(self, start_date, days, avg_bets_per_day=None):
+        """
+        Génère en un seul tirage vectorisé les paris de toute la période
+        Retourne un BetStore trié par jour
+        """
+        if avg_bets_per_day is None:
+            avg_bets_per_day = self.avg_bets_per_day
+        
+        # Nombre de matchs analysés chaque jour, puis jour de chaque match
+        counts = self.rng.poisson(avg_bets_per_day, size=days)
+        bets = self._draw_value_bets(np.repeat(np.arange(days), counts))
+        n = len(bets['cell'])
+        
+        pair = self.rng.integers(len(TEAMS_POOL), size=n)
+        
+        store = BetStore(n, np.datetime64(start_date, 'us') + np.arange(days) * np.timedelta64(1, 'D'))
+        store.append(
+            day=bets['cell'],
+            league=self.rng.integers(len(LEAGUES), size=n),
+            home=2 * pair,
+            away=2 * pair + 1,
+            odds=np.round(bets['odds'], BET_DECIMALS['odds']),
+            predicted_prob=np.round(bets['predicted_prob'] * 100, BET_DECIMALS['predicted_prob']),
+            true_prob=np.round(bets['true_prob'] * 100, BET_DECIMALS['true_prob']),
+            ev=np.round(bets['ev'], BET_DECIMALS['ev']),
+            stake_pct=np.round(bets['stake_pct'], BET_DECIMALS['stake_pct']),
+            won=bets['won']
+        )
+        
+        return store
+    
+    def generate_historical_bets(self, matches, bookmaker='B365', reference='PS', model_noise=0.1):
+        """
+        Paris joués sur des matchs réels (DataFrame de load_historical_odds)
+        Cotes du bookmaker, probabilités réelles = cotes de référence sans marge,
+        résultat réel du match ; le modèle estime chaque probabilité réelle à un
+        bruit relatif près (model_noise) et ne joue que la meilleure issue par match
+        Retourne un BetStore trié par jour, sur la période couverte par les matchs
+        """
+        matches = matches.sort_values('date', kind='stable')
+        match_dates = matches['date'].dt.normalize()
+        dates = pd.date_range(match_dates.iloc[0], match_dates.iloc[-1], freq='D')
+        day = ((match_dates - dates[0]) // pd.Timedelta(days=1)).to_numpy()
+        
+        # Matrices matchs × issues (domicile, nul, extérieur)
+        odds = matches[[bookmaker + outcome for outcome in OUTCOMES]].to_numpy(np.float64)
+        ref_odds = matches[[reference + outcome for outcome in OUTCOMES]].to_numpy(np.float64)
+        ref_odds = np.where(np.isnan(ref_odds).any(axis=1, keepdims=True), odds, ref_odds)
+        implied = 1 / ref_odds
+        true_prob = implied / implied.sum(axis=1, keepdims=True)
+        
+        predicted_prob = np.clip(true_prob * self.rng.lognormal(0, model_noise, true_prob.shape), 0.01, 0.99)
+        ev = np.nan_to_num((predicted_prob * odds - 1) * 100, nan=-np.inf)
+        
+        # Meilleure issue de chaque match, jouée si c'est un value bet
+        best = ev.argmax(axis=1)
+        rows = np.arange(len(best))
+        value = ev[rows, best] > self.ev_threshold
+        rows, best = rows[value], best[value]
+        
+        odds, true_prob, predicted_prob, ev = (
+            odds[rows, best], true_prob[rows, best], predicted_prob[rows, best], ev[rows, best]
+        )
+        won = matches['result'].to_numpy()[rows] == np.asarray(OUTCOMES)[best]
+        
+        leagues = pd.Categorical(matches['league'])
+        teams = pd.Index(pd.concat([matches['home'], matches['away']]).unique()).sort_values()
+        
+        store = BetStore(len(rows), dates, leagues=leagues.categories, teams=teams)
+        store.append(
+            day=day[rows],
+            league=leagues.codes[rows],
+            home=teams.get_indexer(matches['home'].to_numpy()[rows]),
+            away=teams.get_indexer(matches['away'].to_numpy()[rows]),
+            odds=np.round(odds, 2),
+            predicted_prob=np.round(predicted_prob * 100, 1),
+            true_prob=np.round(true_prob * 100, 1),
+            ev=np.round(ev, 1),
+            stake_pct=np.round(self._stake_pct(odds, predicted_prob), 2),
+            won=won
+        )
+        
+        return store
+    
+    def run_backtest(self, frame=True):
+        """
+        Exécute le backtest complet
+        frame=False : paris laissés en BetStore et dates en datetime64, sans pandas
+        (balayages, workers)
+        """
+        for _ in self.iter_backtest(chunk_days=None, frame=frame):
+            pass
+        
+        return self.results
+    
+    def _draw_backtest_bets(self):
+        """Paris du backtest : matchs simulés sur la période, ou matchs historiques filtrés"""
+        if self.matches is None:
+            start_date = datetime.now() - timedelta(days=self.days)
+            return self.generate_period_bets(start_date, self.days)
+        
+        matches = self.matches
+        if not isinstance(matches, pd.DataFrame):
+            # MatchStore (test de type sur DataFrame : la classe est redéfinie à chaque rerun)
+            matches = matches.select(**self.match_filters)
+        bets = self.generate_historical_bets(matches)
+        self.days = len(bets.dates)
+        return bets
+    
+    def draw_candidates(self):
+        """
+        Univers des paris candidats : tous les matchs analysés, sans seuil d'EV
+        (résultat tiré pour chacun), à réutiliser pour évaluer plusieurs stratégies
+        """
+        ev_threshold, self.ev_threshold = self.ev_threshold, -np.inf
+        try:
+            return self._draw_backtest_bets()
+        finally:
+            self.ev_threshold = ev_threshold
+    
+    def iter_backtest(self, chunk_days=30, frame=True):
+        """
+        Backtest progressif : les paris sont tirés d'un coup (mêmes paris que
+        run_backtest), puis réglés par blocs de chunk_days journées (None : un seul bloc)
+        Génère après chaque bloc l'état partiel : journées réglées, bankroll jusqu'au
+        dernier jour réglé et statistiques à jour ; self.results est rempli à la fin
+        """
+        bets = self._draw_backtest_bets()
+        days = self.days
+        chunk_days = chunk_days or days
+        
+        # Calculs monétaires en float64 (le store garde cotes et mises en float32)
+        odds = bets['odds'].astype(np.float64)
+        stake_pct = bets['stake_pct'].astype(np.float64)
+        won = bets['won']
+        day = bets['day']
+        
+        # Rendement de chaque pari en fraction de la bankroll du début de journée
+        bet_return = (stake_pct / 100) * np.where(won, odds - 1, -1)
+        
+        daily_bankroll = np.empty(days + 1)
+        daily_bankroll[0] = self.initial_bankroll
+        self.stats = StatsAccumulator(self.initial_bankroll)
+        
+        for start in range(0, days, chunk_days):
+            end = min(start + chunk_days, days)
+            
+            # Paris triés par jour : ceux du bloc forment une tranche contiguë
+            lo, hi = np.searchsorted(day, [start, end])
+            block_day = day[lo:hi] - start
+            
+            block_bankroll, bankroll_before = compound_bankroll(
+                daily_bankroll[start], block_day, bet_return[lo:hi], end - start
+            )
+            daily_bankroll[start + 1:end + 1] = block_bankroll[1:]
+            
+            bets['profit'][lo:hi] = np.round(bankroll_before * bet_return[lo:hi], 2)
+            bets['bankroll_before'][lo:hi] = np.round(bankroll_before, 2)
+            
+            # Statistiques mises à jour avec les paris réglés du bloc
+            self.stats.update(
+                block_day, won[lo:hi], bets['odds'][lo:hi], bets['ev'][lo:hi],
+                bets['stake_pct'][lo:hi], bets['profit'][lo:hi], daily_bankroll[start + 1:end + 1]
+            )
+            
+            yield {
+                'days_done': end,
+                'days': days,
+                'progress': end / days,
+                'dates': bets.dates[:end],
+                'daily_bankroll': daily_bankroll[:end + 1],
+                'stats': self.stats.result()
+            }
+        
+        current_bankroll = daily_bankroll[-1]
+        self.results = {
+            'bets': bets.to_frame() if frame else bets,
+            'daily_bankroll': daily_bankroll,
+            'dates': pd.DatetimeIndex(bets.dates) if frame else bets.dates,
+            'final_bankroll': current_bankroll,
+            'total_profit': current_bankroll - self.initial_bankroll,
+            'roi': ((current_bankroll - self.initial_bankroll) / self.initial_bankroll) * 100
+        }
+    
+    def run_monte_carlo(self, n_paths=1000, target_multiplier=2, avg_bets_per_day=None,
+                        ruin_level=0.5, max_chunk_bets=500_000):
+        """
+        Simule n_paths backtests indépendants en un calcul matriciel chemins × jours
+        Les chemins sont traités par blocs pour borner la mémoire des paris candidats
+        """
+        for _ in self.iter_monte_carlo(n_paths, target_multiplier, avg_bets_per_day,
+                                       ruin_level, max_chunk_bets):
+            pass
+        
+        return self.monte_carlo
+    
+    def iter_monte_carlo(self, n_paths=1000, target_multiplier=2, avg_bets_per_day=None,
+                         ruin_level=0.5, max_chunk_bets=500_000):
+        """
+        Monte Carlo progressif : génère après chaque bloc de chemins l'état partiel
+        (chemins terminés, vue sur leurs trajectoires) ; self.monte_carlo est rempli à la fin
+        """
+        if avg_bets_per_day is None:
+            avg_bets_per_day = self.avg_bets_per_day
+        
+        days = self.days
+        chunk = max(1, int(max_chunk_bets // max(1, days * avg_bets_per_day)))
+        
+        # Trajectoires conservées en float32 (≈ 29 Mo pour 10 000 chemins × 730 jours)
+        paths = np.empty((n_paths, days + 1), dtype=np.float32)
+        paths[:, 0] = self.initial_bankroll
+        
+        for start in range(0, n_paths, chunk):
+            size = min(chunk, n_paths - start)
+            
+            # Une cellule par couple (chemin, jour), aplatie
+            counts = self.rng.poisson(avg_bets_per_day, size=size * days)
+            bets = self._draw_value_bets(np.repeat(np.arange(size * days), counts))
+            
+            bet_return = (bets['stake_pct'] / 100) * np.where(bets['won'], bets['odds'] - 1, -1)
+            growth = 1 + np.bincount(bets['cell'], weights=bet_return, minlength=size * days)
+            
+            paths[start:start + size, 1:] = self.initial_bankroll * np.cumprod(
+                growth.reshape(size, days), axis=1
+            )
+            
+            yield {
+                'paths_done': start + size,
+                'n_paths': n_paths,
+                'progress': (start + size) / n_paths,
+                'paths': paths[:start + size]
+            }
+        
+        final = paths[:, -1].astype(np.float64)
+        band_levels = [5, 25, 50, 75, 95]
+        bands = np.percentile(paths, band_levels, axis=0)
+        
+        self.monte_carlo = {
+            'n_paths': n_paths,
+            'dates': pd.date_range(datetime.now() - timedelta(days=days), periods=days, freq='D'),
+            'bands': dict(zip(band_levels, bands)),
+            'final': final.astype(np.float32),
+            'final_percentiles': dict(zip(band_levels, np.percentile(final, band_levels))),
+            'mean_final': final.mean(),
+            'median_roi': (np.median(final) - self.initial_bankroll) / self.initial_bankroll * 100,
+            'prob_profit': (final > self.initial_bankroll).mean() * 100,
+            'prob_ruin': (paths.min(axis=1) <= self.initial_bankroll * ruin_level).mean() * 100,
+            'prob_target': (final >= self.initial_bankroll * target_multiplier).mean() * 100,
+            'ruin_level': ruin_level,
+            'target_multiplier': target_multiplier
+        }
+    
+    def get_statistics(self):
+        """Statistiques de performance, tenues à jour pendant le backtest (O(1))"""
+        if self.results is None:
+            return None
+        
+        return self.stats.result()
+    
+    def bootstrap_statistics(self, n_resamples=10_000, confidence=0.95, rng=None):
+        """Intervalles de confiance bootstrap des statistiques du dernier backtest"""
+        if self.results is None:
+            return None
+        
+        return bootstrap_statistics(self.results['bets'], n_resamples, confidence,
+                                    self.rng if rng is None else rng)
+    
+    def optimize(self, **grid):
+        """Optimisation de la stratégie sur un univers de candidats tiré une fois (cf. optimize_strategy)"""
+        return optimize_strategy(self.draw_candidates(), self.initial_bankroll, **grid)
+    
+    def walk_forward(self, **options):
+        """
+        Walk-forward sur un univers de candidats tiré une fois (cf. walk_forward),
+        comparé à la stratégie du moteur jouée telle quelle
+        """
+        options = {
+            'stake_bounds': (self.min_stake_pct, self.max_stake_pct),
+            'baseline': (self.ev_threshold, self.kelly_multiplier),
+            **options
+        }
+        return walk_forward(self.draw_candidates(), self.initial_bankroll, **options)
+    
+    def evaluate_staking(self, policies=None):
+        """Politiques de mise comparées sur les paris du dernier backtest"""
+        if self.results is None:
+            return None
+        
+        return evaluate_staking_policies(self.results['bets'], self.initial_bankroll, policies)
+
+# ==================== POLITIQUES DE MISE ====================
+
+# Politiques comparées : mise de chaque pari en % de la bankroll du début de journée
+# (% du capital initial pour 'flat'), bornée par min_pct / max_pct, puis réduite
+# proportionnellement les jours où la somme des mises dépasse max_day_pct
+#   recorded : mises du backtest    flat / fraction : pct fixe
+#   kelly : fraction de Kelly       ev : pct_per_ev × EV (en points)
+STAKING_POLICIES = {
+    'current': {'label': "Actuelle (demi-Kelly 0,5-5 %)", 'kind': 'recorded'},
+    'flat': {'label': "Mise fixe (2 % du capital initial)", 'kind': 'flat', 'pct': 2},
+    'fixed_fraction': {'label': "Fraction fixe (2 %)", 'kind': 'fraction', 'pct': 2},
+    'full_kelly': {'label': "Kelly complet", 'kind': 'kelly', 'multiplier': 1},
+    'half_kelly': {'label': "Demi-Kelly", 'kind': 'kelly', 'multiplier': 0.5},
+    'quarter_kelly': {'label': "Quart de Kelly", 'kind': 'kelly', 'multiplier': 0.25},
+    'proportional_ev': {'label': "Proportionnelle à l'EV (0,2 %/pt, ≤ 5 %)", 'kind': 'ev',
+                        'pct_per_ev': 0.2, 'max_pct': 5},
+    'capped_exposure': {'label': "Demi-Kelly, exposition ≤ 10 %/jour", 'kind': 'kelly',
+                        'multiplier': 0.5, 'max_day_pct': 10}
+}
+
+def _day_sums(day, values, days):
+    """Somme par journée de chaque colonne (paris triés par jour) : matrice days × colonnes"""
+    bounds = np.searchsorted(day, np.arange(days + 1))
+    
+    # reduceat sur les seules journées avec paris (un segment vide renverrait une ligne)
+    active = np.flatnonzero(np.diff(bounds))
+    sums = np.zeros((days, values.shape[1]))
+    if len(active):
+        sums[active] = np.add.reduceat(values, bounds[active], axis=0)
+    return sums
+
+def _bankroll_columns(initial_bankroll, day_return, flat=False):
+    """
+    Bankroll de chaque colonne (stratégie) : journées + 1 × colonnes
+    flat : colonnes à gains additifs (mise fixe), les autres sont composées ;
+    la ruine est absorbante
+    """
+    growth = np.where(flat, 1 + np.cumsum(day_return, axis=0),
+                      np.cumprod(np.maximum(1 + day_return, 0), axis=0))
+    growth = np.where(np.maximum.accumulate(growth <= 0, axis=0), 0, growth)
+    return initial_bankroll * np.vstack((np.ones(day_return.shape[1]), growth))
+
+def _bankroll_metrics(daily_bankroll, initial_bankroll):
+    """ROI, ratio de Sharpe annualisé et drawdown max de chaque colonne (définitions de get_statistics)"""
+    previous = daily_bankroll[:-1]
+    returns = np.divide(daily_bankroll[1:], previous, out=np.zeros_like(previous),
+                        where=previous > 0) - 1
+    if len(returns) > 1:
+        std = returns.std(axis=0, ddof=1)
+    else:
+        std = np.zeros(daily_bankroll.shape[1])
+    sharpe = np.divide(returns.mean(axis=0), std, out=np.zeros_like(std), where=std > 0) * np.sqrt(365)
+    
+    peaks = np.maximum.accumulate(daily_bankroll, axis=0)
+    drawdown = np.divide(daily_bankroll - peaks, peaks, out=np.zeros_like(peaks), where=peaks > 0)
+    
+    return {
+        'roi': (daily_bankroll[-1] - initial_bankroll) / initial_bankroll * 100,
+        'sharpe_ratio': sharpe,
+        'max_drawdown': drawdown.min(axis=0) * 100
+    }
+
+def staking_matrix(policies, day, days, odds, predicted_prob, ev, stake_pct):
+    """
+    Mises des paris sous chaque politique, en fraction de bankroll
+    Retourne une matrice paris × politiques
+    """
+    kelly = np.maximum((predicted_prob * odds - 1) / (odds - 1), 0)
+    stakes = np.empty((len(odds), len(policies)))
+    
+    for j, policy in enumerate(policies.values()):
+        kind = policy['kind']
+        if kind == 'recorded':
+            stake = stake_pct
+        elif kind in ('flat', 'fraction'):
+            stake = policy['pct']
+        elif kind == 'kelly':
+            stake = kelly * 100 * policy['multiplier']
+        elif kind == 'ev':
+            stake = ev * policy['pct_per_ev']
+        else:
+            raise ValueError(f"Politique de mise inconnue : {kind}")
+        stakes[:, j] = np.clip(stake, policy.get('min_pct', 0), policy.get('max_pct', 100)) / 100
+    
+    # Plafond d'exposition journalière : mises du jour réduites au prorata
+    capped = [j for j, policy in enumerate(policies.values()) if 'max_day_pct' in policy]
+    if capped:
+        caps = np.array([list(policies.values())[j]['max_day_pct'] / 100 for j in capped])
+        exposure = _day_sums(day, stakes[:, capped], days)
+        scale = np.minimum(1, caps / np.maximum(exposure, 1e-12))
+        stakes[:, capped] *= scale[day]
+    
+    return stakes
+
+def evaluate_staking_policies(bets, initial_bankroll, policies=None):
+    """
+    Évalue plusieurs politiques de mise en une passe vectorisée sur les mêmes paris
+    bets : BetStore ou DataFrame des paris d'un backtest
+    Retourne dict : policies (noms), labels, daily_bankroll (journées + 1 × politiques),
+    rows (une ligne de métriques par politique)
+    """
+    policies = policies or STAKING_POLICIES
+    
+    if isinstance(bets, BetStore):
+        day, days = bets['day'], len(bets.dates)
+    else:
+        day, days = bets['date'].cat.codes.to_numpy(), len(bets['date'].cat.categories)
+    odds = np.asarray(bets['odds'], dtype=np.float64)
+    won = np.asarray(bets['won'])
+    
+    stakes = staking_matrix(
+        policies, day, days, odds,
+        np.asarray(bets['predicted_prob'], dtype=np.float64) / 100,
+        np.asarray(bets['ev'], dtype=np.float64),
+        np.asarray(bets['stake_pct'], dtype=np.float64)
+    )
+    
+    avg_stake = stakes.mean(axis=0) * 100 if len(odds) else np.zeros(len(policies))
+    exposure = _day_sums(day, stakes, days).max(axis=0) * 100 if len(odds) else np.zeros(len(policies))
+    
+    # Matrice paris × politiques des rendements (en place), sommés par journée
+    bet_return = stakes
+    bet_return *= np.where(won, odds - 1, -1)[:, None]
+    day_return = _day_sums(day, bet_return, days)
+    
+    flat = np.array([policy['kind'] == 'flat' for policy in policies.values()])
+    daily_bankroll = _bankroll_columns(initial_bankroll, day_return, flat)
+    metrics = _bankroll_metrics(daily_bankroll, initial_bankroll)
+    
+    final = daily_bankroll[-1]
+    rows = [
+        {
+            'policy': name,
+            'label': policy['label'],
+            'final_bankroll': round(final[j], 2),
+            'roi': round(metrics['roi'][j], 1),
+            'max_drawdown': round(metrics['max_drawdown'][j], 1),
+            'sharpe_ratio': round(metrics['sharpe_ratio'][j], 2),
+            'avg_stake_pct': round(avg_stake[j], 2),
+            'max_day_exposure': round(exposure[j], 1),
+            'ruined': bool(final[j] <= 0)
+        }
+        for j, (name, policy) in enumerate(policies.items())
+    ]
+    
+    return {
+        'policies': list(policies),
+        'labels': [policy['label'] for policy in policies.values()],
+        'daily_bankroll': daily_bankroll,
+        'rows': rows
+    }
+
+# ==================== INTERVALLES DE CONFIANCE (BOOTSTRAP) ====================
+
+# Statistiques dotées d'un intervalle de confiance (clés de get_statistics)
+BOOTSTRAP_METRICS = ('roi', 'sharpe_ratio', 'profit_factor', 'win_rate')
+
+def bootstrap_statistics(bets, n_resamples=10_000, confidence=0.95, rng=None,
+                         max_chunk_cells=500_000):
+    """
+    Intervalles de confiance bootstrap (percentiles) de ROI, Sharpe, profit factor et win rate
+    Chaque rééchantillonnage tire les paris avec remise via une matrice d'indices
+    rééchantillonnages × paris ; les paris tirés occupent les places (journées) des
+    paris d'origine, si bien que ROI composé et Sharpe journalier suivent les
+    définitions de get_statistics (l'échantillon identité les reproduit exactement)
+    Traitement par blocs d'au plus max_chunk_cells indices pour borner la mémoire
+    (des blocs de quelques Mo restent en cache : nettement plus rapides que de gros blocs)
+    bets : BetStore ou DataFrame des paris d'un backtest
+    Retourne dict : n_resamples, confidence et, par métrique, low / high / std
+    """
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    
+    if isinstance(bets, BetStore):
+        day, days = bets['day'], len(bets.dates)
+    else:
+        day, days = bets['date'].cat.codes.to_numpy(), len(bets['date'].cat.categories)
+    n = len(day)
+    if n == 0:
+        return None
+    
+    # Rendement de chaque pari (fraction de bankroll), calculé comme dans run_backtest
+    odds = np.asarray(bets['odds']).astype(np.float64)
+    stake_pct = np.asarray(bets['stake_pct']).astype(np.float64)
+    won = np.asarray(bets['won'])
+    bet_return = (stake_pct / 100) * np.where(won, odds - 1, -1)
+    profit = np.asarray(bets['profit'], dtype=np.float64)
+    
+    # Première place de chaque journée avec paris (paris triés par jour)
+    starts = np.flatnonzero(np.diff(day, prepend=-1))
+    
+    samples = {name: np.empty(n_resamples) for name in BOOTSTRAP_METRICS}
+    chunk = max(1, max_chunk_cells // n)
+    
+    for start in range(0, n_resamples, chunk):
+        rows = slice(start, min(start + chunk, n_resamples))
+        index = rng.integers(0, n, size=(rows.stop - rows.start, n))
+        
+        # Journées sans pari : rendement nul, compté dans la moyenne et la variance
+        day_return = np.add.reduceat(np.take(bet_return, index), starts, axis=1)
+        with np.errstate(divide='ignore'):
+            log_growth = np.log(np.maximum(1 + day_return, 0)).sum(axis=1)
+        samples['roi'][rows] = np.expm1(log_growth) * 100
+        
+        mean = day_return.sum(axis=1) / days
+        var = ((day_return ** 2).sum(axis=1) - days * mean ** 2) / max(days - 1, 1)
+        std = np.sqrt(np.maximum(var, 0))
+        samples['sharpe_ratio'][rows] = np.divide(
+            mean, std, out=np.full_like(mean, np.nan), where=std > 0
+        ) * np.sqrt(365)
+        
+        # Un seul tirage des profits : gains, pertes et paris gagnés (profit > 0) en découlent
+        sampled_profit = np.take(profit, index)
+        gross_gain = np.maximum(sampled_profit, 0).sum(axis=1)
+        gross_loss = gross_gain - sampled_profit.sum(axis=1)
+        samples['profit_factor'][rows] = np.divide(
+            gross_gain, gross_loss, out=np.full_like(gross_loss, np.nan), where=gross_loss > 0
+        )
+        samples['win_rate'][rows] = np.count_nonzero(sampled_profit > 0, axis=1) / n * 100
+    
+    tail = (1 - confidence) / 2 * 100
+    result = {'n_resamples': n_resamples, 'confidence': confidence}
+    for name, values in samples.items():
+        low, high = np.nanpercentile(values, [tail, 100 - tail])
+        result[name] = {'low': low, 'high': high, 'std': np.nanstd(values)}
+    
+    return result
+
+# ==================== OPTIMISATION DE LA STRATÉGIE ====================
+
+# Métriques des cartes de chaleur (toutes à maximiser ; le drawdown est négatif)
+OPTIMIZATION_METRICS = {
+    'roi': "ROI (%)",
+    'sharpe_ratio': "Ratio de Sharpe",
+    'max_drawdown': "Drawdown max (%)"
+}
+
+def _grid_indices(n, step):
+    """Indices d'une passe grossière : un point sur step, extrémités comprises"""
+    return np.unique(np.append(np.arange(0, n, step), n - 1))
+
+def _iter_cell_returns(candidates, ev_thresholds, kelly_multipliers, bounds, todo,
+                       max_chunk_cells=2_000_000):
+    """
+    Rendements journaliers des cellules demandées (todo : bornes × seuils × multiplicateurs)
+    Pour chaque seuil, les value bets sont filtrés une fois et les cellules de la ligne
+    forment une matrice paris × cellules, par blocs de max_chunk_cells
+    Génère (bornes, seuil, multiplicateurs, matrice journées × cellules)
+    """
+    day, days = candidates['day'], len(candidates.dates)
+    odds = candidates['odds'].astype(np.float64)
+    predicted_prob = candidates['predicted_prob'].astype(np.float64) / 100
+    ev = candidates['ev'].astype(np.float64)
+    kelly = np.maximum((predicted_prob * odds - 1) / (odds - 1), 0) * 100
+    payoff = np.where(candidates['won'], odds - 1, -1)
+    
+    for i, threshold in enumerate(ev_thresholds):
+        bound, multiplier = np.nonzero(todo[:, i, :])
+        if not len(bound):
+            continue
+        
+        value = ev > threshold
+        value_day, value_kelly, value_payoff = day[value], kelly[value], payoff[value]
+        step = max(1, max_chunk_cells // max(1, len(value_day)))
+        
+        for start in range(0, len(bound), step):
+            b, k = bound[start:start + step], multiplier[start:start + step]
+            bet_return = np.clip(value_kelly[:, None] * kelly_multipliers[k],
+                                 bounds[b, 0], bounds[b, 1]) / 100
+            bet_return *= value_payoff[:, None]
+            
+            yield b, i, k, _day_sums(value_day, bet_return, days)
+
+def optimize_strategy(candidates, initial_bankroll=1000, ev_thresholds=np.arange(0, 20.5, 0.5),
+                      kelly_multipliers=np.linspace(0.05, 1, 20), stake_bounds=((0.5, 5),),
+                      objective='sharpe_ratio', prune=True, coarse_step=5, keep=0.25,
+                      max_chunk_cells=2_000_000):
+    """
+    Grille bornes de mise × seuil d'EV × multiplicateur de Kelly évaluée sur un
+    univers fixe de paris candidats (BacktestEngine.draw_candidates)
+    Les cellules sont évaluées par lignes de seuil (cf. _iter_cell_returns)
+    Élagage : passe grossière (un point sur coarse_step par axe), puis évaluation fine
+    seulement autour des points grossiers du meilleur quantile (keep) de l'objectif
+    Retourne dict : axes, métriques (bornes × seuils × multiplicateurs, NaN si élaguée),
+    evaluated, total_bets (par seuil) et best (paramètres et métriques de la meilleure cellule)
+    """
+    if objective not in OPTIMIZATION_METRICS:
+        raise ValueError(f"Objectif inconnu : {objective} ({', '.join(OPTIMIZATION_METRICS)})")
+    
+    ev_thresholds = np.asarray(ev_thresholds, dtype=np.float64)
+    kelly_multipliers = np.asarray(kelly_multipliers, dtype=np.float64)
+    bounds = np.asarray(stake_bounds, dtype=np.float64).reshape(-1, 2)
+    shape = (len(bounds), len(ev_thresholds), len(kelly_multipliers))
+    
+    metrics = {name: np.full(shape, np.nan) for name in OPTIMIZATION_METRICS}
+    evaluated = np.zeros(shape, dtype=bool)
+    ev = candidates['ev'].astype(np.float64)
+    total_bets = (ev[:, None] > ev_thresholds).sum(axis=0)
+    
+    def evaluate(todo):
+        cells = _iter_cell_returns(candidates, ev_thresholds, kelly_multipliers, bounds, todo,
+                                   max_chunk_cells)
+        for b, i, k, day_return in cells:
+            daily_bankroll = _bankroll_columns(initial_bankroll, day_return)
+            for name, values in _bankroll_metrics(daily_bankroll, initial_bankroll).items():
+                metrics[name][b, i, k] = values
+        evaluated[todo] = True
+    
+    if prune and coarse_step > 1:
+        coarse = np.zeros(shape, dtype=bool)
+        coarse[np.ix_(range(len(bounds)), _grid_indices(shape[1], coarse_step),
+                      _grid_indices(shape[2], coarse_step))] = True
+        evaluate(coarse)
+        
+        # Zones autour des meilleurs points grossiers : les autres sont dominées
+        cut = np.quantile(metrics[objective][coarse], 1 - keep)
+        fine = np.zeros(shape, dtype=bool)
+        for b, i, k in np.argwhere(coarse & (metrics[objective] >= cut)):
+            fine[b, max(0, i - coarse_step):i + coarse_step + 1,
+                 max(0, k - coarse_step):k + coarse_step + 1] = True
+        evaluate(fine & ~evaluated)
+    else:
+        evaluate(np.ones(shape, dtype=bool))
+    
+    b, i, k = np.unravel_index(np.nanargmax(metrics[objective]), shape)
+    return {
+        'ev_thresholds': ev_thresholds,
+        'kelly_multipliers': kelly_multipliers,
+        'stake_bounds': [tuple(pair) for pair in bounds.tolist()],
+        'objective': objective,
+        **metrics,
+        'evaluated': evaluated,
+        'total_bets': total_bets,
+        'best': {
+            'ev_threshold': ev_thresholds[i],
+            'kelly_multiplier': kelly_multipliers[k],
+            'min_stake_pct': bounds[b, 0],
+            'max_stake_pct': bounds[b, 1],
+            'total_bets': int(total_bets[i]),
+            **{name: metrics[name][b, i, k] for name in OPTIMIZATION_METRICS}
+        }
+    }
+
+# ==================== WALK-FORWARD ====================
+
+def _threshold_day_returns(candidates, ev_thresholds, kelly_multipliers, stake_bounds):
+    """
+    Rendements journaliers de toute la grille seuils × multiplicateurs : journées × seuils × multiplicateurs
+    Chaque pari n'est traité qu'une fois : les paris sont groupés par nombre de seuils
+    qu'ils dépassent, et la grille se déduit par somme cumulée des groupes
+    (un seuil plus bas ajoute des paris à ceux d'un seuil plus haut)
+    """
+    day, days = candidates['day'], len(candidates.dates)
+    odds = candidates['odds'].astype(np.float64)
+    predicted_prob = candidates['predicted_prob'].astype(np.float64) / 100
+    ev = candidates['ev'].astype(np.float64)
+    kelly = np.maximum((predicted_prob * odds - 1) / (odds - 1), 0) * 100
+    payoff = np.where(candidates['won'], odds - 1, -1)
+    
+    order = np.argsort(ev_thresholds)
+    level = np.searchsorted(np.asarray(ev_thresholds)[order], ev, side='left')
+    
+    # Contribution de chaque groupe (paris au-dessus d'exactement `level` seuils triés)
+    contributions = np.zeros((len(order) + 1, days, len(kelly_multipliers)))
+    for group in np.unique(level[level > 0]):
+        members = level == group
+        bet_return = np.clip(kelly[members, None] * kelly_multipliers, *stake_bounds) / 100
+        bet_return *= payoff[members, None]
+        contributions[group] = _day_sums(day[members], bet_return, days)
+    
+    # Seuil trié j : groupes au-dessus de j
+    above = np.cumsum(contributions[::-1], axis=0)[::-1][1:]
+    day_return = np.empty((days, len(order), len(kelly_multipliers)))
+    day_return[:, order] = above.transpose(1, 0, 2)
+    return day_return
+
+def walk_forward(candidates, initial_bankroll=1000, train_days=180, test_days=30,
+                 ev_thresholds=np.arange(0, 21, 1), kelly_multipliers=np.linspace(0.1, 1, 10),
+                 stake_bounds=(0.5, 5), objective='sharpe_ratio', baseline=(5, 0.5)):
+    """
+    Backtest walk-forward sur un univers fixe de paris candidats : les paramètres
+    (seuil d'EV × multiplicateur de Kelly) sont choisis sur chaque fenêtre
+    d'apprentissage de train_days journées, puis joués sur les test_days suivantes ;
+    la fenêtre avance de test_days
+    Statistiques de fenêtre par sommes cumulées des rendements de chaque cellule :
+    un glissement ajoute les journées entrantes et retire les sortantes, sans
+    recalculer la fenêtre
+    baseline : (seuil, multiplicateur) joué tel quel sur les mêmes journées
+    Retourne dict : folds (une ligne par fenêtre), dates, daily_bankroll et
+    baseline_bankroll (journées de test + 1), stats et baseline_stats
+    """
+    if objective not in ('roi', 'sharpe_ratio'):
+        raise ValueError(f"Objectif walk-forward inconnu : {objective} (roi, sharpe_ratio)")
+    
+    days = len(candidates.dates)
+    if days < train_days + test_days:
+        raise ValueError(f"Période trop courte : {days} jours < {train_days} + {test_days}")
+    
+    ev_thresholds = np.asarray(ev_thresholds, dtype=np.float64)
+    kelly_multipliers = np.asarray(kelly_multipliers, dtype=np.float64)
+    bounds = np.asarray(stake_bounds, dtype=np.float64).reshape(1, 2)
+    n_kelly = len(kelly_multipliers)
+    
+    # Rendements journaliers de chaque cellule : journées × (seuils × multiplicateurs)
+    day_return = _threshold_day_returns(candidates, ev_thresholds, kelly_multipliers, bounds[0])
+    day_return = day_return.reshape(days, -1)
+    growth = np.maximum(1 + day_return, 0)
+    
+    # Sommes cumulées (log-croissance, rendements, carrés) : fenêtre = différence de deux lignes
+    zero = np.zeros((1, day_return.shape[1]))
+    log_growth = np.concatenate((zero, np.cumsum(np.log(np.maximum(growth, 1e-300)), axis=0)))
+    sum_returns = np.concatenate((zero, np.cumsum(day_return, axis=0)))
+    sum_squares = np.concatenate((zero, np.cumsum(day_return ** 2, axis=0)))
+    
+    # Fenêtres : test [start, end), apprentissage [start - train_days, start)
+    test_start = np.arange(train_days, days, test_days)
+    test_end = np.minimum(test_start + test_days, days)
+    train_start = test_start - train_days
+    
+    if objective == 'roi':
+        score = (np.exp(log_growth[test_start] - log_growth[train_start]) - 1) * 100
+    else:
+        mean = (sum_returns[test_start] - sum_returns[train_start]) / train_days
+        var = ((sum_squares[test_start] - sum_squares[train_start]) - train_days * mean ** 2) / max(train_days - 1, 1)
+        std = np.sqrt(np.maximum(var, 0))
+        score = np.divide(mean, std, out=np.full_like(mean, -np.inf), where=std > 0) * np.sqrt(365)
+    choice = score.argmax(axis=1)
+    
+    # Journées de test jouées avec la cellule choisie sur la fenêtre précédente
+    test_days_count = test_end - test_start
+    chosen = np.repeat(choice, test_days_count)
+    oos_growth = growth[np.arange(train_days, days), chosen]
+    daily_bankroll = initial_bankroll * np.concatenate(([1.0], np.cumprod(oos_growth)))
+    
+    fixed = next(_iter_cell_returns(candidates, [baseline[0]], np.array([baseline[1]]), bounds,
+                                    np.ones((1, 1, 1), dtype=bool)))[3][train_days:, 0]
+    baseline_bankroll = initial_bankroll * np.concatenate(([1.0], np.cumprod(np.maximum(1 + fixed, 0))))
+    
+    # Paris joués par fenêtre : comptages journaliers par seuil (mêmes groupes que les
+    # rendements), cumulés dans le temps
+    order = np.argsort(ev_thresholds)
+    level = np.searchsorted(ev_thresholds[order], candidates['ev'].astype(np.float64), side='left')
+    by_level = np.bincount(level * days + candidates['day'], minlength=(len(order) + 1) * days)
+    above = np.cumsum(by_level.reshape(-1, days)[::-1], axis=0)[::-1][1:]
+    bet_counts = np.zeros((days + 1, len(order)), dtype=np.int64)
+    bet_counts[1:, order] = np.cumsum(above.T, axis=0)
+    threshold_index = choice // n_kelly
+    fold_bets = bet_counts[test_end, threshold_index] - bet_counts[test_start, threshold_index]
+    
+    fold_bankroll = daily_bankroll[np.append(0, np.cumsum(test_days_count))]
+    dates = candidates.dates
+    folds = [
+        {
+            'train_start': dates[train_start[f]],
+            'test_start': dates[test_start[f]],
+            'test_end': dates[test_end[f] - 1],
+            'ev_threshold': ev_thresholds[threshold_index[f]],
+            'kelly_multiplier': kelly_multipliers[choice[f] % n_kelly],
+            'train_score': score[f, choice[f]],
+            'test_roi': (fold_bankroll[f + 1] / fold_bankroll[f] - 1) * 100 if fold_bankroll[f] > 0 else 0.0,
+            'bets': int(fold_bets[f])
+        }
+        for f in range(len(test_start))
+    ]
+    
+    metrics = _bankroll_metrics(np.column_stack((daily_bankroll, baseline_bankroll)), initial_bankroll)
+    stats, baseline_stats = (
+        {name: values[j] for name, values in metrics.items()} for j in range(2)
+    )
+    stats['total_bets'] = int(fold_bets.sum())
+    
+    return {
+        'folds': folds,
+        'dates': dates[train_days:],
+        'daily_bankroll': daily_bankroll,
+        'baseline_bankroll': baseline_bankroll,
+        'stats': stats,
+        'baseline_stats': baseline_stats,
+        'objective': objective,
+        'train_days': train_days,
+        'test_days': test_days
+    }
+
+# ==================== BALAYAGE DE PARAMÈTRES ====================
+
+# Paramètres de stratégie balayables et leur valeur par défaut
+SWEEP_DEFAULTS = {
+    'avg_bets_per_day': 3,
+    'ev_threshold': 5,
+    'kelly_multiplier': 0.5,
+    'min_stake_pct': 0.5,
+    'max_stake_pct': 5
+}
+
+def _sweep_worker(task):
+    """Exécute un backtest de la grille (fonction de module pour rester picklable)"""
+    params, run, seed_seq, initial_bankroll, days = task
+    
+    engine = BacktestEngine(initial_bankroll, days, seed=seed_seq, **params)
+    engine.run_backtest(frame=False)
+    
+    return {**params, 'run': run, **engine.get_statistics()}
+
+def run_parameter_sweep(grid, initial_bankroll=1000, days=365, seed=None, repeats=1,
+                        max_workers=None):
+    """
+    Balaye le produit cartésien de la grille sur un pool de processus
+    grid : dict paramètre -> liste de valeurs (clés de SWEEP_DEFAULTS)
+    Chaque backtest reçoit son propre générateur, issu d'une unique SeedSequence :
+    les résultats sont reproductibles quel que soit le nombre de processus
+    Retourne un DataFrame (une ligne par backtest ; run : numéro de répétition
+    de 0 à repeats - 1 au sein de chaque combinaison)
+    """
+    unknown = set(grid) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus : {', '.join(sorted(unknown))}")
+    
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    runs = [(combo, run) for combo in combos for run in range(repeats)]
+    
+    seeds = np.random.SeedSequence(seed).spawn(len(runs))
+    tasks = [(combo, run, seed_seq, initial_bankroll, days)
+             for (combo, run), seed_seq in zip(runs, seeds)]
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        rows = [_sweep_worker(task) for task in tasks]
+    else:
+        # Plusieurs tâches par envoi pour amortir la sérialisation entre processus
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(pool.map(_sweep_worker, tasks, chunksize=chunksize))
+    
+    return pd.DataFrame(rows)
+
+# ==================== PARAMÈTRES D'UN RUN ====================
+
+def run_seeds(seed):
+    """
+    Graines de chaque calcul d'un run, dérivées de sa graine racine
+    Dérivation commune à l'application et à la CLI : une même graine y donne le même backtest
+    Enfants de la racine : backtest (run, placements), Monte Carlo (trajectoires,
+    placements), univers des candidats (optimisation, walk-forward), bootstrap
+    """
+    backtest, monte_carlo = np.random.SeedSequence(seed).spawn(2)
+    backtest_run, comparison = backtest.spawn(2)
+    monte_carlo_run, monte_carlo_comparison = monte_carlo.spawn(2)
+    
+    return {
+        'backtest': backtest_run,
+        'comparison': comparison,
+        'monte_carlo': monte_carlo_run,
+        'monte_carlo_comparison': monte_carlo_comparison,
+        'candidates': np.random.SeedSequence(seed, spawn_key=(2,)),
+        'bootstrap': np.random.SeedSequence(seed, spawn_key=(3,))
+    }
+
+def run_params(params):
+    """
+    Paramètres d'un run au schéma commun à l'application et à la CLI (archives comprises)
+    Clés absentes complétées (archives plus anciennes ou écrites par la CLI) :
+    paramètres de stratégie (valeurs de SWEEP_DEFAULTS), monte_carlo (trajectoires,
+    0 sans Monte Carlo), benchmarks (tuple de clés de BENCHMARK_ASSETS), history (None,
+    ou tuple (ligues, saisons, équipes) de tuples, vides si non filtrés) ;
+    monte_carlo est forcé à 0 en mode historique
+    """
+    params = {**SWEEP_DEFAULTS, 'monte_carlo': 0, **params}
+    
+    benchmarks = params.get('benchmarks')
+    params['benchmarks'] = DEFAULT_BENCHMARKS if benchmarks is None else tuple(benchmarks)
+    
+    history = params.get('history')
+    params['history'] = tuple(tuple(entry or ()) for entry in history) if history else None
+    
+    # Le Monte Carlo simule des paris synthétiques : pas de trajectoires pour un
+    # backtest sur matchs réels
+    if params['history']:
+        params['monte_carlo'] = 0
+    
+    return params
+
+def run_strategy(params):
+    """Paramètres de stratégie d'un run (arguments de BacktestEngine, clés de SWEEP_DEFAULTS)"""
+    return {name: params[name] for name in SWEEP_DEFAULTS}
+
+# ==================== ARCHIVES ARROW / PARQUET ====================
+
+# Format -> extension des fichiers d'une archive
+ARCHIVE_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+ARCHIVE_DIR = 'archives'
+
+def _json_default(value):
+    """Scalaires numpy -> types Python pour les métadonnées JSON"""
+    return value.item()
+
+def save_backtest(path, results, stats, params=None, fmt='arrow'):
+    """
+    Archive un backtest (layout de BacktestEngine.results) dans le dossier path :
+    bets : table des paris (catégories -> colonnes dictionnaire)
+    bankroll : trajectoire journalière (days + 1 points)
+    Les agrégats, statistiques, paramètres et catégories sont dans les métadonnées du schéma
+    fmt : 'arrow' (IPC, relu par memory-map sans décodage) ou 'parquet' (compressé)
+    """
+    ext = ARCHIVE_FORMATS[fmt]
+    os.makedirs(path, exist_ok=True)
+    
+    frame = results['bets']
+    metadata = {
+        'final_bankroll': results['final_bankroll'],
+        'total_profit': results['total_profit'],
+        'roi': results['roi'],
+        'stats': stats,
+        'params': params or {},
+        'dates': [date.isoformat() for date in results['dates']],
+        'categories': {
+            name: list(frame[name].cat.categories)
+            for name, _ in BetStore.CATEGORICAL.values()
+            if name != 'date' and name in frame
+        }
+    }
+    bets = pa.Table.from_pandas(frame, preserve_index=False)
+    bets = bets.replace_schema_metadata({
+        **(bets.schema.metadata or {}),
+        b'backtest': json.dumps(metadata, default=_json_default).encode()
+    })
+    bankroll = pa.table({'bankroll': np.asarray(results['daily_bankroll'], dtype=np.float64)})
+    
+    for name, table in (('bets', bets), ('bankroll', bankroll)):
+        file_path = os.path.join(path, name + ext)
+        if fmt == 'arrow':
+            with pa.OSFile(file_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, file_path, compression='zstd')
+    
+    return path
+
+def _read_archive_table(file_path, columns=None):
+    """Table Arrow d'un fichier d'archive, projetée en mémoire (memory-map)"""
+    if file_path.endswith(ARCHIVE_FORMATS['arrow']):
+        # Les buffers de la table pointent directement dans le fichier projeté
+        table = pa.ipc.open_file(pa.memory_map(file_path, 'r')).read_all()
+        return table.select(columns) if columns is not None else table
+    return pq.read_table(file_path, columns=columns, memory_map=True)
+
+def load_backtest(path, columns=None):
+    """
+    Recharge une archive de save_backtest
+    columns : sous-ensemble des colonnes de paris à charger (toutes par défaut)
+    Retourne (results, stats, params) avec le même layout que BacktestEngine.results
+    """
+    files = {
+        name: os.path.join(path, name + ext)
+        for ext in ARCHIVE_FORMATS.values()
+        for name in ('bets', 'bankroll')
+        if os.path.exists(os.path.join(path, name + ext))
+    }
+    if len(files) < 2:
+        raise FileNotFoundError(f"Archive incomplète : {path}")
+    
+    # Le schéma (et ses métadonnées) se lit sans charger les colonnes
+    if files['bets'].endswith(ARCHIVE_FORMATS['arrow']):
+        schema = pa.ipc.open_file(pa.memory_map(files['bets'], 'r')).schema
+    else:
+        schema = pq.read_schema(files['bets'])
+    metadata = json.loads(schema.metadata[b'backtest'])
+    
+    bets = _read_archive_table(files['bets'], columns).to_pandas(split_blocks=True)
+    dates = pd.DatetimeIndex(metadata['dates'])
+    
+    # Parquet ne garde pas les dictionnaires (dates) : catégories restaurées si besoin
+    for name, categories in {'date': dates, **metadata['categories']}.items():
+        if name in bets and not isinstance(bets[name].dtype, pd.CategoricalDtype):
+            bets[name] = pd.Categorical(bets[name], categories=categories)
+    
+    bankroll = _read_archive_table(files['bankroll'])
+    results = {
+        'bets': bets,
+        'daily_bankroll': bankroll.column('bankroll').to_numpy(),
+        'dates': dates,
+        'final_bankroll': metadata['final_bankroll'],
+        'total_profit': metadata['total_profit'],
+        'roi': metadata['roi']
+    }
+    
+    return results, metadata['stats'], metadata['params']
+
+def list_archives(root=ARCHIVE_DIR):
+    """Noms des archives complètes du dossier root, les plus récentes d'abord"""
+    if not os.path.isdir(root):
+        return []
+    
+    archives = [
+        name for name in os.listdir(root)
+        if any(os.path.exists(os.path.join(root, name, 'bets' + ext))
+               for ext in ARCHIVE_FORMATS.values())
+    ]
+    return sorted(archives, reverse=True)
+
+# ==================== HISTORIQUE DES COTES ====================
+
+HISTORY_DIR = 'history'
+
+# Colonnes des CSV football-data.co.uk (hors cotes) et leur type
+HISTORY_COLUMNS = {
+    'Div': 'category',
+    'Date': 'string',
+    'HomeTeam': 'string',
+    'AwayTeam': 'string',
+    'FTR': 'category'
+}
+HISTORY_BOOKMAKERS = ('B365', 'PS')
+
+def _parse_match_dates(dates):
+    """Dates jj/mm/aaaa, ou jj/mm/aa dans les fichiers les plus anciens"""
+    parsed = pd.to_datetime(dates, format='%d/%m/%Y', errors='coerce')
+    short = parsed.isna()
+    if short.any():
+        parsed[short] = pd.to_datetime(dates[short], format='%d/%m/%y', errors='coerce')
+    return parsed
+
+def read_football_data_csv(path, bookmakers=HISTORY_BOOKMAKERS, chunksize=50_000):
+    """
+    Lit un CSV football-data par blocs de chunksize lignes, types imposés
+    Seules les colonnes utiles (match, résultat, cotes des bookmakers) sont parsées
+    Génère des DataFrames normalisés : date, league, season, home, away, result,
+    puis une colonne de cotes par bookmaker et issue (ex. B365H, B365D, B365A)
+    """
+    odds_columns = [bookmaker + outcome for bookmaker in bookmakers for outcome in OUTCOMES]
+    dtypes = {**HISTORY_COLUMNS, **dict.fromkeys(odds_columns, np.float32)}
+    
+    reader = pd.read_csv(
+        path,
+        usecols=lambda column: column in dtypes,
+        dtype=dtypes,
+        chunksize=chunksize,
+        encoding='utf-8-sig',
+        encoding_errors='replace'
+    )
+    for chunk in reader:
+        chunk = chunk.dropna(subset=['Date', 'HomeTeam', 'AwayTeam', 'FTR'])
+        date = _parse_match_dates(chunk['Date'])
+        
+        # Saison désignée par son année de début (juillet -> juin)
+        season = (date.dt.year - (date.dt.month < 7)).astype(np.int16)
+        
+        frame = pd.DataFrame({
+            'date': date,
+            'league': chunk['Div'].astype(str).map(lambda code: DIVISIONS.get(code, code)),
+            'season': season,
+            'home': chunk['HomeTeam'],
+            'away': chunk['AwayTeam'],
+            'result': chunk['FTR'].astype(str)
+        })
+        for column in odds_columns:
+            frame[column] = chunk[column] if column in chunk else np.float32(np.nan)
+        
+        yield frame[frame['date'].notna()]
+
+def _remove_fragments(cache_dir, stem):
+    """
+    Supprime les fragments d'un fichier source (<fichier>-<bloc>-<n>.parquet) dans
+    toutes les partitions du cache, puis les partitions restées vides
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    
+    fragment = re.compile(rf'{re.escape(stem)}-\d+-\d+\.parquet')
+    for league_dir in os.listdir(cache_dir):
+        league_path = os.path.join(cache_dir, league_dir)
+        if not league_dir.startswith('league=') or not os.path.isdir(league_path):
+            continue
+        
+        for season_dir in os.listdir(league_path):
+            season_path = os.path.join(league_path, season_dir)
+            for name in os.listdir(season_path):
+                if fragment.fullmatch(name):
+                    os.remove(os.path.join(season_path, name))
+            if not os.listdir(season_path):
+                os.rmdir(season_path)
+        if not os.listdir(league_path):
+            os.rmdir(league_path)
+
+def ingest_historical_odds(paths, cache_dir=HISTORY_DIR, bookmakers=HISTORY_BOOKMAKERS,
+                           chunksize=50_000):
+    """
+    Convertit des CSV football-data (chemins ou fichiers) en cache Parquet
+    partitionné par ligue/saison
+    (cache_dir/league=.../season=.../<fichier>-<bloc>-<n>.parquet)
+    Réingérer un fichier remplace ses propres fragments : les anciens sont supprimés
+    de toutes les partitions avant l'écriture (un fichier raccourci ne laisse ni
+    doublons ni matchs périmés)
+    Retourne le nombre de matchs écrits
+    """
+    n_matches = 0
+    for path in paths:
+        # Chemin ou fichier ouvert (ex. fichier importé dans l'interface)
+        stem = os.path.splitext(os.path.basename(getattr(path, 'name', path)))[0]
+        _remove_fragments(cache_dir, stem)
+        
+        for i, frame in enumerate(read_football_data_csv(path, bookmakers, chunksize)):
+            pq.write_to_dataset(
+                pa.Table.from_pandas(frame, preserve_index=False),
+                cache_dir,
+                partition_cols=['league', 'season'],
+                basename_template=f'{stem}-{i}-{{i}}.parquet',
+                existing_data_behavior='overwrite_or_ignore'
+            )
+            n_matches += len(frame)
+    
+    return n_matches
+
+def historical_partitions(cache_dir=HISTORY_DIR):
+    """Saisons disponibles par ligue, lues dans l'arborescence du cache (sans données)"""
+    partitions = {}
+    if not os.path.isdir(cache_dir):
+        return partitions
+    
+    for league_dir in sorted(os.listdir(cache_dir)):
+        league_path = os.path.join(cache_dir, league_dir)
+        if not league_dir.startswith('league=') or not os.path.isdir(league_path):
+            continue
+        league = urllib.parse.unquote(league_dir.split('=', 1)[1])
+        partitions[league] = sorted(
+            int(season_dir.split('=', 1)[1])
+            for season_dir in os.listdir(league_path)
+            if season_dir.startswith('season=')
+        )
+    
+    return partitions
+
+def load_historical_odds(cache_dir=HISTORY_DIR, leagues=None, seasons=None, columns=None):
+    """
+    Matchs du cache Parquet, triés par date
+    Les filtres ligue/saison élaguent les partitions : seuls leurs fichiers sont lus,
+    et seulement les colonnes demandées (toutes par défaut)
+    """
+    filters = []
+    if leagues:
+        filters.append(('league', 'in', list(leagues)))
+    if seasons:
+        filters.append(('season', 'in', [int(season) for season in seasons]))
+    
+    if columns is not None:
+        columns = list(dict.fromkeys(['date', *columns]))
+    
+    table = pq.read_table(
+        cache_dir,
+        columns=columns,
+        filters=filters or None,
+        partitioning='hive'
+    )
+    return table.to_pandas().sort_values('date', kind='stable', ignore_index=True)
+
+class MatchStore:
+    """
+    Matchs historiques indexés pour des sélections sans masque sur toute la table
+    Matchs triés par date ; positions triées par ligue et par équipe :
+    chaque filtre se résout par recherche dichotomique (searchsorted)
+    """
+    
+    def __init__(self, matches):
+        self.matches = matches.sort_values('date', kind='stable', ignore_index=True)
+        self.dates = self.matches['date'].to_numpy()
+        n = len(self.matches)
+        positions = np.arange(n)
+        
+        leagues = pd.Categorical(self.matches['league'])
+        
+        # Chaque match apparaît dans l'index de ses deux équipes
+        teams = pd.Categorical(pd.concat([self.matches['home'], self.matches['away']]))
+        
+        # Filtre -> (clé -> positions triées, colonnes de codes de chaque match)
+        self.indexes = {
+            'leagues': (
+                self._build_index(leagues.categories, leagues.codes, positions),
+                (leagues.codes,)
+            ),
+            'teams': (
+                self._build_index(teams.categories, teams.codes, np.concatenate([positions, positions])),
+                (teams.codes[:n], teams.codes[n:])
+            )
+        }
+        self.codes = {
+            'leagues': {key: code for code, key in enumerate(leagues.categories)},
+            'teams': {key: code for code, key in enumerate(teams.categories)}
+        }
+    
+    @staticmethod
+    def _build_index(keys, codes, positions):
+        """Clé -> positions triées, en un seul tri (clé, position)"""
+        order = np.lexsort((positions, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+        sorted_positions = positions[order]
+        return {
+            key: sorted_positions[bounds[i]:bounds[i + 1]]
+            for i, key in enumerate(keys)
+        }
+    
+    def __len__(self):
+        return len(self.matches)
+    
+    @property
+    def leagues(self):
+        return list(self.indexes['leagues'][0])
+    
+    @property
+    def teams(self):
+        return list(self.indexes['teams'][0])
+    
+    @property
+    def nbytes(self):
+        arrays = itertools.chain.from_iterable(
+            itertools.chain(index.values(), codes) for index, codes in self.indexes.values()
+        )
+        frame_nbytes = self.matches.memory_usage(deep=True).sum()
+        return int(frame_nbytes) + sum(array.nbytes for array in arrays)
+    
+    def _date_bounds(self, start=None, end=None):
+        """Plage [lo, hi) des positions entre start et end (inclus)"""
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), 'left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), 'right')
+        return lo, hi
+    
+    def positions(self, leagues=None, teams=None, start=None, end=None):
+        """
+        Positions (triées) des matchs des ligues et des équipes données, entre start et end
+        Un filtre vide ou None ne restreint pas la sélection
+        """
+        lo, hi = self._date_bounds(start, end)
+        filters = {name: keys for name, keys in (('leagues', leagues), ('teams', teams)) if keys}
+        if not filters:
+            return np.arange(lo, hi)
+        
+        # Positions triées : la plage de dates se découpe aussi par dichotomie
+        ranges = {}
+        for name, keys in filters.items():
+            index = self.indexes[name][0]
+            parts = [index[key] for key in keys if key in index]
+            ranges[name] = [part[np.searchsorted(part, lo):np.searchsorted(part, hi)] for part in parts]
+        
+        # Le filtre le plus sélectif fournit les candidats...
+        name = min(ranges, key=lambda name: sum(map(len, ranges[name])))
+        parts = ranges[name]
+        if len(parts) == 1:
+            selected = parts[0]
+        elif sum(map(len, parts)) * 16 < hi - lo:
+            selected = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        else:
+            # Union dense : marquage sur la seule plage de dates plutôt qu'un tri
+            mark = np.zeros(hi - lo, dtype=bool)
+            for part in parts:
+                mark[part - lo] = True
+            selected = lo + np.flatnonzero(mark)
+        
+        # ... les autres filtres sont vérifiés sur les codes de ces seuls candidats
+        for other, keys in filters.items():
+            if other == name:
+                continue
+            index, code_columns = self.indexes[other]
+            codes = [code for code in map(self.codes[other].get, keys) if code is not None]
+            keep = np.zeros(len(selected), dtype=bool)
+            for column in code_columns:
+                keep |= np.isin(column[selected], codes)
+            selected = selected[keep]
+        
+        return selected
+    
+    def select(self, leagues=None, teams=None, start=None, end=None):
+        """DataFrame des matchs sélectionnés (voir positions), trié par date"""
+        return self.matches.take(self.positions(leagues, teams, start, end))
+
+# ==================== ANALYSE GLISSANTE ====================
+
+ROLLING_METRICS = {
+    'roi': "ROI glissant (%)",
+    'win_rate': "Win Rate glissant (%)",
+    'sharpe': "Sharpe glissant",
+    'profit_factor': "Profit Factor glissant",
+    'drawdown': "Drawdown glissant (%)"
+}
+
+def rolling_max(values, window, axis=-1):
+    """
+    Maximum glissant (fenêtre de `window` points se terminant à chaque point, tronquée
+    au début) en O(n), vectorisé : maxima cumulés par blocs de `window` points, dans
+    les deux sens (van Herk / Gil-Werman) ; une fenêtre chevauche au plus deux blocs
+    axis : axe du temps (tableau chemins × jours d'un Monte Carlo par exemple)
+    """
+    values = np.moveaxis(np.asarray(values, dtype=np.float64), axis, -1)
+    n = values.shape[-1]
+    window = max(1, min(window, n))
+    
+    # Blocs complets : la fin est complétée par -inf
+    blocks = -(-n // window)
+    padded = np.full(values.shape[:-1] + (blocks * window,), -np.inf)
+    padded[..., :n] = values
+    shaped = padded.reshape(values.shape[:-1] + (blocks, window))
+    prefix = np.maximum.accumulate(shaped, axis=-1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(shaped[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    
+    out = np.empty_like(values)
+    out[..., :window - 1] = np.maximum.accumulate(values[..., :window - 1], axis=-1)
+    out[..., window - 1:] = np.maximum(suffix[..., :n - window + 1], prefix[..., window - 1:n])
+    
+    return np.moveaxis(out, -1, axis)
+
+def _window_sum(values, window):
+    """Somme glissante (fenêtre se terminant à chaque point) par différence de sommes cumulées"""
+    values = np.asarray(values, dtype=np.float64)
+    cumsum = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(values, axis=-1, out=cumsum[..., 1:])
+    end = np.arange(1, values.shape[-1] + 1)
+    return cumsum[..., end] - cumsum[..., np.maximum(0, end - window)]
+
+def calculate_rolling_metrics(daily_bankroll, window, day=None, won=None, profit=None):
+    """
+    Indicateurs glissants sur `window` jours, chacun en O(n) quelle que soit la fenêtre
+    daily_bankroll : bankroll initiale puis fin de chaque journée (days + 1 points),
+    ou matrice chemins × (days + 1) (trajectoires Monte Carlo : ROI, Sharpe, drawdown)
+    day / won / profit : paris (optionnels, trajectoire unique) pour le win rate et le profit factor
+    Retourne un dict indicateur -> tableau journalier (NaN tant que la fenêtre n'est pas pleine)
+    """
+    bankroll = np.asarray(daily_bankroll, dtype=np.float64)
+    days = bankroll.shape[-1] - 1
+    full = np.arange(days) >= window - 1
+    
+    # ROI : rapport entre la bankroll du jour et celle d'il y a `window` jours
+    end = np.arange(1, days + 1)
+    roi = (bankroll[..., end] / bankroll[..., np.maximum(0, end - window)] - 1) * 100
+    
+    # Sharpe : moyenne et variance des rendements via sommes cumulées
+    returns = bankroll[..., 1:] / bankroll[..., :-1] - 1
+    n = np.minimum(end, window)
+    mean = _window_sum(returns, window) / n
+    var = (_window_sum(returns ** 2, window) - n * mean ** 2) / np.maximum(n - 1, 1)
+    std = np.sqrt(np.maximum(var, 0))
+    sharpe = np.divide(mean, std, out=np.full(mean.shape, np.nan), where=std > 0) * np.sqrt(365)
+    
+    # Drawdown par rapport au sommet de la fenêtre
+    peaks = rolling_max(bankroll[..., 1:], window)
+    drawdown = (bankroll[..., 1:] - peaks) / peaks * 100
+    
+    metrics = {'roi': roi, 'sharpe': sharpe, 'drawdown': drawdown}
+    
+    if day is not None:
+        won = np.asarray(won, dtype=np.float64)
+        profit = np.asarray(profit, dtype=np.float64)
+        
+        bets = _window_sum(np.bincount(day, minlength=days), window)
+        wins = _window_sum(np.bincount(day, weights=won, minlength=days), window)
+        gross_profit = _window_sum(np.bincount(day, weights=np.maximum(profit, 0), minlength=days), window)
+        gross_loss = _window_sum(np.bincount(day, weights=np.maximum(-profit, 0), minlength=days), window)
+        
+        metrics['win_rate'] = np.divide(wins * 100, bets, out=np.full(days, np.nan), where=bets > 0)
+        metrics['profit_factor'] = np.divide(
+            gross_profit, gross_loss, out=np.full(days, np.nan), where=gross_loss > 0
+        )
+    
+    return {name: np.where(full, values, np.nan) for name, values in metrics.items()}
+
+# ==================== COMPARAISON AVEC PLACEMENTS CLASSIQUES ====================
+
+def arithmetic_growth(daily_rate, volatility, shape, rng):
+    """Modèle par défaut : rendement journalier moyen + bruit gaussien"""
+    if volatility == 0:
+        return np.full(shape, 1 + daily_rate)
+    return 1 + daily_rate + rng.normal(0, volatility, shape)
+
+# Placements de référence : taux annuel moyen, volatilité journalière et, en option,
+# un modèle de trajectoire model(daily_rate, volatility, shape, rng) -> facteurs journaliers
+BENCHMARK_ASSETS = {
+    'livret_a': {
+        'name': '🏦 Livret A',
+        'short': 'Livret A',
+        'label': '🏦 Livret A (3%/an)',
+        'prefix': 'livret',
+        'rate': 0.03,         # 3% par an (taux 2024)
+        'volatility': 0.0,    # croissance linéaire
+        'color': '#10b981',
+        'dash': 'dash',
+        'fillcolor': 'rgba(16, 185, 129, 0.1)'
+    },
+    'actions': {
+        'name': '📈 Actions CAC40',
+        'short': 'Actions',
+        'label': '📈 Actions CAC40 (7%/an)',
+        'prefix': 'actions',
+        'rate': 0.07,         # 7% par an (moyenne historique CAC40)
+        'volatility': 0.01,   # 1% de volatilité journalière
+        'color': '#f59e0b',
+        'dash': 'dot',
+        'fillcolor': 'rgba(245, 158, 11, 0.1)'
+    },
+    'crypto': {
+        'name': '🪙 Crypto',
+        'short': 'Crypto',
+        'label': '🪙 Crypto (15%/an)',
+        'prefix': 'crypto',
+        'rate': 0.15,         # 15% par an (très volatil, moyenne haussière)
+        'volatility': 0.03,   # 3% de volatilité
+        'color': '#ef4444',
+        'dash': 'dashdot',
+        'fillcolor': 'rgba(239, 68, 68, 0.1)'
+    }
+}
+
+# Placements de référence sélectionnés par défaut
+DEFAULT_BENCHMARKS = ('livret_a', 'actions')
+
+def calculate_investment_comparison(initial_amount, days, assets=DEFAULT_BENCHMARKS,
+                                    rng=None, n_paths=1):
+    """
+    Calcule l'évolution de placements classiques sur la même période
+    Seuls les actifs demandés sont simulés, chacun en un produit cumulé vectorisé
+    Avec n_paths > 1, ajoute les bandes 5/25/50/75/95% de chaque actif
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    
+    comparison = {}
+    for key in assets:
+        asset = BENCHMARK_ASSETS[key]
+        model = asset.get('model', arithmetic_growth)
+        
+        # Conversion en taux journalier
+        daily_rate = (1 + asset['rate']) ** (1/365) - 1
+        growth = model(daily_rate, asset['volatility'], (n_paths, days), rng)
+        
+        paths = np.empty((n_paths, days + 1))
+        paths[:, 0] = initial_amount
+        paths[:, 1:] = initial_amount * np.cumprod(growth, axis=1)
+        
+        final = paths[0, -1]
+        comparison[key] = paths[0]
+        comparison[f"{asset['prefix']}_final"] = final
+        comparison[f"{asset['prefix']}_roi"] = ((final - initial_amount) / initial_amount) * 100
+        
+        if n_paths > 1:
+            band_levels = [5, 25, 50, 75, 95]
+            comparison[f'{key}_bands'] = dict(zip(band_levels, np.percentile(paths, band_levels, axis=0)))
+    
+    return comparison
+
+# ==================== CALCUL D'OBJECTIFS ====================
+
+MILESTONES = [
+    (1.5, "×1.5"),
+    (2, "×2"),
+    (3, "×3"),
+    (5, "×5"),
+    (10, "×10")
+]
+
+def solve_growth_projection(initial_amount, roi_annual, multipliers):
+    """
+    Solveur analytique de croissance composée au ROI annuel donné
+    Pour chaque multiplicateur : durée exacte ln(m) / ln(1 + ROI) et premier jour
+    entier où l'objectif est atteint, en un seul calcul vectorisé
+    """
+    if roi_annual <= 0:
+        return None
+    
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    years = np.log(multipliers) / np.log1p(roi_annual / 100)
+    
+    return {
+        'multipliers': multipliers,
+        'amounts': initial_amount * multipliers,
+        'years': years,
+        'months': years * 12,
+        'days_exact': years * 365,
+        # Tolérance pour les durées tombant pile sur un jour entier
+        'days': np.ceil(years * 365 - 1e-9).astype(int)
+    }
+
+def calculate_projection_curve(initial_amount, roi_annual, days):
+    """Courbe de projection journalière (days + 1 points) en une expression vectorisée"""
+    daily_rate = (1 + roi_annual/100) ** (1/365) - 1
+    return initial_amount * (1 + daily_rate) ** np.arange(days + 1)
+
+def calculate_doubling_time(roi_annual):
+    """
+    Calcule le temps pour doubler la bankroll
+    Durée exacte au ROI annuel (et non plus règle de 72)
+    """
+    solution = solve_growth_projection(1, roi_annual, [2])
+    if solution is None:
+        return None
+    
+    return {
+        'days': int(solution['days'][0]),
+        'months': round(float(solution['months'][0]), 1),
+        'years': round(float(solution['years'][0]), 1)
+    }
+
+def calculate_growth_projection(initial_amount, roi_annual, target_multiplier=2):
+    """
+    Projette la croissance future et calcule quand l'objectif sera atteint
+    """
+    solution = solve_growth_projection(initial_amount, roi_annual, [target_multiplier])
+    if solution is None:
+        return None
+    
+    # Horizon de projection limité à 5 ans
+    max_days = 365 * 5
+    days_to_target = int(solution['days'][0])
+    achieved = days_to_target <= max_days
+    
+    return {
+        'days_to_target': days_to_target if achieved else None,
+        'projection': calculate_projection_curve(initial_amount, roi_annual, min(days_to_target, max_days)),
+        'achieved': achieved
+    }
+
+# ==================== GRAPHE DE CALCUL ====================
+
+class TaskGraph:
+    """
+    Petit graphe de tâches à dépendances explicites, exécuté sur un pool de threads
+    Chaque tâche reçoit les résultats de ses dépendances (dans l'ordre déclaré) et
+    démarre dès qu'elles sont terminées : la durée totale suit le chemin critique
+    Les calculs lourds (NumPy) libèrent le GIL, et les résultats restent partagés
+    sans sérialisation entre processus
+    """
+    
+    def __init__(self):
+        self.tasks = {}
+        # (tâche, début relatif, durée) en secondes, dans l'ordre de fin
+        self.timings = []
+    
+    def add(self, name, func, *deps):
+        """Déclare une tâche ; ses dépendances doivent être déjà déclarées"""
+        missing = [dep for dep in deps if dep not in self.tasks]
+        if name in self.tasks or missing:
+            raise ValueError(f"Tâche {name} : doublon ou dépendances inconnues {missing}")
+        self.tasks[name] = (func, deps)
+        return self
+    
+    def _required(self, targets):
+        """Tâches nécessaires aux cibles, dépendances comprises"""
+        required, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(self.tasks[name][1])
+        return required
+    
+    def run(self, targets=None, max_workers=None, poll=None, poll_interval=0.05):
+        """
+        Exécute les tâches nécessaires aux cibles (toutes par défaut)
+        poll : appelé régulièrement dans le thread appelant pendant l'attente
+        (affichage de la progression des tâches)
+        Retourne dict tâche -> résultat ; la première exception interrompt le graphe
+        """
+        pending = self._required(targets or self.tasks)
+        # Ordre de déclaration : les tâches prêtes partent dans l'ordre du graphe
+        pending = [name for name in self.tasks if name in pending]
+        results, running = {}, {}
+        origin = time.perf_counter()
+        self.timings = []
+        
+        def execute(name):
+            func, deps = self.tasks[name]
+            start = time.perf_counter()
+            value = func(*(results[dep] for dep in deps))
+            self.timings.append((name, start - origin, time.perf_counter() - start))
+            return value
+        
+        # Comme le défaut de ThreadPoolExecutor (cœurs + 4) : une tâche courte n'attend
+        # pas derrière une longue, même sur une machine à un cœur
+        max_workers = max_workers or max(1, min(len(pending), (os.cpu_count() or 1) + 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                while pending or running:
+                    for name in [name for name in pending
+                                 if all(dep in results for dep in self.tasks[name][1])]:
+                        pending.remove(name)
+                        running[pool.submit(execute, name)] = name
+                    
+                    done, _ = wait(running, timeout=poll_interval if poll else None,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+                    if poll:
+                        poll()
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+        
+        return results
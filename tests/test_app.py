@@ -0,0 +1,111 @@
+"""
+test_app.py - Cache de résultats et rendu haute densité de l'application
+
+Streamlit s'importe sans serveur (mode « bare ») : st.session_state y reste utilisable.
+    
+    python -m pytest tests
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore')
+    import app  # noqa: E402
+import engine  # noqa: E402
+
+SEED = 3
+
+# ==================== ARCHIVES ====================
+
+def test_restored_archive_survives_eviction(tmp_path):
+    # Stratégie hors défauts, comme une archive écrite par la CLI
+    params = engine.run_params({
+        'bankroll': 1000, 'days': 180, 'seed': SEED,
+        'avg_bets_per_day': 6, 'ev_threshold': 3, 'kelly_multiplier': 0.25
+    })
+    bt = engine.BacktestEngine(params['bankroll'], params['days'],
+                               seed=engine.run_seeds(SEED)['backtest'], **engine.run_strategy(params))
+    results = bt.run_backtest()
+    stats = bt.get_statistics()
+    path = engine.save_backtest(str(tmp_path / 'archive'), results, stats, params)
+    
+    restored = app.restore_backtest(path)
+    assert restored == params
+    
+    # Éviction de l'archive par des entrées plus récentes
+    cache = app.get_result_cache()
+    key = app.backtest_cache_key(restored)
+    assert key in cache
+    for i in range(cache.max_entries):
+        cache.put(('filler', i), None)
+    assert key not in cache
+    
+    # Recalcul par blocs (iter_backtest) : mêmes paris, bankroll égale à l'arrondi près
+    outputs = app.build_page_graph({**restored, 'target_multiplier': 2}, cache).run(['stats'])
+    assert outputs['stats'] == stats
+    np.testing.assert_allclose(outputs['backtest']['daily_bankroll'], results['daily_bankroll'],
+                               rtol=1e-12)
+
+# ==================== GRAPHIQUES HAUTE DENSITÉ ====================
+
+def _loop_lttb(y, n_out):
+    """Référence : LTTB seau par seau (mêmes seaux que lttb_indices), aires calculées point par point"""
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    buckets = [range(edges[i], max(edges[i + 1], edges[i] + 1)) for i in range(n_out - 2)]
+    
+    selected = [0]
+    for i, bucket in enumerate(buckets):
+        following = buckets[i + 1] if i + 1 < len(buckets) else range(n - 1, n)
+        cx, cy = np.mean(following), np.mean([y[j] for j in following])
+        a = selected[-1]
+        areas = [abs((a - cx) * (y[b] - y[a]) - (a - b) * (cy - y[a])) for b in bucket]
+        selected.append(bucket[int(np.argmax(areas))])
+    
+    return np.array(selected + [n - 1])
+
+def _random_walk(n, seed=SEED):
+    return 1000 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.02, n)))
+
+def test_lttb_matches_loop():
+    y = _random_walk(5000)
+    for n_out in (3, 10, 500, 4999):
+        indices = app.lttb_indices(y, n_out)
+        np.testing.assert_array_equal(indices, _loop_lttb(y, n_out), err_msg=n_out)
+        
+        # Extrémités gardées, un point par seau, dans l'ordre
+        assert len(indices) == n_out
+        assert indices[0] == 0 and indices[-1] == len(y) - 1
+        assert (np.diff(indices) > 0).all()
+    
+    # Pas de réduction sous le budget
+    np.testing.assert_array_equal(app.lttb_indices(y[:100], 500), np.arange(100))
+
+def test_downsample_keeps_endpoints_and_bounds():
+    y = _random_walk(20_000)
+    y[[7, 12_345]] = np.nan
+    finite = np.flatnonzero(np.isfinite(y))
+    
+    indices = app.downsample_indices(y, 1000)
+    values = y[indices]
+    full = y[finite]
+    
+    # Budget tenu (LTTB + au plus quatre extrêmes imposés), points finis et triés
+    assert len(indices) <= 1000 + 4
+    assert np.isfinite(values).all()
+    assert (np.diff(indices) > 0).all()
+    assert indices[0] == finite[0] and indices[-1] == finite[-1]
+    
+    # Extrêmes et plus grand drawdown (en valeur : séries aussi bien négatives) conservés
+    assert values.max() == full.max() and values.min() == full.min()
+    drawdown = lambda series: (series - np.maximum.accumulate(series)).min()
+    assert drawdown(values) == drawdown(full)
+    
+    # Série courte : tous les points finis
+    np.testing.assert_array_equal(app.downsample_indices(y[:500], 1000), finite[finite < 500])
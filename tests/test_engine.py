@@ -0,0 +1,704 @@
+"""
+test_engine.py - Équivalences numériques des chemins vectorisés du moteur
+
+Chaque réécriture vectorisée est comparée à une référence directe (boucle, pandas,
+force brute) sur de petites entrées à graine fixe.
+    
+    python -m pytest tests
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+
+SEED = 0
+
+def _backtest(days=120, **options):
+    bt = engine.BacktestEngine(days=days, seed=SEED, **options)
+    bt.run_backtest()
+    return bt
+
+# ==================== GÉNÉRATION DES PARIS ====================
+
+def _loop_matches(rng, counts):
+    """
+    Référence : matchs analysés un par un par la boucle d'origine
+    (generate_realistic_bets d'avant la vectorisation), sur les tirages du
+    générateur vectorisé pris dans le même ordre
+    Génère (cellule, cote, probabilité réelle, probabilité prédite, EV, mise) des value bets
+    """
+    n = int(counts.sum())
+    odds_draws = rng.uniform(1.5, 4.5, n)
+    noise_draws = rng.normal(0, 0.05, n)
+    accuracy_draws = rng.uniform(0.6, 0.85, n)
+    
+    for cell, odds, noise, model_accuracy in zip(np.repeat(np.arange(len(counts)), counts),
+                                                 odds_draws, noise_draws, accuracy_draws):
+        true_prob = 1 / odds + noise
+        true_prob = np.clip(true_prob, 0.1, 0.9)
+        
+        predicted_prob = true_prob * model_accuracy + (1 - true_prob) * (1 - model_accuracy)
+        
+        ev = (predicted_prob * odds - 1) * 100
+        
+        if ev > 5:
+            kelly = (predicted_prob * odds - 1) / (odds - 1)
+            stake_pct = max(0.5, min(5, kelly * 100 * 0.5))
+            yield int(cell), odds, true_prob, predicted_prob, ev, stake_pct
+
+def _loop_bets(seed, days, avg_bets_per_day=3):
+    """Référence : paris d'une période, arrondis comme dans la boucle d'origine"""
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(avg_bets_per_day, size=days)
+    
+    bets, true_probs = [], []
+    for day, odds, true_prob, predicted_prob, ev, stake_pct in _loop_matches(rng, counts):
+        bets.append({
+            'day': day,
+            'odds': round(odds, 2),
+            'predicted_prob': round(predicted_prob * 100, 1),
+            'true_prob': round(true_prob * 100, 1),
+            'ev': round(ev, 1),
+            'stake_pct': round(stake_pct, 2)
+        })
+        true_probs.append(true_prob)
+    
+    # Tirages du générateur vectorisé : résultats, puis affiches et ligues
+    won_draws = rng.random(len(bets))
+    pairs = rng.integers(len(engine.TEAMS_POOL), size=len(bets))
+    leagues = rng.integers(len(engine.LEAGUES), size=len(bets))
+    for bet, true_prob, won, pair, league in zip(bets, true_probs, won_draws, pairs, leagues):
+        bet['won'] = bool(won < true_prob)
+        bet['home'], bet['away'] = engine.TEAMS_POOL[pair]
+        bet['league'] = engine.LEAGUES[league]
+    
+    return bets
+
+def test_period_bets_match_loop():
+    store = engine.BacktestEngine(seed=SEED).generate_period_bets(datetime(2024, 1, 1), 120)
+    expected = pd.DataFrame(_loop_bets(SEED, 120))
+    
+    assert len(store) == len(expected) > 0
+    np.testing.assert_array_equal(store['day'], expected['day'])
+    np.testing.assert_array_equal(store['won'], expected['won'])
+    assert [store.leagues[code] for code in store['league']] == expected['league'].tolist()
+    assert [store.teams[code] for code in store['home']] == expected['home'].tolist()
+    assert [store.teams[code] for code in store['away']] == expected['away'].tolist()
+    for name, decimals in engine.BET_DECIMALS.items():
+        # Colonnes float32 : valeurs arrondies au float32 près
+        np.testing.assert_allclose(store[name], expected[name], rtol=1e-6, err_msg=name)
+
+def test_realistic_bets_match_loop():
+    date = datetime(2024, 1, 1)
+    bets = engine.BacktestEngine(seed=SEED).generate_realistic_bets(date, avg_bets_per_day=20)
+    expected = _loop_bets(SEED, 1, avg_bets_per_day=20)
+    
+    assert len(bets) == len(expected) > 0
+    for bet, reference in zip(bets, expected):
+        assert list(bet) == ['date', 'league', 'home', 'away', 'odds', 'predicted_prob',
+                             'true_prob', 'ev', 'stake_pct', 'won']
+        assert bet['date'] == date
+        assert bet == {'date': date, **{name: reference[name] for name in bet if name != 'date'}}
+
+# ==================== TRAJECTOIRE DE BANKROLL ====================
+
+def _loop_bankroll(initial_bankroll, day, bet_return, days):
+    """Référence : bankroll réglée journée par journée, pari par pari"""
+    daily_bankroll = [initial_bankroll]
+    bankroll_before = np.empty(len(day))
+    current = initial_bankroll
+    
+    for d in range(days):
+        daily_pnl = 0.0
+        for i in np.flatnonzero(day == d):
+            bankroll_before[i] = current
+            daily_pnl += bet_return[i] * current
+        current += daily_pnl
+        daily_bankroll.append(current)
+    
+    return np.array(daily_bankroll), bankroll_before
+
+def test_compound_bankroll_matches_loop():
+    rng = np.random.default_rng(SEED)
+    days = 60
+    day = np.sort(rng.integers(0, days, 200))
+    bet_return = rng.uniform(0.005, 0.05, 200) * np.where(rng.random(200) < 0.4, 2.0, -1.0)
+    
+    daily_bankroll, bankroll_before = engine.compound_bankroll(1000, day, bet_return, days)
+    expected_bankroll, expected_before = _loop_bankroll(1000, day, bet_return, days)
+    
+    np.testing.assert_allclose(daily_bankroll, expected_bankroll, rtol=1e-12)
+    np.testing.assert_allclose(bankroll_before, expected_before, rtol=1e-12)
+
+def test_backtest_bankroll_matches_loop():
+    bt = _backtest()
+    results = bt.results
+    bets = results['bets']
+    
+    day = bets['date'].cat.codes.to_numpy()
+    odds = bets['odds'].to_numpy(np.float64)
+    bet_return = bets['stake_pct'].to_numpy(np.float64) / 100 * np.where(bets['won'], odds - 1, -1)
+    expected_bankroll, expected_before = _loop_bankroll(bt.initial_bankroll, day, bet_return, bt.days)
+    
+    np.testing.assert_allclose(results['daily_bankroll'], expected_bankroll, rtol=1e-12)
+    np.testing.assert_allclose(bets['bankroll_before'], expected_before, atol=0.005)
+    np.testing.assert_allclose(bets['profit'], expected_before * bet_return, atol=0.005 + 1e-9)
+
+# ==================== STATISTIQUES EN LIGNE ====================
+
+def _pandas_statistics(results):
+    """Référence : statistiques recalculées en pandas sur la table des paris"""
+    df = results['bets'].copy()
+    won = df['won'].to_numpy()
+    odds = df['odds'].astype(np.float64)
+    profit = df['profit']
+    
+    bankroll = pd.Series(results['daily_bankroll'])
+    peaks = bankroll.expanding().max()
+    daily_returns = bankroll.pct_change().dropna()
+    
+    streak = df['won'].ne(df['won'].shift()).cumsum()
+    win_streaks = streak[won].value_counts()
+    lose_streaks = streak[~won].value_counts()
+    day_profit = df.groupby('date', observed=True)['profit'].sum()
+    gross_loss = abs(profit[profit < 0].sum())
+    
+    return {
+        'total_bets': len(df),
+        'won_bets': int(won.sum()),
+        'lost_bets': int((~won).sum()),
+        'win_rate': won.mean() * 100,
+        'avg_odds_won': odds[won].mean(),
+        'avg_odds_lost': odds[~won].mean(),
+        'total_staked': df['stake_pct'].astype(np.float64).sum(),
+        'total_profit': results['total_profit'],
+        'roi': results['roi'],
+        'max_drawdown': ((bankroll - peaks) / peaks * 100).min(),
+        'profit_factor': profit[profit > 0].sum() / gross_loss,
+        'sharpe_ratio': daily_returns.mean() / daily_returns.std() * np.sqrt(365),
+        'longest_win_streak': win_streaks.max(),
+        'longest_lose_streak': lose_streaks.max(),
+        'avg_ev': df['ev'].astype(np.float64).mean(),
+        'best_day': day_profit.max(),
+        'worst_day': day_profit.min()
+    }
+
+# Pas d'arrondi de chaque statistique (get_statistics arrondit ses résultats)
+STAT_DECIMALS = {
+    'win_rate': 1, 'avg_odds_won': 2, 'avg_odds_lost': 2, 'total_staked': 1,
+    'total_profit': 2, 'roi': 1, 'max_drawdown': 1, 'profit_factor': 2,
+    'sharpe_ratio': 2, 'avg_ev': 1, 'best_day': 2, 'worst_day': 2
+}
+
+def test_statistics_match_pandas():
+    bt = _backtest(days=365)
+    stats = bt.get_statistics()
+    expected = _pandas_statistics(bt.results)
+    
+    assert stats.keys() == expected.keys()
+    for name, value in expected.items():
+        # Demi-pas d'arrondi, plus une marge pour un arrondi à la limite
+        atol = 0.6 * 10.0 ** -STAT_DECIMALS[name] if name in STAT_DECIMALS else 0
+        np.testing.assert_allclose(stats[name], value, atol=atol, err_msg=name)
+
+def test_chunked_statistics_match_batch():
+    batch = _backtest(days=365)
+    chunked = engine.BacktestEngine(days=365, seed=SEED)
+    for _ in chunked.iter_backtest(chunk_days=7):
+        pass
+    
+    np.testing.assert_allclose(chunked.results['daily_bankroll'], batch.results['daily_bankroll'], rtol=1e-12)
+    
+    # États internes de l'accumulateur (avant arrondi), dont la fusion de Welford par blocs
+    for name, value in vars(batch.stats).items():
+        if isinstance(value, (int, float, np.floating)) and not isinstance(value, bool):
+            np.testing.assert_allclose(getattr(chunked.stats, name), value, rtol=1e-9, err_msg=name)
+        else:
+            assert getattr(chunked.stats, name) == value, name
+
+# ==================== STOCKAGE DES PARIS ====================
+
+def _loop_backtest(bets, initial_bankroll, days):
+    """
+    Référence : run_backtest d'origine, une liste de dicts réglée pari par pari
+    puis convertie en DataFrame (date : numéro du jour)
+    """
+    all_bets = []
+    daily_bankroll = [initial_bankroll]
+    current_bankroll = initial_bankroll
+    
+    for day in range(days):
+        daily_pnl = 0
+        for bet in (bet for bet in bets if bet['day'] == day):
+            bet = {'date': day, **{name: value for name, value in bet.items() if name != 'day'}}
+            stake_amount = (bet['stake_pct'] / 100) * current_bankroll
+            
+            if bet['won']:
+                profit = stake_amount * (bet['odds'] - 1)
+                daily_pnl += profit
+                bet['profit'] = round(profit, 2)
+            else:
+                daily_pnl -= stake_amount
+                bet['profit'] = round(-stake_amount, 2)
+            
+            bet['bankroll_before'] = round(current_bankroll, 2)
+            all_bets.append(bet)
+        
+        current_bankroll += daily_pnl
+        daily_bankroll.append(current_bankroll)
+    
+    return {
+        'bets': pd.DataFrame(all_bets),
+        'daily_bankroll': daily_bankroll,
+        'total_profit': current_bankroll - initial_bankroll,
+        'roi': ((current_bankroll - initial_bankroll) / initial_bankroll) * 100
+    }
+
+def test_bet_store_backtest_matches_loop():
+    bt = _backtest()
+    bets = bt.results['bets']
+    expected = _loop_backtest(_loop_bets(SEED, bt.days), bt.initial_bankroll, bt.days)
+    expected_bets = expected['bets']
+    
+    # Table compacte : codes de catégories et float32
+    for name in ('date', 'league', 'home', 'away'):
+        assert isinstance(bets[name].dtype, pd.CategoricalDtype), name
+    assert all(bets[name].dtype == np.float32 for name in engine.BetStore.FLOAT32)
+    
+    # Mêmes paris ; cotes et mises float32 : écarts relatifs de l'ordre de 1e-7 par pari
+    assert len(bets) == len(expected_bets)
+    np.testing.assert_array_equal(bets['date'].cat.codes, expected_bets['date'])
+    for name in ('league', 'home', 'away'):
+        assert bets[name].astype(str).tolist() == expected_bets[name].tolist()
+    np.testing.assert_array_equal(bets['won'], expected_bets['won'])
+    for name in engine.BetStore.FLOAT32:
+        np.testing.assert_allclose(bets[name], expected_bets[name], rtol=1e-6, err_msg=name)
+    for name in engine.BetStore.FLOAT64:
+        np.testing.assert_allclose(bets[name], expected_bets[name], rtol=1e-5, atol=0.01, err_msg=name)
+    np.testing.assert_allclose(bt.results['daily_bankroll'], expected['daily_bankroll'], rtol=1e-5)
+    
+    stats = bt.get_statistics()
+    for name, value in _pandas_statistics(expected).items():
+        atol = 0.6 * 10.0 ** -STAT_DECIMALS[name] if name in STAT_DECIMALS else 0
+        np.testing.assert_allclose(stats[name], value, rtol=1e-5, atol=atol, err_msg=name)
+
+# ==================== MONTE CARLO ====================
+
+def _loop_monte_carlo(seed, n_paths, days, chunk, initial_bankroll=1000, avg_bets_per_day=3):
+    """Référence : chemins réglés un par un, jour par jour, sur les tirages bloc par bloc du moteur"""
+    rng = np.random.default_rng(seed)
+    paths = np.empty((n_paths, days + 1))
+    
+    for start in range(0, n_paths, chunk):
+        size = min(chunk, n_paths - start)
+        counts = rng.poisson(avg_bets_per_day, size=size * days)
+        bets = list(_loop_matches(rng, counts))
+        won_draws = rng.random(len(bets))
+        
+        day_return = np.zeros(size * days)
+        for (cell, odds, true_prob, _, _, stake_pct), won in zip(bets, won_draws):
+            day_return[cell] += stake_pct / 100 * (odds - 1 if won < true_prob else -1)
+        
+        for path, returns in enumerate(day_return.reshape(size, days), start):
+            bankroll = initial_bankroll
+            paths[path, 0] = bankroll
+            for day, r in enumerate(returns, 1):
+                bankroll *= 1 + r
+                paths[path, day] = bankroll
+    
+    return paths
+
+def test_monte_carlo_matches_loop():
+    days, n_paths, max_chunk_bets = 60, 50, 2_000
+    bt = engine.BacktestEngine(days=days, seed=SEED)
+    monte_carlo = bt.run_monte_carlo(n_paths, target_multiplier=1.2, ruin_level=0.8,
+                                     max_chunk_bets=max_chunk_bets)
+    
+    # Plusieurs blocs de chemins (même découpage que le moteur)
+    chunk = max_chunk_bets // (days * bt.avg_bets_per_day)
+    assert chunk < n_paths
+    paths = _loop_monte_carlo(SEED, n_paths, days, chunk)
+    final = paths[:, -1]
+    
+    # Trajectoires gardées en float32
+    np.testing.assert_allclose(monte_carlo['final'], final, rtol=1e-6)
+    levels = list(monte_carlo['bands'])
+    for level in levels:
+        np.testing.assert_allclose(monte_carlo['bands'][level], np.percentile(paths, level, axis=0),
+                                   rtol=1e-6, err_msg=level)
+        np.testing.assert_allclose(monte_carlo['final_percentiles'][level], np.percentile(final, level),
+                                   rtol=1e-6, err_msg=level)
+        assert monte_carlo['bands'][level][0] == bt.initial_bankroll
+    
+    # Bandes emboîtées, entre les trajectoires extrêmes
+    bands = np.array([monte_carlo['bands'][level] for level in levels])
+    assert (np.diff(bands, axis=0) >= 0).all()
+    assert (bands[0] >= paths.min(axis=0) * (1 - 1e-6)).all()
+    assert (bands[-1] <= paths.max(axis=0) * (1 + 1e-6)).all()
+    
+    assert monte_carlo['prob_profit'] == (final > 1000).mean() * 100
+    assert monte_carlo['prob_target'] == (final >= 1200).mean() * 100
+    assert monte_carlo['prob_ruin'] == (paths.min(axis=1) <= 800).mean() * 100
+
+# ==================== ANALYSE GLISSANTE ====================
+
+def test_rolling_max_matches_pandas():
+    rng = np.random.default_rng(SEED)
+    for n, window in [(1, 5), (7, 3), (100, 1), (100, 7), (100, 100), (100, 300), (731, 90)]:
+        values = rng.normal(size=n)
+        expected = pd.Series(values).rolling(window, min_periods=1).max().to_numpy()
+        np.testing.assert_array_equal(engine.rolling_max(values, window), expected)
+    
+    # Matrice chemins × jours : fenêtre le long de l'axe du temps
+    paths = rng.normal(size=(20, 200))
+    expected = pd.DataFrame(paths.T).rolling(30, min_periods=1).max().to_numpy().T
+    np.testing.assert_array_equal(engine.rolling_max(paths, 30), expected)
+    np.testing.assert_array_equal(engine.rolling_max(paths.T, 30, axis=0), expected.T)
+
+def test_rolling_metrics_match_pandas():
+    bt = _backtest(days=365)
+    window = 30
+    bankroll = pd.Series(bt.results['daily_bankroll'])
+    metrics = engine.calculate_rolling_metrics(bankroll.to_numpy(), window)
+    
+    returns = bankroll.pct_change().iloc[1:]
+    peaks = bankroll.iloc[1:].rolling(window, min_periods=1).max()
+    expected = {
+        'roi': (bankroll / bankroll.shift(window) - 1).iloc[1:] * 100,
+        'sharpe': returns.rolling(window).mean() / returns.rolling(window).std() * np.sqrt(365),
+        'drawdown': ((bankroll.iloc[1:] - peaks) / peaks * 100).where(np.arange(len(peaks)) >= window - 1)
+    }
+    for name, values in expected.items():
+        np.testing.assert_allclose(metrics[name], values.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=name)
+    
+    # Trajectoires empilées : même résultat que chaque trajectoire seule
+    paths = np.vstack([bankroll.to_numpy(), bankroll.to_numpy()[::-1]])
+    stacked = engine.calculate_rolling_metrics(paths, window)
+    for i, path in enumerate(paths):
+        for name, values in engine.calculate_rolling_metrics(path, window).items():
+            np.testing.assert_allclose(stacked[name][i], values, rtol=1e-12, err_msg=name)
+
+# ==================== INDEX DES MATCHS ====================
+
+def _synthetic_matches(n=2000):
+    """Matchs aléatoires : quelques équipes fréquentes, beaucoup de rares (les deux branches d'union)"""
+    rng = np.random.default_rng(SEED)
+    teams = [f'T{i}' for i in range(40)]
+    weights = 1 / np.arange(1, len(teams) + 1) ** 1.5
+    home, away = rng.choice(len(teams), size=(2, n), p=weights / weights.sum())
+    # Une équipe ne se rencontre pas elle-même
+    away = np.where(away == home, (home + 1) % len(teams), away)
+    
+    return pd.DataFrame({
+        'date': pd.Timestamp('2020-08-01') + pd.to_timedelta(rng.integers(0, 1000, n), unit='D'),
+        'league': rng.choice(list(engine.DIVISIONS.values()), n),
+        'home': np.array(teams)[home],
+        'away': np.array(teams)[away]
+    })
+
+def test_match_store_positions_match_masks():
+    store = engine.MatchStore(_synthetic_matches())
+    matches = store.matches
+    
+    selections = [
+        {},
+        {'leagues': ['Ligue 1']},
+        {'leagues': ['Ligue 1', 'Serie A'], 'start': '2021-01-01'},
+        {'teams': ['T0']},
+        {'teams': ['T30', 'T35', 'T39']},
+        {'teams': ['T0', 'T1', 'T2', 'T3']},
+        {'teams': ['T5', 'inconnue'], 'leagues': ['La Liga', 'Bundesliga']},
+        {'teams': ['T1'], 'leagues': ['Ligue 2'], 'start': '2021-03-01', 'end': '2022-02-28'},
+        {'end': '2020-12-31'},
+        {'leagues': ['inconnue']}
+    ]
+    for selection in selections:
+        mask = np.ones(len(matches), dtype=bool)
+        if selection.get('leagues'):
+            mask &= matches['league'].isin(selection['leagues']).to_numpy()
+        if selection.get('teams'):
+            mask &= (matches['home'].isin(selection['teams'])
+                     | matches['away'].isin(selection['teams'])).to_numpy()
+        if selection.get('start'):
+            mask &= (matches['date'] >= pd.Timestamp(selection['start'])).to_numpy()
+        if selection.get('end'):
+            mask &= (matches['date'] <= pd.Timestamp(selection['end'])).to_numpy()
+        
+        np.testing.assert_array_equal(store.positions(**selection), np.flatnonzero(mask),
+                                      err_msg=str(selection))
+
+# ==================== OPTIMISATION ET WALK-FORWARD ====================
+
+def _candidates(days=365):
+    return engine.BacktestEngine(days=days, seed=SEED).draw_candidates()
+
+def _cell_day_returns(candidates, ev_threshold, kelly_multiplier, stake_bounds):
+    """Référence : rendements journaliers d'une stratégie, paris filtrés puis sommés par jour"""
+    odds = candidates['odds'].astype(np.float64)
+    predicted_prob = candidates['predicted_prob'].astype(np.float64) / 100
+    kelly = np.maximum((predicted_prob * odds - 1) / (odds - 1), 0) * 100
+    
+    value = candidates['ev'].astype(np.float64) > ev_threshold
+    stake_pct = np.clip(kelly[value] * kelly_multiplier, *stake_bounds)
+    bet_return = stake_pct / 100 * np.where(candidates['won'][value], odds[value] - 1, -1)
+    
+    return np.bincount(candidates['day'][value], weights=bet_return, minlength=len(candidates.dates))
+
+def _reference_metrics(day_return, initial_bankroll=1000):
+    """Référence : ROI, Sharpe et drawdown max d'une trajectoire composée (sans ruine)"""
+    bankroll = initial_bankroll * np.concatenate(([1.0], np.cumprod(1 + day_return)))
+    returns = bankroll[1:] / bankroll[:-1] - 1
+    peaks = np.maximum.accumulate(bankroll)
+    return {
+        'roi': (bankroll[-1] / initial_bankroll - 1) * 100,
+        'sharpe_ratio': returns.mean() / returns.std(ddof=1) * np.sqrt(365),
+        'max_drawdown': ((bankroll - peaks) / peaks).min() * 100
+    }
+
+def test_optimizer_matches_brute_force():
+    candidates = _candidates()
+    ev_thresholds = [0, 2.5, 5, 10]
+    kelly_multipliers = [0.1, 0.5, 1]
+    stake_bounds = ((0.5, 5), (1, 3))
+    
+    grid = engine.optimize_strategy(candidates, ev_thresholds=ev_thresholds,
+                                    kelly_multipliers=kelly_multipliers,
+                                    stake_bounds=stake_bounds, prune=False)
+    
+    assert grid['evaluated'].all()
+    for b, bounds in enumerate(stake_bounds):
+        for i, threshold in enumerate(ev_thresholds):
+            for k, multiplier in enumerate(kelly_multipliers):
+                expected = _reference_metrics(_cell_day_returns(candidates, threshold, multiplier, bounds))
+                for name, value in expected.items():
+                    np.testing.assert_allclose(grid[name][b, i, k], value, rtol=1e-9,
+                                               err_msg=f'{name} {bounds} {threshold} {multiplier}')
+    
+    sharpe = grid['sharpe_ratio']
+    b, i, k = np.unravel_index(np.argmax(sharpe), sharpe.shape)
+    assert (grid['best']['ev_threshold'], grid['best']['kelly_multiplier']) == (ev_thresholds[i], kelly_multipliers[k])
+    assert (grid['best']['min_stake_pct'], grid['best']['max_stake_pct']) == stake_bounds[b]
+
+def test_pruned_optimizer_finds_full_grid_best():
+    candidates = _candidates()
+    grid = {
+        'ev_thresholds': np.linspace(0, 20, 50),
+        'kelly_multipliers': np.linspace(0.02, 1, 50)
+    }
+    
+    full = engine.optimize_strategy(candidates, prune=False, **grid)
+    pruned = engine.optimize_strategy(candidates, prune=True, **grid)
+    
+    assert pruned['evaluated'].sum() < full['evaluated'].sum()
+    assert pruned['best'] == full['best']
+    
+    # Cellules évaluées : mêmes valeurs que la grille complète
+    evaluated = pruned['evaluated']
+    for name in engine.OPTIMIZATION_METRICS:
+        np.testing.assert_array_equal(pruned[name][evaluated], full[name][evaluated])
+
+def _window_score(day_return, objective):
+    """Référence : objectif d'une fenêtre d'apprentissage"""
+    if objective == 'roi':
+        return (np.prod(1 + day_return) - 1) * 100
+    std = day_return.std(ddof=1)
+    return day_return.mean() / std * np.sqrt(365) if std > 0 else -np.inf
+
+def test_walk_forward_matches_brute_force():
+    candidates = _candidates()
+    days = len(candidates.dates)
+    train_days, test_days = 120, 30
+    ev_thresholds = np.arange(0, 11, 2.0)
+    kelly_multipliers = np.array([0.25, 0.5, 1.0])
+    stake_bounds = (0.5, 5)
+    
+    cells = [(threshold, multiplier) for threshold in ev_thresholds for multiplier in kelly_multipliers]
+    day_returns = [_cell_day_returns(candidates, *cell, stake_bounds) for cell in cells]
+    ev = candidates['ev'].astype(np.float64)
+    
+    for objective in ('sharpe_ratio', 'roi'):
+        result = engine.walk_forward(candidates, train_days=train_days, test_days=test_days,
+                                     ev_thresholds=ev_thresholds, kelly_multipliers=kelly_multipliers,
+                                     stake_bounds=stake_bounds, objective=objective)
+        
+        test_starts = range(train_days, days, test_days)
+        assert len(result['folds']) == len(test_starts)
+        oos_returns = []
+        
+        for fold, start in zip(result['folds'], test_starts):
+            end = min(start + test_days, days)
+            scores = [_window_score(r[start - train_days:start], objective) for r in day_returns]
+            
+            # Cellule choisie : score maximal sur la fenêtre d'apprentissage (aux égalités près)
+            chosen = cells.index((fold['ev_threshold'], fold['kelly_multiplier']))
+            np.testing.assert_allclose(scores[chosen], max(scores), rtol=1e-9)
+            np.testing.assert_allclose(fold['train_score'], max(scores), rtol=1e-9)
+            
+            in_test = (candidates['day'] >= start) & (candidates['day'] < end)
+            assert fold['bets'] == int((in_test & (ev > fold['ev_threshold'])).sum())
+            oos_returns.append(day_returns[chosen][start:end])
+        
+        oos_returns = np.concatenate(oos_returns)
+        expected_bankroll = 1000 * np.concatenate(([1.0], np.cumprod(1 + oos_returns)))
+        np.testing.assert_allclose(result['daily_bankroll'], expected_bankroll, rtol=1e-9)
+        for name, value in _reference_metrics(oos_returns).items():
+            np.testing.assert_allclose(result['stats'][name], value, rtol=1e-9, err_msg=name)
+        
+        baseline = _cell_day_returns(candidates, 5, 0.5, stake_bounds)[train_days:]
+        np.testing.assert_allclose(result['baseline_bankroll'],
+                                   1000 * np.concatenate(([1.0], np.cumprod(1 + baseline))), rtol=1e-9)
+
+# ==================== POLITIQUES DE MISE ====================
+
+def _loop_staking(bets, policy, initial_bankroll, days):
+    """Référence : une politique réglée journée par journée, pari par pari, ruine absorbante"""
+    day = bets['date'].cat.codes.to_numpy()
+    bankroll = initial_bankroll
+    daily_bankroll = [bankroll]
+    
+    for d in range(days):
+        stakes, outcomes = [], []
+        for i in np.flatnonzero(day == d):
+            odds, ev = float(bets['odds'].iloc[i]), float(bets['ev'].iloc[i])
+            predicted_prob = float(bets['predicted_prob'].iloc[i]) / 100
+            kelly = max((predicted_prob * odds - 1) / (odds - 1), 0)
+            
+            stake = {
+                'recorded': float(bets['stake_pct'].iloc[i]),
+                'flat': policy.get('pct'),
+                'fraction': policy.get('pct'),
+                'kelly': kelly * 100 * policy.get('multiplier', 0),
+                'ev': ev * policy.get('pct_per_ev', 0)
+            }[policy['kind']]
+            stakes.append(min(max(stake, policy.get('min_pct', 0)), policy.get('max_pct', 100)))
+            outcomes.append(odds - 1 if bets['won'].iloc[i] else -1)
+        
+        # Plafond d'exposition : mises du jour réduites au prorata
+        exposure = sum(stakes)
+        if 'max_day_pct' in policy and exposure > policy['max_day_pct']:
+            stakes = [stake * policy['max_day_pct'] / exposure for stake in stakes]
+        
+        base = initial_bankroll if policy['kind'] == 'flat' else bankroll
+        if bankroll > 0:
+            bankroll += sum(stake / 100 * base * outcome for stake, outcome in zip(stakes, outcomes))
+        bankroll = max(bankroll, 0)
+        daily_bankroll.append(bankroll)
+    
+    return np.array(daily_bankroll)
+
+def test_staking_policies_match_loop():
+    bt = _backtest(days=365)
+    
+    # Politiques agressives en plus : ruine atteinte, en mise fixe comme composée
+    policies = {
+        **engine.STAKING_POLICIES,
+        'reckless_flat': {'label': "Mise fixe 30 %", 'kind': 'flat', 'pct': 30},
+        'reckless_fraction': {'label': "Fraction 60 %", 'kind': 'fraction', 'pct': 60}
+    }
+    staking = engine.evaluate_staking_policies(bt.results['bets'], bt.initial_bankroll, policies)
+    
+    for j, (name, policy) in enumerate(policies.items()):
+        expected = _loop_staking(bt.results['bets'], policy, bt.initial_bankroll, bt.days)
+        np.testing.assert_allclose(staking['daily_bankroll'][:, j], expected, rtol=1e-9, atol=1e-9,
+                                   err_msg=name)
+    
+    # Politique actuelle : la trajectoire du backtest
+    np.testing.assert_allclose(staking['daily_bankroll'][:, 0], bt.results['daily_bankroll'], rtol=1e-12)
+    current = staking['rows'][0]
+    stats = bt.get_statistics()
+    for name in ('roi', 'max_drawdown', 'sharpe_ratio'):
+        assert current[name] == stats[name], name
+    
+    # Ruine absorbante : une fois à zéro, la bankroll n'en repart plus
+    for j in (-2, -1):
+        column = staking['daily_bankroll'][:, j]
+        ruin = np.flatnonzero(column <= 0)
+        assert staking['rows'][j]['ruined'] and len(ruin) > 0
+        assert (column[ruin[0]:] == 0).all()
+
+# ==================== BOOTSTRAP ====================
+
+class _IdentityGenerator(np.random.Generator):
+    """Générateur dont chaque rééchantillonnage reprend les paris d'origine dans l'ordre"""
+    
+    def integers(self, low, high=None, size=None, dtype=np.int64, endpoint=False):
+        return np.broadcast_to(np.arange(high, dtype=dtype), size).copy()
+
+def test_bootstrap_identity_resample_matches_statistics():
+    bt = _backtest(days=365)
+    expected = _pandas_statistics(bt.results)
+    
+    # Petits blocs pour traverser plusieurs itérations de la boucle
+    n_bets = len(bt.results['bets'])
+    result = engine.bootstrap_statistics(bt.results['bets'], n_resamples=5, confidence=0,
+                                         rng=_IdentityGenerator(np.random.PCG64(SEED)),
+                                         max_chunk_cells=2 * n_bets)
+    
+    for name in engine.BOOTSTRAP_METRICS:
+        for bound in ('low', 'high'):
+            np.testing.assert_allclose(result[name][bound], expected[name], rtol=1e-9,
+                                       err_msg=f"{name} {bound}")
+        np.testing.assert_allclose(result[name]['std'], 0, atol=1e-9, err_msg=name)
+
+# ==================== HISTORIQUE DES COTES ====================
+
+def _write_football_data_csv(path, n):
+    """CSV football-data de n matchs, un par semaine à partir d'août 2022"""
+    dates = pd.date_range('2022-08-06', periods=n, freq='7D')
+    pd.DataFrame({
+        'Div': 'E0',
+        'Date': dates.strftime('%d/%m/%Y'),
+        'HomeTeam': [f'Home{i}' for i in range(n)],
+        'AwayTeam': [f'Away{i}' for i in range(n)],
+        'FTR': np.resize(['H', 'D', 'A'], n),
+        'B365H': 2.0, 'B365D': 3.2, 'B365A': 3.8
+    }).to_csv(path, index=False)
+
+def test_reingesting_shorter_file_replaces_its_fragments(tmp_path):
+    path, cache_dir = tmp_path / 'E0.csv', str(tmp_path / 'history')
+    
+    # 60 matchs sur deux saisons en blocs de 20, puis 10 matchs d'une seule saison
+    _write_football_data_csv(path, 60)
+    engine.ingest_historical_odds([str(path)], cache_dir, chunksize=20)
+    assert len(engine.load_historical_odds(cache_dir)) == 60
+    
+    _write_football_data_csv(path, 10)
+    assert engine.ingest_historical_odds([str(path)], cache_dir, chunksize=20) == 10
+    
+    matches = engine.load_historical_odds(cache_dir)
+    assert matches['home'].tolist() == [f'Home{i}' for i in range(10)]
+    assert list(engine.historical_partitions(cache_dir).values()) == [[2022]]
+
+# ==================== BALAYAGE DE PARAMÈTRES ====================
+
+def test_sweep_numbers_runs_within_each_combination():
+    grid = {'ev_threshold': [3, 5], 'kelly_multiplier': [0.25, 0.5]}
+    rows = engine.run_parameter_sweep(grid, days=60, seed=SEED, repeats=3, max_workers=1)
+    
+    assert len(rows) == 12
+    for _, runs in rows.groupby(list(grid))['run']:
+        assert sorted(runs) == [0, 1, 2]
+    
+    # Chaque backtest rejoué seul avec sa graine : mêmes statistiques
+    seeds = np.random.SeedSequence(SEED).spawn(len(rows))
+    for row, seed_seq in zip(rows.to_dict('records'), seeds):
+        bt = engine.BacktestEngine(1000, 60, seed=seed_seq, **{name: row[name] for name in grid})
+        bt.run_backtest(frame=False)
+        assert bt.get_statistics()['roi'] == row['roi']
+
+def test_sweep_is_independent_of_worker_count():
+    grid = {'avg_bets_per_day': [2, 4], 'max_stake_pct': [3, 5]}
+    options = {'days': 90, 'seed': SEED, 'repeats': 2}
+    
+    serial = engine.run_parameter_sweep(grid, max_workers=1, **options)
+    parallel = engine.run_parameter_sweep(grid, max_workers=2, **options)
+    
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(serial.columns[:3]) == [*grid, 'run']